@@ -2,26 +2,29 @@
 from __future__ import annotations
 
 import argparse
+import importlib
 import sys
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Iterable, List
+from typing import Callable, Iterable, List
 
 from ant.core.direction import Heading
+from ant.core.grid import Grid
+from ant.core.rules import AnyRule, as_rule
 from ant.core.simulation import Ant, Simulation
-from ant.renderers import AsciiRenderer, LiveAsciiRunner
-from ant.topology import (
-    SphereAdjacentPairsTopology,
-    KleinBottleTopology,
-    ProjectivePlaneTopology,
-    TorusTopology,
-    Topology,
-)
+from ant.renderers.ascii import AsciiRenderer
+from ant.renderers.live import LiveAsciiRunner
+from ant.topology.base import Topology
 
+# Topology name -> "module:class"; classes are imported only when selected.
 _TOPOLOGY_MAP = {
-    "torus": TorusTopology,
-    "klein": KleinBottleTopology,
-    "projective": ProjectivePlaneTopology,
-    "sphere_diag": SphereAdjacentPairsTopology,
+    "torus": "ant.topology.base:TorusTopology",
+    "klein": "ant.topology.nonorientable:KleinBottleTopology",
+    "projective": "ant.topology.nonorientable:ProjectivePlaneTopology",
+    "sphere_diag": "ant.topology.orientable:SphereAdjacentPairsTopology",
+    "cylinder": "ant.topology.surfaces:CylinderTopology",
+    "mobius": "ant.topology.surfaces:MobiusStripTopology",
+    "pillow": "ant.topology.surfaces:PillowSphereTopology",
 }
 
 
@@ -33,6 +36,21 @@ def _positive_int(value: str) -> int:
     return ivalue
 
 
+def _density(value: str) -> float:
+    fvalue = float(value)
+    if not 0 <= fvalue <= 1:
+        msg = "value must lie between 0 and 1"
+        raise argparse.ArgumentTypeError(msg)
+    return fvalue
+
+
+def _rule(value: str) -> AnyRule:
+    try:
+        return as_rule(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
 def _non_negative_int(value: str) -> int:
     ivalue = int(value)
     if ivalue < 0:
@@ -49,6 +67,14 @@ def _non_negative_float(value: str) -> float:
     return fvalue
 
 
+def _positive_float(value: str) -> float:
+    fvalue = float(value)
+    if fvalue <= 0:
+        msg = "value must be a positive number"
+        raise argparse.ArgumentTypeError(msg)
+    return fvalue
+
+
 def parse_ant_spec(spec: str, *, ant_id: int) -> Ant:
     """Parse a single ant descriptor of the form ``x,y,heading,color``."""
     parts = [value.strip() for value in spec.split(",")]
@@ -90,29 +116,60 @@ def build_ants(specs: Iterable[str] | None, width: int, height: int) -> List[Ant
 
 def make_topology(name: str, width: int, height: int) -> Topology:
     try:
-        topology_cls = _TOPOLOGY_MAP[name]
+        module_name, class_name = _TOPOLOGY_MAP[name].split(":")
     except KeyError as exc:  # pragma: no cover - argparse validates choices
         msg = f"Unsupported topology '{name}'"
         raise ValueError(msg) from exc
+    topology_cls = getattr(importlib.import_module(module_name), class_name)
     return topology_cls(width, height)
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Langton ant simulator")
-    parser.add_argument("--width", type=_positive_int, default=40, help="Grid width")
-    parser.add_argument("--height", type=_positive_int, default=20, help="Grid height")
+    parser.add_argument("--width", type=_positive_int, default=None, help="Grid width (default 40, or taken from --init-grid)")
+    parser.add_argument("--height", type=_positive_int, default=None, help="Grid height (default 20, or taken from --init-grid)")
     parser.add_argument(
         "--topology",
         choices=sorted(_TOPOLOGY_MAP.keys()),
         default="torus",
         help="Surface topology",
     )
+    parser.add_argument(
+        "--glue",
+        default=None,
+        metavar="SPEC",
+        help="Glue the grid's sides instead of using --topology, e.g. 'left=right, top~bottom' (unglued sides are walls)",
+    )
     parser.add_argument(
         "--backend",
-        choices=["ascii", "mpl"],
+        choices=["ascii", "mpl", "none"],
         default="ascii",
-        help="Rendering backend to use",
+        help="Rendering backend to use ('none' only computes and reports progress)",
+    )
+    parser.add_argument(
+        "--rule",
+        type=_rule,
+        default=None,
+        help=(
+            "Turn string, one letter per cell color: R(ight), L(eft), N(o turn), U(-turn); default RL. "
+            "A turmite may be given in Golly notation, e.g. '{{{1,2,0},{0,8,0}}}'"
+        ),
+    )
+    initial = parser.add_mutually_exclusive_group()
+    initial.add_argument(
+        "--init-grid",
+        default=None,
+        metavar="FILE",
+        help="Start from the cell states in a .npy array (memory-mapped) or an image (dark pixels become black cells)",
+    )
+    initial.add_argument(
+        "--init-random",
+        type=_density,
+        default=None,
+        metavar="DENSITY",
+        help="Start with this fraction of cells colored at random",
     )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for --init-random and --ants-generate")
     parser.add_argument(
         "--steps",
         type=_non_negative_int,
@@ -131,6 +188,13 @@ def build_parser() -> argparse.ArgumentParser:
         default=1,
         help="Simulation steps to compute between rendered frames",
     )
+    parser.add_argument(
+        "--frame-schedule",
+        default=None,
+        metavar="SPEC",
+        help="Render frames on a schedule instead of every --steps-per-frame steps: "
+        "log:N, geom:RATIO, steps:A,B,..., every:N or change:bbox|colored[,every=K]",
+    )
     parser.add_argument(
         "--trail-lifetime",
         type=_non_negative_int,
@@ -152,6 +216,18 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Do not open the Matplotlib window (mpl backend only)",
     )
+    parser.add_argument(
+        "--no-blit",
+        action="store_true",
+        help="Redraw the whole Matplotlib figure every frame (for GUI backends without blitting)",
+    )
+    parser.add_argument(
+        "--lod",
+        choices=("any", "majority", "off"),
+        default="any",
+        help="Reduce grids larger than the window to its pixels: a block shows its highest color "
+        "(any trail or ant wins) or its majority; 'off' draws every cell (mpl backend only)",
+    )
     parser.add_argument(
         "--save-path",
         default=None,
@@ -175,12 +251,141 @@ def build_parser() -> argparse.ArgumentParser:
         help="Explicit Matplotlib writer (e.g., pillow, imagemagick, ffmpeg)",
     )
     parser.add_argument(
+        "--save-jobs",
+        type=_positive_int,
+        default=1,
+        help="Render and encode --save-path in this many processes, one contiguous segment each (no window is shown)",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=_non_negative_float,
+        default=1.0,
+        help="Seconds between progress reports on stderr (--backend none; 0 prints only the summary)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Save the full simulation state to this .npz file when the run ends or is stopped with Ctrl+C",
+    )
+    parser.add_argument(
+        "--resume",
+        default=None,
+        help="Continue from a checkpoint written with --checkpoint (same grid size and ants)",
+    )
+    parser.add_argument(
+        "--render-process",
+        action="store_true",
+        help="Simulate in a separate process and render its latest shared-memory snapshot (mpl backend only)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="Advance ants in this many processes over a shared-memory grid (results match --workers 1)",
+    )
+    parser.add_argument(
+        "--stats-out",
+        default=None,
+        help="Stream run statistics to a .csv or .npz file",
+    )
+    parser.add_argument(
+        "--stats-every",
+        type=_positive_int,
+        default=100,
+        help="Sample run statistics every N steps (with --stats-out)",
+    )
+    parser.add_argument(
+        "--snapshot-every",
+        type=_positive_int,
+        default=None,
+        metavar="N",
+        help="Save the grid every N steps from background threads (see --snapshot-dir)",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        default=None,
+        metavar="DIR",
+        help="Directory for --snapshot-every files, named stepNNNNNNNNNN.png/.npy (default: snapshots)",
+    )
+    parser.add_argument(
+        "--snapshot-format",
+        choices=("png", "npy"),
+        default="png",
+        help="Palette PNG images or raw uint8 .npy grids (with --snapshot-every)",
+    )
+    parser.add_argument(
+        "--heatmap-out",
+        default=None,
+        help="Count visits per cell and write them to a .npy file or .png heatmap when the run ends",
+    )
+    parser.add_argument(
+        "--heatmap",
+        action="store_true",
+        help="Overlay per-cell visit counts on the animation (mpl backend only)",
+    )
+    parser.add_argument(
+        "--record",
+        default=None,
+        help="Record every ant move to a compact trajectory file for later replay",
+    )
+    parser.add_argument(
+        "--keyframe-interval",
+        type=_positive_int,
+        default=None,
+        help="With --record, write a seekable recording with a full-state keyframe every N steps",
+    )
+    parser.add_argument(
+        "--replay",
+        default=None,
+        help="Render a recorded trajectory instead of simulating (grid size, topology and ants come from the file)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time simulation, topology, trail and rendering phases and print a summary at exit",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=["table", "json"],
+        default="table",
+        help="Format of the profiling summary",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=None,
+        help="Write the profiling summary to this file instead of stderr",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        default=None,
+        help="Also dump cProfile stats or collapsed stacks to this path (implies --profile)",
+    )
+    parser.add_argument(
+        "--profile-dump-format",
+        choices=["cprofile", "collapsed"],
+        default=None,
+        help="Dump format; inferred from --profile-dump extension (.prof/.pstats -> cprofile)",
+    )
+    population = parser.add_mutually_exclusive_group()
+    population.add_argument(
         "--ant",
         dest="ant_specs",
         action="append",
         metavar="SPEC",
         help="Ant spec formatted as x,y,heading,color. Can be repeated.",
     )
+    population.add_argument(
+        "--ants-file",
+        default=None,
+        metavar="FILE",
+        help="Load ants from a .csv (header with x,y[,heading,color,state,id]) or .npy file",
+    )
+    population.add_argument(
+        "--ants-generate",
+        default=None,
+        metavar="KIND:N",
+        help="Generate N ants: 'lattice:N' or 'random:N', optionally ',heading=H' and ',color=C' (uses --seed)",
+    )
     return parser
 
 
@@ -296,11 +501,41 @@ def _run_mpl_backend(simulation: Simulation, args: argparse.Namespace, parser: a
             "Install with `pip install .[viz]`."
         )
 
+    if args.render_process:
+        _run_render_process(simulation, animator_cls, args)
+        return
+
     interval_ms = max(0, int(args.interval * 1000))
+    overlays = {"heatmap": True} if args.heatmap else {}
+    overlays.update(_view_options(args))
+    if args.frame_schedule:
+        overlays["schedule"] = _frame_schedule(simulation, args, parser)
+    if args.save_path and args.save_jobs > 1:
+        if args.frame_schedule:
+            parser.error("--frame-schedule cannot be combined with --save-jobs.")
+        from ant.renderers.export import export_parallel
+
+        save_kwargs = _build_save_kwargs(args, parser)
+        try:
+            export_parallel(
+                simulation,
+                args.save_path,
+                steps=args.steps,
+                steps_per_frame=args.steps_per_frame,
+                jobs=args.save_jobs,
+                frame_interval_ms=interval_ms,
+                **save_kwargs,
+                **overlays,
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+        return
+
     animator = animator_cls(
         simulation,
         frame_interval_ms=interval_ms,
         steps_per_frame=args.steps_per_frame,
+        **overlays,
     )
     save_kwargs = _build_save_kwargs(args, parser)
     animator.run(
@@ -311,19 +546,129 @@ def _run_mpl_backend(simulation: Simulation, args: argparse.Namespace, parser: a
     )
 
 
-def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+def _view_options(args: argparse.Namespace) -> dict:
+    """Animator options for drawing the window, given only when they differ from the defaults."""
 
-    ants = build_ants(args.ant_specs, args.width, args.height)
-    topology = make_topology(args.topology, args.width, args.height)
-    simulation = Simulation(
-        width=args.width,
-        height=args.height,
-        ants=ants,
-        topology=topology,
-        trail_lifetime=args.trail_lifetime,
-    )
+    options: dict = {}
+    if args.no_blit:
+        options["blit"] = False
+    if args.lod != "any":
+        options["lod"] = None if args.lod == "off" else args.lod
+    return options
+
+
+def _run_render_process(simulation: Simulation, animator_cls, args: argparse.Namespace) -> None:
+    from ant.renderers.shared import SharedFrameBuffer, SharedSnapshotView, start_publisher
+
+    grid = simulation.grid
+    buffer = SharedFrameBuffer(grid.width, grid.height, len(simulation.ants))
+    publisher = start_publisher(simulation, buffer, steps=args.steps, steps_per_publish=args.steps_per_frame)
+    try:
+        if args.no_show:
+            publisher.join()
+            return
+        view = SharedSnapshotView(buffer, simulation)
+        animator = animator_cls(
+            view,
+            frame_interval_ms=max(0, int(args.interval * 1000)),
+            steps_per_frame=args.steps_per_frame,
+            **_view_options(args),
+        )
+        animator.run(steps=None, show=True)
+    finally:
+        if publisher.is_alive():
+            publisher.terminate()
+        publisher.join()
+        buffer.close()
+
+
+def _check_render_process(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    if not args.render_process:
+        return
+    if args.backend != "mpl":
+        parser.error("--render-process requires --backend mpl.")
+    conflicting = [
+        flag
+        for flag, value in (
+            ("--save-path", args.save_path),
+            ("--stats-out", args.stats_out),
+            ("--heatmap-out", args.heatmap_out),
+            ("--heatmap", args.heatmap),
+            ("--save-jobs", args.save_jobs > 1),
+            ("--frame-schedule", args.frame_schedule),
+            ("--record", args.record),
+            ("--snapshot-every", args.snapshot_every),
+            ("--profile", args.profile or args.profile_dump),
+            ("--workers", args.workers > 1),
+            ("--checkpoint", args.checkpoint),
+            ("--resume", args.resume),
+        )
+        if value
+    ]
+    if conflicting:
+        parser.error(f"--render-process cannot be combined with {', '.join(conflicting)}.")
+
+
+def _infer_dump_format(dump_path: str) -> str:
+    if Path(dump_path).suffix.lower() in {".prof", ".pstats"}:
+        return "cprofile"
+    return "collapsed"
+
+
+def _run_profiled(run: Callable[[], int], args: argparse.Namespace) -> int:
+    from ant.profiling import PhaseProfiler, default_targets
+
+    dump_format = None
+    if args.profile_dump:
+        dump_format = args.profile_dump_format or _infer_dump_format(args.profile_dump)
+
+    profiler = PhaseProfiler()
+    profiler.start(default_targets(matplotlib=args.backend == "mpl"))
+    cprofile = None
+    if dump_format == "cprofile":
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+    try:
+        return run()
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+        profiler.stop()
+        report = profiler.format_json() if args.profile_format == "json" else profiler.format_table()
+        if args.profile_output:
+            Path(args.profile_output).write_text(report + "\n")
+        else:
+            sys.stderr.write(report + "\n")
+        if cprofile is not None:
+            cprofile.dump_stats(args.profile_dump)
+        elif dump_format == "collapsed":
+            Path(args.profile_dump).write_text("\n".join(profiler.collapsed_stacks()) + "\n")
+
+
+def _frame_schedule(simulation: Simulation, args: argparse.Namespace, parser: argparse.ArgumentParser):
+    if not args.frame_schedule:
+        return None
+    from ant.renderers.schedule import ChangeSchedule, parse_schedule
+
+    try:
+        schedule = parse_schedule(args.frame_schedule, args.steps)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if isinstance(schedule, ChangeSchedule) and schedule.uses_statistics and simulation.stats is None:
+        simulation.track_statistics()
+    return schedule
+
+
+def _run_backend(simulation: Simulation, args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Run the selected backend and return the exit status (130 if a headless run was interrupted)."""
+
+    if args.backend == "none":
+        from ant.renderers.headless import HeadlessRunner
+
+        runner = HeadlessRunner(simulation, report_interval=args.progress_interval)
+        return 0 if runner.run(args.steps) else 130
     if args.backend == "ascii":
         renderer = AsciiRenderer(use_color=not args.no_color)
         runner = LiveAsciiRunner(
@@ -332,6 +677,7 @@ def main(argv: list[str] | None = None) -> int:
             interval=args.interval,
             clear_screen=not args.no_clear,
             steps_per_frame=args.steps_per_frame,
+            schedule=_frame_schedule(simulation, args, parser),
         )
         runner.run(total_steps=args.steps)
     else:
@@ -339,5 +685,379 @@ def main(argv: list[str] | None = None) -> int:
     return 0
 
 
+def _build_simulation(args: argparse.Namespace, parser: argparse.ArgumentParser) -> Simulation:
+    if args.replay:
+        from ant.io.trajectory import open_replay
+
+        if args.record or args.resume:
+            parser.error(f"{'--record' if args.record else '--resume'} cannot be combined with --replay.")
+        try:
+            simulation = open_replay(args.replay, trail_lifetime=args.trail_lifetime)
+        except (OSError, ValueError) as exc:
+            parser.error(f"Cannot replay '{args.replay}': {exc}")
+        args.steps = min(args.steps, simulation.steps_remaining)
+        return simulation
+
+    grid = _initial_grid(args, parser)
+    bulk = args.ants_file or args.ants_generate
+    ants = [] if bulk else build_ants(args.ant_specs, args.width, args.height)
+    if args.glue:
+        from ant.topology.base import GluedTopology
+
+        try:
+            topology = GluedTopology(args.width, args.height, args.glue)
+        except ValueError as exc:
+            parser.error(f"Invalid --glue: {exc}")
+    else:
+        topology = make_topology(args.topology, args.width, args.height)
+    if args.workers > 1:
+        from ant.core.parallel import ParallelSimulation
+
+        simulation = ParallelSimulation(
+            width=args.width,
+            height=args.height,
+            ants=ants,
+            topology=topology,
+            trail_lifetime=args.trail_lifetime,
+            workers=args.workers,
+            rule=args.rule,
+        )
+        if grid is not None:
+            simulation.grid.cell_array()[:] = grid.cell_array()
+    else:
+        simulation = Simulation(
+            width=args.width,
+            height=args.height,
+            ants=ants,
+            topology=topology,
+            trail_lifetime=args.trail_lifetime,
+            grid=grid,
+            rule=args.rule,
+        )
+    if bulk:
+        _add_bulk_ants(simulation, args, parser)
+    return simulation
+
+
+def _add_bulk_ants(simulation: Simulation, args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    from ant.io.population import generate_ants, load_ants
+
+    option = "--ants-file" if args.ants_file else "--ants-generate"
+    try:
+        if args.ants_file:
+            columns = load_ants(args.ants_file)
+        else:
+            columns = generate_ants(args.ants_generate, args.width, args.height, seed=args.seed)
+        simulation.ants.add_arrays(**columns)
+    except (OSError, ValueError) as exc:
+        if hasattr(simulation, "close"):
+            simulation.close()
+        parser.error(f"Invalid {option}: {exc}")
+
+
+def _initial_grid(args: argparse.Namespace, parser: argparse.ArgumentParser) -> Grid | None:
+    """Build the starting grid from --init-grid/--init-random and settle --width/--height."""
+
+    colors = as_rule(args.rule).colors
+    cells = None
+    if args.init_grid:
+        from ant.io.initial import check_states, load_cells
+
+        try:
+            cells = load_cells(args.init_grid)
+            check_states(cells, colors)
+        except (OSError, ValueError) as exc:
+            parser.error(f"Cannot load --init-grid '{args.init_grid}': {exc}")
+        height, width = cells.shape
+        if (args.width or width, args.height or height) != (width, height):
+            parser.error(f"--init-grid is {width}x{height}, which does not match --width/--height.")
+        args.width, args.height = width, height
+    args.width = args.width or 40
+    args.height = args.height or 20
+    if args.init_random is not None:
+        from ant.io.initial import random_cells
+
+        cells = random_cells(args.width, args.height, args.init_random, seed=args.seed, colors=colors)
+    return None if cells is None else Grid.from_array(cells)
+
+
+def _finish_stats(simulation: Simulation, writer) -> None:
+    if simulation.stats is not None:
+        simulation.stats.sample(simulation.steps_executed)
+    writer.close()
+
+
+def _checkpoint_on_exit(simulation: Simulation, path: str):
+    """Exit callback saving ``path`` unless a second Ctrl+C may have stopped mid-step."""
+
+    from ant.io.checkpoint import write_checkpoint
+
+    def save(exc_type, _exc, _traceback) -> bool:
+        if exc_type is None or not issubclass(exc_type, KeyboardInterrupt):
+            write_checkpoint(simulation, path)
+        return False
+
+    return save
+
+
+def build_inspect_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ant-sim inspect",
+        description="Show the state of a recorded run at an arbitrary step",
+    )
+    parser.add_argument("recording", help="Recording written with --record")
+    parser.add_argument("--step", type=_non_negative_int, required=True, help="Absolute step to inspect")
+    parser.add_argument(
+        "--trail-lifetime",
+        type=_non_negative_int,
+        default=None,
+        help="Trail lifetime used to rebuild trails (defaults to the recorded value)",
+    )
+    parser.add_argument("--no-color", action="store_true", help="Render without ANSI colors")
+    parser.add_argument("--npy", default=None, help="Also save the cell states at that step as a .npy array")
+    return parser
+
+
+def inspect_main(argv: list[str]) -> int:
+    parser = build_inspect_parser()
+    args = parser.parse_args(argv)
+    from ant.io.trajectory import open_replay
+
+    try:
+        replay = open_replay(args.recording, trail_lifetime=args.trail_lifetime)
+        replay.seek(args.step)
+    except (OSError, ValueError, IndexError) as exc:
+        parser.error(f"Cannot inspect '{args.recording}': {exc}")
+    sys.stdout.write(AsciiRenderer(use_color=not args.no_color).render(replay) + "\n")
+    if args.npy:
+        import numpy as np
+
+        np.save(args.npy, np.array(replay.grid.cells, dtype=np.uint8))
+    return 0
+
+
+def build_sweep_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ant-sim sweep",
+        description="Run many rules headlessly on a process pool and write one summary row per rule",
+    )
+    parser.add_argument("--rule", dest="rules", action="append", type=_rule, default=[], help="Rule to run (repeatable)")
+    parser.add_argument("--rules-file", default=None, help="File with one rule per line ('#' starts a comment)")
+    parser.add_argument("--random", type=_non_negative_int, default=0, help="Also run N random turmites")
+    parser.add_argument("--states", type=_positive_int, default=2, help="Internal states of random turmites")
+    parser.add_argument("--colors", type=_positive_int, default=2, help="Cell colors of random turmites")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --random")
+    parser.add_argument("--width", type=_positive_int, default=128, help="Grid width")
+    parser.add_argument("--height", type=_positive_int, default=128, help="Grid height")
+    parser.add_argument("--steps", type=_non_negative_int, default=10_000, help="Steps per rule")
+    parser.add_argument("--topology", choices=sorted(_TOPOLOGY_MAP.keys()), default="torus", help="Topology to use")
+    parser.add_argument("--jobs", type=_positive_int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", default=None, help="Write the summary CSV here instead of stdout")
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse and extend power-of-two checkpoints from the result cache",
+    )
+    parser.add_argument("--cache-dir", default=None, help="Result cache directory (default: ~/.cache/ant-sim)")
+    parser.add_argument(
+        "--queue",
+        default=None,
+        metavar="DIR",
+        help="Share the sweep through a work queue in DIR; without rules, join an existing queue as a worker",
+    )
+    parser.add_argument(
+        "--lease",
+        type=_positive_float,
+        default=None,
+        metavar="SECONDS",
+        help="Seconds without a heartbeat before a queued job is re-claimed (default: 60)",
+    )
+    return parser
+
+
+def sweep_main(argv: list[str]) -> int:
+    import csv
+    import os
+    import random
+
+    from ant.core.rules import Turmite, load_rules
+    from ant.sweep import SweepConfig, sweep
+
+    parser = build_sweep_parser()
+    args = parser.parse_args(argv)
+    rules = list(args.rules)
+    if args.rules_file:
+        try:
+            rules.extend(load_rules(args.rules_file))
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+    if args.random:
+        if args.colors < 2:
+            parser.error("--colors must be at least 2.")
+        rng = random.Random(args.seed)
+        rules.extend(Turmite.random(args.states, args.colors, rng) for _ in range(args.random))
+    if args.queue is None and args.lease is not None:
+        parser.error("--lease needs --queue.")
+    if args.queue is not None and (args.cache or args.cache_dir):
+        parser.error("--queue keeps its checkpoints in the queue directory; drop --cache and --cache-dir.")
+    if not rules and args.queue is None:
+        parser.error("Give at least one of --rule, --rules-file or --random.")
+
+    cache_dir = None
+    if args.cache or args.cache_dir:
+        from ant.io.cache import default_cache_dir
+
+        cache_dir = str(args.cache_dir or default_cache_dir())
+    config = SweepConfig(
+        width=args.width,
+        height=args.height,
+        steps=args.steps,
+        topology=make_topology(args.topology, args.width, args.height),
+        cache_dir=cache_dir,
+    )
+    if args.queue is not None:
+        from ant.sweep_queue import DEFAULT_LEASE_SECONDS, SweepQueue, run_workers
+
+        try:
+            if rules:
+                queue = SweepQueue.create(args.queue, config, lease_seconds=args.lease or DEFAULT_LEASE_SECONDS)
+                queue.submit([rule.spec for rule in rules])
+            else:
+                queue = SweepQueue(args.queue)
+                queue.settings()
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+        run_workers(queue, args.jobs or os.cpu_count() or 1)
+        rows = queue.summaries()
+    else:
+        rows = sweep([rule.spec for rule in rules], config, jobs=args.jobs)
+    with ExitStack() as cleanup:
+        handle = cleanup.enter_context(open(args.out, "w", newline="")) if args.out else sys.stdout
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(handle, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+    return 0
+
+
+def _size(value: str) -> int:
+    from ant.io.cache import parse_size
+
+    try:
+        return parse_size(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def build_cache_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ant-sim cache", description="Inspect or shrink the result cache")
+    parser.add_argument("--cache-dir", default=None, help="Result cache directory (default: ~/.cache/ant-sim)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("ls", help="List cached configurations, most recently used first")
+    prune = commands.add_parser("prune", help="Evict least recently used checkpoints")
+    limit = prune.add_mutually_exclusive_group(required=True)
+    limit.add_argument("--max-size", type=_size, help="Keep at most this much, e.g. 500M or 2G")
+    limit.add_argument("--all", action="store_true", help="Remove every checkpoint")
+    return parser
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size} B"  # pragma: no cover - loop always returns
+
+
+def cache_main(argv: list[str]) -> int:
+    import time
+
+    from ant.io.cache import ResultCache
+
+    parser = build_cache_parser()
+    args = parser.parse_args(argv)
+    cache = ResultCache(args.cache_dir)
+    if args.command == "ls":
+        entries = cache.entries()
+        for entry in entries:
+            config = entry.config
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.last_used))
+            sys.stdout.write(
+                f"{entry.key[:12]}  {config['width']}x{config['height']} {config['topology']} "
+                f"rule={config['rule']} ants={len(config['ants'])}  steps={','.join(map(str, entry.steps))}  "
+                f"{_format_size(entry.size)}  used {used}\n"
+            )
+        sys.stdout.write(f"{len(entries)} configurations, {_format_size(sum(e.size for e in entries))} in {cache.root}\n")
+    else:
+        freed = cache.prune(0 if args.all else args.max_size)
+        sys.stdout.write(f"Freed {_format_size(freed)}; {_format_size(cache.size())} remain in {cache.root}\n")
+    return 0
+
+
+_SUBCOMMANDS = {"inspect": inspect_main, "sweep": sweep_main, "cache": cache_main}
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in _SUBCOMMANDS:
+        return _SUBCOMMANDS[argv[0]](list(argv[1:]))
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    _check_render_process(args, parser)
+
+    simulation = _build_simulation(args, parser)
+    with ExitStack() as cleanup:
+        if hasattr(simulation, "close"):
+            cleanup.callback(simulation.close)
+        # Restore before attaching any tracker, which would otherwise start from the blank grid.
+        if args.resume:
+            from ant.io.checkpoint import restore_checkpoint
+
+            try:
+                restore_checkpoint(simulation, args.resume)
+            except (OSError, ValueError, KeyError) as exc:
+                parser.error(f"Cannot resume from '{args.resume}': {exc}")
+        if args.stats_out:
+            from ant.io.columnar import open_column_writer
+
+            try:
+                stats_writer = open_column_writer(args.stats_out)
+            except ValueError as exc:
+                parser.error(str(exc))
+            simulation.track_statistics(every=args.stats_every, sink=stats_writer)
+            cleanup.callback(_finish_stats, simulation, stats_writer)
+        if args.heatmap and args.backend != "mpl":
+            parser.error("--heatmap requires --backend mpl.")
+        if args.heatmap_out and Path(args.heatmap_out).suffix.lower() not in {".npy", ".png"}:
+            parser.error("--heatmap-out must end in .npy or .png.")
+        if args.heatmap_out or args.heatmap:
+            visits = simulation.track_visits()
+            if args.heatmap_out:
+                cleanup.callback(visits.save, args.heatmap_out)
+        if args.checkpoint:
+            cleanup.push(_checkpoint_on_exit(simulation, args.checkpoint))
+        if args.record:
+            recorder = simulation.record(args.record, keyframe_interval=args.keyframe_interval)
+            cleanup.callback(recorder.close)
+        if args.snapshot_dir and not args.snapshot_every:
+            parser.error("--snapshot-dir needs --snapshot-every.")
+        if args.snapshot_every:
+            try:
+                snapshots = simulation.take_snapshots(
+                    args.snapshot_dir or "snapshots", every=args.snapshot_every, format=args.snapshot_format
+                )
+            except (OSError, ValueError) as exc:
+                parser.error(str(exc))
+            cleanup.callback(snapshots.close)
+
+        if args.profile or args.profile_dump:
+            return _run_profiled(lambda: _run_backend(simulation, args, parser), args)
+        return _run_backend(simulation, args, parser)
+
+
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
     sys.exit(main())
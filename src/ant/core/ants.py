@@ -0,0 +1,373 @@
+"""Struct-of-arrays storage for ant colonies.
+
+:class:`AntStore` keeps every ant attribute in its own flat array (id, x, y,
+heading code, internal state, trail color index), plus an ``id -> slot``
+index and an occupancy map from cell to the ants standing on it. Lookups,
+spawning and "which ant is on this cell" are O(1) per ant, and the arrays
+can be exposed to NumPy without copying.
+
+:class:`Ant` objects stay the public way to describe and inspect an ant.
+Once added to a store an ``Ant`` becomes a view of its slot: reads come from
+the arrays and writes go back into them, keeping the occupancy map current.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ant.core.direction import HEADING_CODES, HEADINGS, Heading
+from ant.topology.base import Coordinates
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+_FIELDS = ("ant_id", "x", "y", "heading", "trail_color", "state")
+
+
+class _AntField:
+    """Attribute that lives in the ant's own tuple until it is bound to a store."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.index = _FIELDS.index(name)
+
+    def __get__(self, ant: Optional["Ant"], owner: type) -> object:
+        if ant is None:
+            return self
+        store = ant._store
+        if store is None:
+            return ant._values[self.index]
+        return store._get(ant._slot, self.name)
+
+    def __set__(self, ant: "Ant", value: object) -> None:
+        store = ant._store
+        if store is None:
+            ant._values[self.index] = value
+        else:
+            store._set(ant._slot, self.name, value)
+
+
+class Ant:
+    """Stateful Langton ant; ``state`` is the internal state used by turmite rules."""
+
+    __slots__ = ("_store", "_slot", "_values")
+
+    ant_id = _AntField()
+    x = _AntField()
+    y = _AntField()
+    heading = _AntField()
+    trail_color = _AntField()
+    state = _AntField()
+
+    def __init__(
+        self,
+        ant_id: int,
+        x: int,
+        y: int,
+        heading: Heading,
+        trail_color: str,
+        state: int = 0,
+    ) -> None:
+        self._store: Optional[AntStore] = None
+        self._slot = -1
+        self._values = [ant_id, x, y, heading, trail_color, state]
+
+    def fields(self) -> Tuple[int, int, int, Heading, str, int]:
+        return tuple(getattr(self, name) for name in _FIELDS)  # type: ignore[return-value]
+
+    def position(self) -> Coordinates:
+        return Coordinates(self.x, self.y)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Ant):
+            return NotImplemented
+        return self.fields() == other.fields()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{name}={value!r}" for name, value in zip(_FIELDS, self.fields()))
+        return f"Ant({body})"
+
+    def __reduce__(self) -> tuple:
+        return Ant, self.fields()
+
+    @classmethod
+    def _view(cls, store: "AntStore", slot: int) -> "Ant":
+        ant = cls.__new__(cls)
+        ant._store, ant._slot, ant._values = store, slot, None
+        return ant
+
+
+class AntStore:
+    """Parallel arrays of ant attributes with an id index and an occupancy map.
+
+    Ants keep the order in which they were added; that order is the update
+    order of the simulation. The occupancy map lists, per occupied cell, the
+    slots standing there in arrival order, so :meth:`at` returns the ant that
+    arrived last.
+    """
+
+    def __init__(self, width: int, height: int, ants: Iterable[Ant] = ()) -> None:
+        self.width = width
+        self.height = height
+        self.ids = array("q")
+        self.xs = array("q")
+        self.ys = array("q")
+        self.headings = array("B")
+        self.states = array("q")
+        self.colors = array("q")
+        self.palette: List[str] = []
+        self._color_index: Dict[str, int] = {}
+        self._slots: Dict[int, int] = {}
+        self._views: List[Optional[Ant]] = []  # created on first access for bulk-added ants
+        self.occupancy: Dict[int, List[int]] = {}
+        for ant in ants:
+            self.add(ant)
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def __iter__(self) -> Iterator[Ant]:
+        return map(self.__getitem__, range(len(self._views)))
+
+    def __getitem__(self, slot: int) -> Ant:
+        view = self._views[slot]
+        if view is None:
+            view = self._views[slot] = Ant._view(self, slot)
+        return view
+
+    def __repr__(self) -> str:
+        return f"AntStore({list(self)!r})"
+
+    def columns(self) -> Tuple[array, ...]:
+        """The raw ``(ids, xs, ys, headings, states, colors)`` arrays."""
+
+        return self.ids, self.xs, self.ys, self.headings, self.states, self.colors
+
+    def copy(self) -> "AntStore":
+        """Return an independent store with the same ants (and fresh views)."""
+
+        return _rebuild_store(self.width, self.height, self.columns(), list(self.palette), self.occupancy)
+
+    def __reduce__(self) -> tuple:
+        return _rebuild_store, (self.width, self.height, self.columns(), self.palette, self.occupancy)
+
+    def add(self, ant: Ant) -> Ant:
+        """Append ``ant`` and return its view.
+
+        An unattached ``Ant`` is itself turned into the view; an ant that
+        already belongs to another store is copied.
+        """
+
+        ant_id, x, y, heading, trail_color, state = ant.fields()
+        if ant_id in self._slots:
+            msg = "Ant IDs must be unique"
+            raise ValueError(msg)
+        slot = len(self._views)
+        self.ids.append(ant_id)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.headings.append(HEADING_CODES[heading])
+        self.states.append(state)
+        self.colors.append(self._palette_index(trail_color))
+        self._slots[ant_id] = slot
+        self._enter(slot, y * self.width + x)
+        view = ant if ant._store is None else Ant(*ant.fields())
+        view._store, view._slot = self, slot
+        self._views.append(view)
+        return view
+
+    def add_arrays(
+        self,
+        xs: Sequence[int],
+        ys: Sequence[int],
+        headings: Sequence[int],
+        *,
+        ids: Sequence[int] | None = None,
+        states: Sequence[int] | None = None,
+        trail_colors: str | Sequence[str] = "red",
+    ) -> range:
+        """Append many ants from equal-length columns at once and return their slots.
+
+        ``headings`` holds heading codes (index into :data:`HEADINGS`) and
+        ``trail_colors`` one colour name per ant or a single name for all of
+        them. ``ids`` default to consecutive numbers after the largest id in
+        use. Every column is validated before anything is added.
+        """
+
+        import numpy as np
+
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        count = len(xs)
+        start_id = max(self._slots, default=0) + 1
+        ids = np.arange(start_id, start_id + count) if ids is None else np.asarray(ids, dtype=np.int64)
+        headings = np.asarray(headings, dtype=np.int64)
+        states = np.zeros(count, dtype=np.int64) if states is None else np.asarray(states, dtype=np.int64)
+        if isinstance(trail_colors, str):
+            colors = np.full(count, self._palette_index(trail_colors), dtype=np.int64)
+        else:
+            index = self._color_index
+            names = np.asarray(trail_colors, dtype=str).tolist()
+            colors = np.array(
+                [index[name] if name in index else self._palette_index(name) for name in names], dtype=np.int64
+            )
+        if any(column.shape != (count,) for column in (ys, ids, headings, states, colors)):
+            msg = "Ant columns must be one-dimensional and of equal length"
+            raise ValueError(msg)
+        outside = (xs < 0) | (xs >= self.width) | (ys < 0) | (ys >= self.height)
+        if outside.any():
+            row = int(np.argmax(outside))
+            msg = f"Ant {row} at ({xs[row]}, {ys[row]}) lies outside the {self.width}x{self.height} grid"
+            raise ValueError(msg)
+        if ((headings < 0) | (headings >= len(HEADINGS))).any():
+            msg = f"Heading codes must lie in 0..{len(HEADINGS) - 1}"
+            raise ValueError(msg)
+        id_list = ids.tolist()
+        if _has_duplicates(ids) or not self._slots.keys().isdisjoint(id_list):
+            msg = "Ant IDs must be unique"
+            raise ValueError(msg)
+
+        first = len(self._views)
+        self.ids.frombytes(ids.tobytes())
+        self.xs.frombytes(xs.tobytes())
+        self.ys.frombytes(ys.tobytes())
+        self.headings.frombytes(headings.astype(np.uint8).tobytes())
+        self.states.frombytes(states.tobytes())
+        self.colors.frombytes(colors.tobytes())
+        slots = range(first, first + count)
+        self._slots.update(zip(id_list, slots))
+        self._views.extend([None] * count)
+        cells = ys * self.width + xs
+        cell_list = cells.tolist()
+        if not _has_duplicates(cells) and self.occupancy.keys().isdisjoint(cell_list):
+            self.occupancy.update(zip(cell_list, ([slot] for slot in slots)))
+        else:
+            for slot, cell in zip(slots, cell_list):
+                self._enter(slot, cell)
+        return slots
+
+    def _palette_index(self, color: str) -> int:
+        index = self._color_index.get(color)
+        if index is None:
+            index = self._color_index[color] = len(self.palette)
+            self.palette.append(color)
+        return index
+
+    def slot(self, ant_id: int) -> int:
+        try:
+            return self._slots[ant_id]
+        except KeyError:
+            msg = f"Unknown ant id {ant_id}"
+            raise KeyError(msg) from None
+
+    def by_id(self, ant_id: int) -> Ant:
+        return self[self.slot(ant_id)]
+
+    def get(self, ant_id: int) -> Optional[Ant]:
+        slot = self._slots.get(ant_id)
+        return None if slot is None else self[slot]
+
+    def at(self, x: int, y: int) -> Optional[Ant]:
+        """Return the ant that most recently arrived at ``(x, y)``, if any."""
+
+        slots = self.occupancy.get(y * self.width + x)
+        return None if slots is None else self[slots[-1]]
+
+    def place(self, slot: int, x: int, y: int, heading_code: int | None = None) -> None:
+        """Move the ant in ``slot`` (and optionally turn it), updating occupancy."""
+
+        old = self.ys[slot] * self.width + self.xs[slot]
+        new = y * self.width + x
+        self.xs[slot] = x
+        self.ys[slot] = y
+        if heading_code is not None:
+            self.headings[slot] = heading_code
+        if old != new:
+            self._leave(slot, old)
+            self._enter(slot, new)
+
+    def _enter(self, slot: int, cell: int) -> None:
+        slots = self.occupancy.get(cell)
+        if slots is None:
+            self.occupancy[cell] = [slot]
+        else:
+            slots.append(slot)
+
+    def _leave(self, slot: int, cell: int) -> None:
+        slots = self.occupancy[cell]
+        if len(slots) == 1:
+            del self.occupancy[cell]
+        else:
+            slots.remove(slot)
+
+    def _get(self, slot: int, name: str) -> object:
+        if name == "x":
+            return self.xs[slot]
+        if name == "y":
+            return self.ys[slot]
+        if name == "heading":
+            return HEADINGS[self.headings[slot]]
+        if name == "state":
+            return self.states[slot]
+        if name == "ant_id":
+            return self.ids[slot]
+        return self.palette[self.colors[slot]]
+
+    def _set(self, slot: int, name: str, value: object) -> None:
+        if name == "x":
+            self.place(slot, value, self.ys[slot])  # type: ignore[arg-type]
+        elif name == "y":
+            self.place(slot, self.xs[slot], value)  # type: ignore[arg-type]
+        elif name == "heading":
+            self.headings[slot] = HEADING_CODES[value]  # type: ignore[index]
+        elif name == "state":
+            self.states[slot] = value  # type: ignore[assignment]
+        elif name == "trail_color":
+            self.colors[slot] = self._palette_index(value)  # type: ignore[arg-type]
+        else:
+            msg = "ant_id cannot be changed once the ant is in a simulation"
+            raise AttributeError(msg)
+
+    def arrays(self) -> Dict[str, "np.ndarray"]:
+        """Zero-copy NumPy views of the columns.
+
+        The views pin the underlying buffers: drop them before adding ants.
+        """
+
+        import numpy as np
+
+        return {
+            "id": np.frombuffer(self.ids, dtype=np.int64),
+            "x": np.frombuffer(self.xs, dtype=np.int64),
+            "y": np.frombuffer(self.ys, dtype=np.int64),
+            "heading": np.frombuffer(self.headings, dtype=np.uint8),
+            "state": np.frombuffer(self.states, dtype=np.int64),
+            "color": np.frombuffer(self.colors, dtype=np.int64),
+        }
+
+
+def _has_duplicates(values: "np.ndarray") -> bool:
+    ordered = values.copy()
+    ordered.sort()
+    return bool((ordered[1:] == ordered[:-1]).any())
+
+
+def _rebuild_store(
+    width: int,
+    height: int,
+    columns: Tuple[array, ...],
+    palette: List[str],
+    occupancy: Dict[int, List[int]],
+) -> AntStore:
+    store = AntStore(width, height)
+    store.ids, store.xs, store.ys, store.headings, store.states, store.colors = (
+        array(column.typecode, column) for column in columns
+    )
+    store.palette = palette
+    store._color_index = {color: index for index, color in enumerate(palette)}
+    store._slots = {ant_id: slot for slot, ant_id in enumerate(store.ids)}
+    store._views = [None] * len(store.ids)
+    store.occupancy = {cell: list(slots) for cell, slots in occupancy.items()}
+    return store
@@ -28,6 +28,10 @@ class Heading(Enum):
         return order[(idx - 1) % len(order)]
 
 
+HEADINGS = (Heading.NORTH, Heading.EAST, Heading.SOUTH, Heading.WEST)
+HEADING_CODES = {heading: code for code, heading in enumerate(HEADINGS)}
+
+
 @dataclass(frozen=True)
 class Step:
     """Movement delta."""
@@ -0,0 +1,275 @@
+"""Copy-on-write branches of a running simulation.
+
+:func:`fork` writes the grid buffers once into a temporary snapshot file and
+gives every branch a private (``ACCESS_COPY``) memory map of it. The OS
+shares each page-sized tile of the grid between all branches until a branch
+writes to it, so forking a large grid costs one copy however many branches
+are made, and memory grows only with the tiles the branches actually change.
+
+:func:`run_branches` advances branches on a process pool. Only tiles that
+differ from the snapshot travel between processes. :func:`divergence`
+compares branches with vectorized, chunked passes over their mapped buffers.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+from ant.core.ants import AntStore
+from ant.core.grid import Grid
+from ant.core.rules import AnyRule
+from ant.core.simulation import Simulation
+from ant.topology.base import Topology
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+Tiles = Dict[int, bytes]  # byte offset in the snapshot -> contents of that tile
+
+_TILE = mmap.PAGESIZE
+_CHUNK_TILES = 256
+
+
+def _align(size: int) -> int:
+    granularity = mmap.ALLOCATIONGRANULARITY
+    return -(-size // granularity) * granularity
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:  # pragma: no cover - already cleaned up
+        pass
+
+
+class GridSnapshot:
+    """Frozen simulation state that branches map copy-on-write."""
+
+    def __init__(self, simulation: Simulation) -> None:
+        grid = simulation.grid
+        size = grid.width * grid.height
+        cells, owners, expiry = grid.buffers()
+        self.width, self.height = grid.width, grid.height
+        self.offsets = (0, _align(size), _align(size) + _align(8 * size))
+        self.length = self.offsets[2] + _align(8 * size)
+        self.clock = grid.clock
+        self.steps = simulation.steps_executed
+        self.ants = simulation.ants.copy()
+        self.topology: Topology = simulation.topology
+        self.rule: AnyRule = simulation.rule
+        self.trail_lifetime = simulation.trail_lifetime
+        with tempfile.NamedTemporaryFile(prefix="ant-fork-", suffix=".grid", delete=False) as handle:
+            self.path = handle.name
+            self._finalizer = weakref.finalize(self, _remove, self.path)
+            handle.truncate(self.length)
+            for offset, buffer in zip(self.offsets, (cells, owners, expiry)):
+                handle.seek(offset)
+                handle.write(memoryview(buffer).cast("B"))
+
+    def __reduce__(self) -> tuple:
+        # Worker processes attach to the same file but never delete it.
+        return _attach, ({key: value for key, value in self.__dict__.items() if key != "_finalizer"},)
+
+    def map(self, access: int = mmap.ACCESS_COPY) -> mmap.mmap:
+        with open(self.path, "rb") as handle:
+            return mmap.mmap(handle.fileno(), self.length, access=access)
+
+    def branch(self) -> "Branch":
+        return Branch(self)
+
+
+def _attach(state: dict) -> GridSnapshot:
+    snapshot = object.__new__(GridSnapshot)
+    snapshot.__dict__.update(state)
+    return snapshot
+
+
+class Branch(Simulation):
+    """A :class:`Simulation` whose grid is a private copy-on-write view of a snapshot."""
+
+    def __init__(self, snapshot: GridSnapshot) -> None:
+        self.snapshot = snapshot
+        self.mapping = snapshot.map()
+        view = memoryview(self.mapping)
+        size = snapshot.width * snapshot.height
+        cells_at, owners_at, expiry_at = snapshot.offsets
+        grid = Grid.over_buffers(
+            snapshot.width,
+            snapshot.height,
+            view[cells_at : cells_at + size],
+            view[owners_at : owners_at + 8 * size].cast("q"),
+            view[expiry_at : expiry_at + 8 * size].cast("q"),
+            clock=snapshot.clock,
+        )
+        super().__init__(
+            snapshot.width,
+            snapshot.height,
+            [],
+            snapshot.topology,
+            snapshot.trail_lifetime,
+            grid=grid,
+            rule=snapshot.rule,
+        )
+        self._ants = snapshot.ants.copy()
+        self.steps_executed = snapshot.steps
+
+    def changed_tiles(self) -> Tiles:
+        """Return the tiles of this branch that differ from its snapshot."""
+
+        base = self.snapshot.map(mmap.ACCESS_READ)
+        try:
+            return _diff_tiles(self.mapping, base)
+        finally:
+            base.close()
+
+
+def fork(simulation: Simulation, n: int) -> List[Branch]:
+    """Return ``n`` independent branches continuing from ``simulation``'s current state."""
+
+    if n < 0:
+        msg = "n must be non-negative"
+        raise ValueError(msg)
+    snapshot = GridSnapshot(simulation)
+    return [snapshot.branch() for _ in range(n)]
+
+
+def _diff_tiles(current: mmap.mmap, base: mmap.mmap) -> Tiles:
+    import numpy as np
+
+    ours = np.frombuffer(current, dtype=np.uint8)
+    theirs = np.frombuffer(base, dtype=np.uint8)
+    tiles: Tiles = {}
+    block = _TILE * _CHUNK_TILES
+    for start in range(0, len(ours), block):
+        a = ours[start : start + block].reshape(-1, _TILE)
+        b = theirs[start : start + block].reshape(-1, _TILE)
+        for index in np.flatnonzero((a != b).any(axis=1)).tolist():
+            offset = start + index * _TILE
+            tiles[offset] = current[offset : offset + _TILE]
+    return tiles
+
+
+def _advance(snapshot: GridSnapshot, tiles: Tiles, ants: AntStore, steps_executed: int, clock: int, steps: int):
+    branch = Branch(snapshot)
+    for offset, data in tiles.items():
+        branch.mapping[offset : offset + len(data)] = data
+    branch._ants = ants
+    branch.steps_executed = steps_executed
+    branch.grid.clock = clock
+    branch.run(steps)
+    return branch.changed_tiles(), branch.ants, branch.steps_executed, branch.grid.clock
+
+
+def run_branches(branches: Sequence[Branch], steps: int, *, jobs: int | None = None) -> None:
+    """Advance every branch by ``steps`` steps, using ``jobs`` worker processes."""
+
+    if steps < 0:
+        msg = "Steps must be non-negative"
+        raise ValueError(msg)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 0:
+        msg = "jobs must be a positive integer"
+        raise ValueError(msg)
+    if jobs == 1 or len(branches) <= 1:
+        for branch in branches:
+            branch.run(steps)
+        return
+    if any(
+        branch.stats is not None
+        or branch.recorder is not None
+        or branch.visits is not None
+        or branch.snapshots is not None
+        for branch in branches
+    ):
+        msg = "Branches with statistics, visit counts, snapshots or a recorder attached can only run with jobs=1"
+        raise ValueError(msg)
+
+    sent = [branch.changed_tiles() for branch in branches]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(branches))) as pool:
+        futures = [
+            pool.submit(
+                _advance, branch.snapshot, tiles, branch.ants, branch.steps_executed, branch.grid.clock, steps
+            )
+            for branch, tiles in zip(branches, sent)
+        ]
+        for branch, tiles, future in zip(branches, sent, futures):
+            changed, ants, steps_executed, clock = future.result()
+            _apply_tiles(branch, tiles, changed)
+            _adopt_ants(branch.ants, ants)
+            branch.steps_executed = steps_executed
+            branch.grid.clock = clock
+
+
+def _apply_tiles(branch: Branch, sent: Tiles, changed: Tiles) -> None:
+    stale = [offset for offset in sent if offset not in changed]
+    if stale:  # tiles the worker wrote back to their snapshot contents
+        base = branch.snapshot.map(mmap.ACCESS_READ)
+        try:
+            for offset in stale:
+                branch.mapping[offset : offset + _TILE] = base[offset : offset + _TILE]
+        finally:
+            base.close()
+    for offset, data in changed.items():
+        branch.mapping[offset : offset + len(data)] = data
+
+
+def _adopt_ants(store: AntStore, result: AntStore) -> None:
+    """Copy ``result``'s columns into ``store`` so existing ant views stay valid."""
+
+    for ours, theirs in zip(store.columns(), result.columns()):
+        ours[:] = theirs
+    store.occupancy = result.occupancy
+
+
+@dataclass
+class Divergence:
+    """How far each branch has drifted from a reference simulation."""
+
+    cells: "np.ndarray"  # cells whose state differs, per branch
+    ant_distance: "np.ndarray"  # (branches, ants) Euclidean distance between matching ants
+    heading_changes: "np.ndarray"  # ants whose heading differs, per branch
+
+    @property
+    def mean_ant_distance(self) -> "np.ndarray":
+        if not self.ant_distance.shape[1]:
+            return self.ant_distance.sum(axis=1)  # zeros: there are no ants to compare
+        return self.ant_distance.mean(axis=1)
+
+
+def divergence(reference: Simulation, branches: Sequence[Simulation]) -> Divergence:
+    """Compare ``branches`` with ``reference`` without copying any grid.
+
+    Ants are matched by slot, so every simulation must hold the same ant ids
+    in the same order (as forks of one simulation do).
+    """
+
+    import numpy as np
+
+    grid = reference.grid
+    cells = grid.cell_array().reshape(-1)
+    columns = reference.ants.arrays()
+    block = _TILE * _CHUNK_TILES
+    counts = np.zeros(len(branches), dtype=np.int64)
+    distances = np.zeros((len(branches), len(columns["id"])))
+    headings = np.zeros(len(branches), dtype=np.int64)
+    for index, branch in enumerate(branches):
+        if (branch.grid.width, branch.grid.height) != (grid.width, grid.height):
+            msg = "Branches must share the reference grid size"
+            raise ValueError(msg)
+        other = branch.ants.arrays()
+        if not np.array_equal(other["id"], columns["id"]):
+            msg = "Branches must hold the same ants in the same order as the reference"
+            raise ValueError(msg)
+        theirs = branch.grid.cell_array().reshape(-1)
+        counts[index] = sum(
+            int(np.count_nonzero(cells[start : start + block] != theirs[start : start + block]))
+            for start in range(0, len(cells), block)
+        )
+        distances[index] = np.hypot(other["x"] - columns["x"], other["y"] - columns["y"])
+        headings[index] = int(np.count_nonzero(other["heading"] != columns["heading"]))
+    return Divergence(cells=counts, ant_distance=distances, heading_changes=headings)
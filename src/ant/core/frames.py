@@ -0,0 +1,71 @@
+"""Read-only NumPy snapshots of a running simulation (see :meth:`Simulation.iter_frames`)."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+    from ant.core.simulation import Simulation
+
+
+@dataclass(frozen=True)
+class Frame:
+    """State of a simulation after ``step`` steps.
+
+    ``cells`` holds the ``(height, width)`` cell states, ``trail_owners`` the
+    id of the ant owning each live trail mark (0 elsewhere) and ``ants`` the
+    colony columns keyed as in :meth:`ant.core.ants.AntStore.arrays`.
+    """
+
+    step: int
+    cells: "np.ndarray"
+    trail_owners: "np.ndarray"
+    ants: Dict[str, "np.ndarray"]
+
+
+class FrameBuffers:
+    """Arrays reused by successive frames of one simulation.
+
+    Frames captured without ``copy`` are read-only views: ``cells`` shows the
+    live grid and the other arrays are overwritten by the next capture, so
+    use (or copy) them before the simulation advances.
+    """
+
+    def __init__(self, simulation: "Simulation") -> None:
+        import numpy as np
+
+        grid = simulation.grid
+        self.simulation = simulation
+        self.trail_owners = np.zeros((grid.height, grid.width), dtype=np.int64)
+        self._live = np.zeros((grid.height, grid.width), dtype=bool)
+        self._ants: Dict[str, np.ndarray] = {}
+
+    def capture(self, *, copy: bool = False) -> Frame:
+        import numpy as np
+
+        simulation = self.simulation
+        grid = simulation.grid
+        owners, expiry = grid.trail_arrays()
+        columns = simulation.ants.arrays()
+        if copy:
+            trails = np.where(expiry > grid.clock, owners, 0)
+            ants = {name: column.copy() for name, column in columns.items()}
+            return Frame(simulation.steps_executed, grid.cell_array().copy(), trails, ants)
+
+        np.greater(expiry, grid.clock, out=self._live)
+        np.multiply(owners, self._live, out=self.trail_owners)
+        for name, column in columns.items():
+            buffer = self._ants.get(name)
+            if buffer is None or len(buffer) != len(column):
+                buffer = self._ants[name] = np.empty_like(column)
+            buffer[:] = column
+        ants = {name: _read_only(buffer) for name, buffer in self._ants.items()}
+        return Frame(simulation.steps_executed, _read_only(grid.cell_array()), _read_only(self.trail_owners), ants)
+
+
+def _read_only(array: "np.ndarray") -> "np.ndarray":
+    view = array.view()
+    view.flags.writeable = False
+    return view
@@ -1,8 +1,12 @@
 """Grid state for Langton ant simulation."""
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
 
 
 CellState = int  # 0 for white, 1 for black
@@ -12,6 +16,14 @@ TrailData = Optional[Tuple[int, int]]  # (ant_id, remaining lifetime)
 
 @dataclass
 class Grid:
+    """Cell states and trail marks stored in flat row-major buffers.
+
+    Trails are kept as an owner id plus the clock tick at which the mark
+    expires, so decaying every trail is a single counter increment. The
+    buffers can be supplied by the caller (see :meth:`over_buffers`), which
+    lets several processes share one grid.
+    """
+
     width: int
     height: int
 
@@ -19,52 +31,165 @@ class Grid:
         if self.width <= 0 or self.height <= 0:
             msg = "Width and height must be positive integers"
             raise ValueError(msg)
-        self._cells: List[List[CellState]] = [
-            [0 for _ in range(self.width)] for _ in range(self.height)
-        ]
-        self._trail: List[List[TrailData]] = [
-            [None for _ in range(self.width)] for _ in range(self.height)
-        ]
+        size = self.width * self.height
+        self._cells = bytearray(size)
+        self._trail_owner = array("q", bytes(8 * size))
+        self._trail_expiry = array("q", bytes(8 * size))
+        self._clock = 0
+
+    @classmethod
+    def over_buffers(
+        cls,
+        width: int,
+        height: int,
+        cells: memoryview | bytearray,
+        trail_owner: memoryview | array,
+        trail_expiry: memoryview | array,
+        *,
+        clock: int = 0,
+    ) -> "Grid":
+        """Wrap existing buffers (``B``, ``q`` and ``q`` formats) without copying."""
+
+        size = width * height
+        if len(cells) != size or len(trail_owner) != size or len(trail_expiry) != size:
+            msg = f"Buffers must hold exactly {size} cells"
+            raise ValueError(msg)
+        grid = cls.__new__(cls)
+        grid.width = width
+        grid.height = height
+        grid._cells = cells
+        grid._trail_owner = trail_owner
+        grid._trail_expiry = trail_expiry
+        grid._clock = clock
+        return grid
+
+    @classmethod
+    def from_array(cls, cells: "np.ndarray") -> "Grid":
+        """Use a ``(height, width)`` ``uint8`` array as the cell buffer, without copying it.
+
+        Trail buffers come from zero-filled NumPy allocations, which the OS
+        provides lazily, so even very large grids are created instantly.
+        """
+
+        import numpy as np
+
+        if cells.ndim != 2 or cells.dtype != np.uint8:
+            msg = "cells must be a 2-D uint8 array"
+            raise ValueError(msg)
+        if not (cells.flags.c_contiguous and cells.flags.writeable):
+            cells = np.array(cells, order="C")
+        height, width = cells.shape
+        size = width * height
+        return cls.over_buffers(
+            width,
+            height,
+            memoryview(cells).cast("B"),
+            memoryview(np.zeros(8 * size, dtype=np.uint8)).cast("q"),
+            memoryview(np.zeros(8 * size, dtype=np.uint8)).cast("q"),
+        )
+
+    def __reduce__(self):
+        # Buffers may be memory maps or shared memory; pickles carry plain copies.
+        buffers = (bytes(self._cells), bytes(self._trail_owner), bytes(self._trail_expiry))
+        return (_rebuild_grid, (self.width, self.height, *buffers, self._clock))
+
+    def copy(self) -> "Grid":
+        """Return a grid with the same state in freshly allocated buffers."""
+
+        return Grid.over_buffers(
+            self.width,
+            self.height,
+            bytearray(self._cells),
+            array("q", bytes(self._trail_owner)),
+            array("q", bytes(self._trail_expiry)),
+            clock=self._clock,
+        )
+
+    @property
+    def clock(self) -> int:
+        """Number of trail decay ticks applied so far."""
+
+        return self._clock
+
+    @clock.setter
+    def clock(self, value: int) -> None:
+        self._clock = value
 
     def get_state(self, x: int, y: int) -> CellState:
-        return self._cells[y][x]
+        return self._cells[y * self.width + x]
 
     def flip_state(self, x: int, y: int) -> CellState:
-        self._cells[y][x] ^= 1
-        return self._cells[y][x]
+        index = y * self.width + x
+        state = self._cells[index] ^ 1
+        self._cells[index] = state
+        return state
 
     def set_state(self, x: int, y: int, state: CellState) -> None:
-        self._cells[y][x] = state
+        self._cells[y * self.width + x] = state
 
     def mark_trail(self, x: int, y: int, trail_id: int, lifetime: int) -> None:
-        self._trail[y][x] = (trail_id, lifetime)
+        index = y * self.width + x
+        self._trail_owner[index] = trail_id
+        self._trail_expiry[index] = self._clock + lifetime
 
     def get_trail(self, x: int, y: int) -> TrailId:
-        data = self._trail[y][x]
-        if not data:
+        index = y * self.width + x
+        if self._trail_expiry[index] <= self._clock:
             return None
-        trail_id, ttl = data
-        if ttl <= 0:
-            return None
-        return trail_id
-
-    def decay_trails(self) -> None:
-        for y in range(self.height):
-            row = self._trail[y]
-            for x in range(self.width):
-                data = row[x]
-                if data is None:
-                    continue
-                trail_id, ttl = data
-                if ttl <= 1:
-                    row[x] = None
-                else:
-                    row[x] = (trail_id, ttl - 1)
+        return self._trail_owner[index]
+
+    def decay_trails(self, steps: int = 1) -> None:
+        self._clock += steps
+
+    def trail_entries(self) -> Iterator[Tuple[int, int, int, int]]:
+        """Yield ``(x, y, trail_id, ttl)`` for every live trail mark."""
+
+        clock = self._clock
+        for index, expiry in enumerate(self._trail_expiry):
+            if expiry > clock:
+                y, x = divmod(index, self.width)
+                yield x, y, self._trail_owner[index], expiry - clock
+
+    def buffers(self) -> Tuple[memoryview | bytearray, memoryview | array, memoryview | array]:
+        """Return the raw cell, trail owner and trail expiry buffers (no copy)."""
+
+        return self._cells, self._trail_owner, self._trail_expiry
+
+    def cell_bytes(self) -> bytes:
+        """Return a row-major copy of every cell state."""
+
+        return bytes(self._cells)
+
+    def count_nonzero(self) -> int:
+        return self.width * self.height - self.cell_bytes().count(0)
+
+    def cell_array(self) -> "np.ndarray":
+        """Return a zero-copy ``(height, width)`` NumPy view of the cell states."""
+
+        import numpy as np
+
+        return np.frombuffer(self._cells, dtype=np.uint8).reshape(self.height, self.width)
+
+    def trail_arrays(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return zero-copy views of trail owners and expiry ticks (compare against :attr:`clock`)."""
+
+        import numpy as np
+
+        shape = (self.height, self.width)
+        owners = np.frombuffer(self._trail_owner, dtype=np.int64).reshape(shape)
+        expiry = np.frombuffer(self._trail_expiry, dtype=np.int64).reshape(shape)
+        return owners, expiry
 
     @property
     def cells(self) -> List[List[CellState]]:
-        return self._cells
+        width = self.width
+        data = self.cell_bytes()
+        return [list(data[row : row + width]) for row in range(0, width * self.height, width)]
 
     @property
     def trails(self) -> List[List[TrailId]]:
         return [[self.get_trail(x, y) for x in range(self.width)] for y in range(self.height)]
+
+
+def _rebuild_grid(width: int, height: int, cells: bytes, owners: bytes, expiry: bytes, clock: int) -> Grid:
+    return Grid.over_buffers(width, height, bytearray(cells), array("q", owners), array("q", expiry), clock=clock)
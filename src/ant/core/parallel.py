@@ -0,0 +1,263 @@
+"""Multi-process simulation of a single grid via spatial decomposition.
+
+The grid lives in :mod:`multiprocessing.shared_memory`. Before every batch
+the columns are split into one domain per worker, cutting through the widest
+ant-free gaps. A batch length ``k`` is chosen so that no ant can touch a cell
+outside its own domain during the batch; domains therefore write disjoint
+cells, and ants sharing a domain are advanced by one worker in their original
+order, which makes the result identical to :class:`~ant.core.simulation.Simulation`.
+Ants that leave their domain are handed to whichever domain owns their new
+column when the next batch is planned.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Sequence, Tuple
+
+from ant.core.grid import Grid
+from ant.core.rules import AnyRule
+from ant.core.simulation import Ant, Simulation
+from ant.topology.base import Topology
+
+Domain = Tuple[int, int]  # [start, stop) columns; stop may exceed width when wrapping
+
+
+def _attach(blocks: Sequence[SharedMemory], width: int, height: int) -> Grid:
+    cells, owners, expiry = blocks
+    return Grid.over_buffers(
+        width,
+        height,
+        cells.buf[: width * height],
+        owners.buf[: 8 * width * height].cast("q"),
+        expiry.buf[: 8 * width * height].cast("q"),
+    )
+
+
+def _release(grid: Grid) -> None:
+    for view in grid.buffers():
+        view.release()
+
+
+def _worker_main(
+    connection: Connection,
+    names: Sequence[str],
+    width: int,
+    height: int,
+    topology: Topology,
+    trail_lifetime: int,
+    rule: AnyRule,
+) -> None:
+    blocks = [SharedMemory(name=name) for name in names]
+    grid = _attach(blocks, width, height)
+    simulation = Simulation(width, height, [], topology, trail_lifetime, grid=grid, rule=rule)
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            clock, steps, ants = message
+            grid.clock = clock
+            simulation.ants = ants
+            simulation.run(steps)
+            store = simulation.ants
+            connection.send(list(zip(store.xs, store.ys, store.headings, store.states)))
+    finally:
+        _release(grid)
+        for block in blocks:
+            block.close()
+        connection.close()
+
+
+class ParallelSimulation(Simulation):
+    """Drop-in :class:`Simulation` that advances disjoint domains in worker processes.
+
+    Batches shorter than ``min_parallel_batch`` steps (ants crowding a domain
+    boundary) and runs with statistics or recording attached fall back to the
+    in-process engine on the same shared grid. Call :meth:`close` (or use the
+    instance as a context manager) to stop the workers and free the memory.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        ants: Sequence[Ant],
+        topology: Topology | None = None,
+        trail_lifetime: int = 20,
+        *,
+        workers: int | None = None,
+        max_batch: int = 4096,
+        min_parallel_batch: int = 16,
+        rule: AnyRule | str | None = None,
+    ) -> None:
+        workers = workers or os.cpu_count() or 1
+        if workers <= 0:
+            msg = "workers must be a positive integer"
+            raise ValueError(msg)
+        if max_batch <= 0 or min_parallel_batch <= 0:
+            msg = "max_batch and min_parallel_batch must be positive integers"
+            raise ValueError(msg)
+        size = width * height
+        if size <= 0:
+            msg = "Width and height must be positive integers"
+            raise ValueError(msg)
+        self._blocks = [
+            SharedMemory(create=True, size=size),
+            SharedMemory(create=True, size=8 * size),
+            SharedMemory(create=True, size=8 * size),
+        ]
+        for block in self._blocks:
+            block.buf[:] = bytes(block.size)
+        super().__init__(
+            width,
+            height,
+            ants,
+            topology,
+            trail_lifetime,
+            grid=_attach(self._blocks, width, height),
+            rule=rule,
+        )
+        self.workers = workers
+        self.max_batch = max_batch
+        self.min_parallel_batch = min_parallel_batch
+        self.parallel_steps = 0
+        self._vertical_safe, self._horizontal_circular = self._probe_topology(self.topology)
+        self._processes: List[multiprocessing.Process] = []
+        self._connections: List[Connection] = []
+
+    @staticmethod
+    def _probe_topology(topology: Topology) -> Tuple[bool, bool]:
+        """Return whether vertical wraps keep the column and horizontal wraps join the edge columns."""
+
+        width, height = topology.width, topology.height
+        vertical = all(
+            topology.wrap(x, -1).x == x and topology.wrap(x, height).x == x for x in range(width)
+        )
+        horizontal = all(
+            topology.wrap(-1, y).x == width - 1 and topology.wrap(width, y).x == 0 for y in range(height)
+        )
+        return vertical, horizontal
+
+    def _start_workers(self) -> None:
+        if self._processes:
+            return
+        names = [block.name for block in self._blocks]
+        for _ in range(self.workers):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker_main,
+                args=(child, names, self.grid.width, self.grid.height, self.topology, self.trail_lifetime, self.rule),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._processes.append(process)
+            self._connections.append(parent)
+
+    def plan_batch(self, limit: int) -> Tuple[int, List[Domain], List[List[int]]]:
+        """Split columns into domains and return ``(steps, domains, ant indices per domain)``.
+
+        ``steps`` is the longest batch (at most ``limit``) during which every
+        ant stays inside its domain; it is 0 when fewer than two domains exist.
+        """
+
+        width, height = self.grid.width, self.grid.height
+        store = self.ants
+        columns = sorted(set(store.xs))
+        domain_count = min(self.workers, len(columns))
+        if domain_count < 2:
+            return 0, [], []
+
+        if self._horizontal_circular:
+            count = len(columns)
+            gaps = [((columns[(i + 1) % count] - columns[i] - 1) % width, i) for i in range(count)]
+            chosen = sorted(sorted(gaps, reverse=True)[:domain_count], key=lambda gap: gap[1])
+            cuts = [columns[i] + 1 + gap // 2 for gap, i in chosen]
+            cuts.append(cuts[0] + width)
+        else:
+            gaps = [(columns[i + 1] - columns[i] - 1, i) for i in range(len(columns) - 1)]
+            chosen = sorted(sorted(gaps, reverse=True)[: domain_count - 1], key=lambda gap: gap[1])
+            cuts = [0] + [columns[i] + 1 + gap // 2 for gap, i in chosen] + [width]
+        domains = [(cuts[j], cuts[j + 1]) for j in range(len(cuts) - 1)]
+
+        members: List[List[int]] = [[] for _ in domains]
+        slack = limit - 1
+        for index, (x, y) in enumerate(zip(store.xs, store.ys)):
+            for number, (start, stop) in enumerate(domains):
+                offset = (x - start) % width
+                if offset < stop - start:
+                    members[number].append(index)
+                    slack = min(slack, offset, stop - start - 1 - offset)
+                    break
+            if not self._vertical_safe:
+                slack = min(slack, y, height - 1 - y)
+        return slack + 1, domains, members
+
+    def run(self, steps: int) -> None:
+        if steps < 0:
+            msg = "Steps must be non-negative"
+            raise ValueError(msg)
+        remaining = steps
+        while remaining:
+            batch, members = 0, []
+            if self.stats is None and self.recorder is None and self.visits is None:
+                limit = min(remaining, self.max_batch)
+                if self.snapshots is not None:  # stop at the next snapshot
+                    limit = min(limit, self.snapshots.every - self.steps_executed % self.snapshots.every)
+                batch, _domains, members = self.plan_batch(limit)
+            if batch >= self.min_parallel_batch:
+                self._advance_parallel(batch, members)
+                if self.snapshots is not None:
+                    self.snapshots.on_step(self)
+            else:
+                batch = min(remaining, self.min_parallel_batch)
+                for _ in range(batch):
+                    self.step()
+            remaining -= batch
+
+    def _advance_parallel(self, steps: int, members: List[List[int]]) -> None:
+        self._start_workers()
+        busy = []
+        for connection, indices in zip(self._connections, members):
+            if indices:
+                connection.send((self.grid.clock, steps, [self.ants[index] for index in indices]))
+                busy.append((connection, indices))
+        for connection, indices in busy:
+            store = self.ants
+            for index, (x, y, heading, state) in zip(indices, connection.recv()):
+                store.place(index, x, y, heading)
+                store.states[index] = state
+        self.grid.decay_trails(steps)
+        self.steps_executed += steps
+        self.parallel_steps += steps
+
+    def close(self) -> None:
+        """Stop the workers and move the grid out of shared memory."""
+
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:  # pragma: no cover - worker already gone
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections.clear()
+        self._processes.clear()
+        if self._blocks:
+            shared = self.grid
+            self.grid = shared.copy()
+            _release(shared)
+            for block in self._blocks:
+                block.close()
+                block.unlink()
+            self._blocks = []
+
+    def __enter__(self) -> "ParallelSimulation":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
@@ -0,0 +1,247 @@
+"""Ant rules: multi-color turn strings and full turmite transition tables.
+
+A turn string such as ``RL`` or ``LLRR`` has one letter per cell color: an ant
+standing on a cell of color ``i`` turns by letter ``i`` (``R`` right, ``L``
+left, ``N`` no turn, ``U`` U-turn) and the cell advances to color
+``(i + 1) % len(rule)``. ``RL`` is the classic Langton ant.
+
+A turmite additionally carries an internal state. Its rule maps
+``(state, color)`` to ``(write color, turn, next state)`` and is written in
+the notation used by Golly and the Wolfram turmite catalogue::
+
+    {{{1, 2, 0}, {0, 8, 0}}}
+
+The outer list is indexed by state, the inner by color; turns are encoded as
+1 (no turn), 2 (right), 4 (U-turn) and 8 (left).
+
+Both kinds compile to the same transition table, so the engine has a single
+code path whichever rule is selected.
+"""
+from __future__ import annotations
+
+import ast
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence, Tuple
+
+from ant.core.direction import HEADINGS, heading_to_step
+
+_TURNS = {"R": 1, "L": -1, "N": 0, "U": 2}
+_GOLLY_TURNS = {1: 0, 2: 1, 4: 2, 8: -1}
+_GOLLY_CODES = {turn: code for code, turn in _GOLLY_TURNS.items()}
+MAX_STATES = 256  # cells are stored as bytes
+
+CodeMove = Tuple[int, int, int]  # new heading code, dx, dy
+Transition = Tuple[int, Tuple[CodeMove, ...], int]  # write color, moves by heading code, next ant state
+# previous color, heading before the turn by heading after it, previous ant state
+InverseTransition = Tuple[int, Tuple[int, ...], int]
+
+
+def _moves(turn: int) -> Tuple[CodeMove, ...]:
+    moves = []
+    for code in range(len(HEADINGS)):
+        new_code = (code + turn) % len(HEADINGS)
+        step = heading_to_step(HEADINGS[new_code])
+        moves.append((new_code, step.dx, step.dy))
+    return tuple(moves)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Compiled turn and next-color lookup tables for an RL rule string."""
+
+    spec: str
+    turns: Tuple[int, ...]
+    next_state: Tuple[int, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "Rule":
+        letters = spec.strip().upper()
+        if not 2 <= len(letters) <= MAX_STATES:
+            msg = f"Rule must have between 2 and {MAX_STATES} letters, got {len(letters)}"
+            raise ValueError(msg)
+        unknown = sorted(set(letters) - set(_TURNS))
+        if unknown:
+            msg = f"Unknown turn letter(s) {''.join(unknown)!r} in rule {spec!r}; use R, L, N or U"
+            raise ValueError(msg)
+        count = len(letters)
+        return cls(
+            spec=letters,
+            turns=tuple(_TURNS[letter] for letter in letters),
+            next_state=tuple((state + 1) % count for state in range(count)),
+        )
+
+    @property
+    def colors(self) -> int:
+        return len(self.turns)
+
+    @property
+    def states(self) -> int:
+        """Number of internal ant states (always 1 for a turn string)."""
+
+        return 1
+
+    def transition_table(self) -> Tuple[Tuple[Transition, ...], ...]:
+        """Return ``table[ant state][color] -> (write color, moves[heading code], next ant state)``."""
+
+        return (
+            tuple((self.next_state[color], _moves(turn), 0) for color, turn in enumerate(self.turns)),
+        )
+
+
+@dataclass(frozen=True)
+class Turmite:
+    """A ``(state, color) -> (write color, turn, next state)`` table stored as flat tuples.
+
+    Entry ``state * colors + color`` of :attr:`write`, :attr:`turns` and
+    :attr:`next_state` describes one transition; turns use the same +1 right,
+    -1 left, 0 straight, 2 U-turn encoding as :class:`Rule`.
+    """
+
+    states: int
+    colors: int
+    write: Tuple[int, ...]
+    turns: Tuple[int, ...]
+    next_state: Tuple[int, ...]
+
+    @classmethod
+    def from_table(cls, table: Sequence[Sequence[Sequence[int]]]) -> "Turmite":
+        """Build a turmite from nested ``[state][color] = (write, golly turn, next state)`` lists."""
+
+        states = len(table)
+        colors = len(table[0]) if states else 0
+        if not states or colors < 2 or colors > MAX_STATES:
+            msg = f"Turmite needs at least one state and between 2 and {MAX_STATES} colors"
+            raise ValueError(msg)
+        write, turns, next_state = [], [], []
+        for state, row in enumerate(table):
+            if len(row) != colors:
+                msg = f"State {state} defines {len(row)} colors, expected {colors}"
+                raise ValueError(msg)
+            for color, entry in enumerate(row):
+                if len(entry) != 3:
+                    msg = f"Transition ({state}, {color}) must be (write, turn, next state)"
+                    raise ValueError(msg)
+                new_color, turn, target = entry
+                if not 0 <= new_color < colors or not 0 <= target < states:
+                    msg = f"Transition ({state}, {color}) writes color {new_color} or enters state {target} out of range"
+                    raise ValueError(msg)
+                if turn not in _GOLLY_TURNS:
+                    msg = f"Transition ({state}, {color}) has turn {turn}; use 1, 2, 4 or 8"
+                    raise ValueError(msg)
+                write.append(new_color)
+                turns.append(_GOLLY_TURNS[turn])
+                next_state.append(target)
+        return cls(states, colors, tuple(write), tuple(turns), tuple(next_state))
+
+    @classmethod
+    def parse(cls, spec: str) -> "Turmite":
+        """Parse Golly notation such as ``{{{1, 2, 0}, {0, 8, 0}}}``."""
+
+        try:
+            table = ast.literal_eval(spec.strip().replace("{", "[").replace("}", "]"))
+        except (SyntaxError, ValueError) as exc:
+            msg = f"Cannot parse turmite {spec!r}"
+            raise ValueError(msg) from exc
+        try:
+            return cls.from_table(table)
+        except TypeError as exc:
+            msg = f"Cannot parse turmite {spec!r}: expected nested lists of integers"
+            raise ValueError(msg) from exc
+
+    @classmethod
+    def random(cls, states: int, colors: int, rng: random.Random) -> "Turmite":
+        """Draw a turmite with uniformly random transitions."""
+
+        turns = tuple(_GOLLY_TURNS)
+        table = [
+            [(rng.randrange(colors), rng.choice(turns), rng.randrange(states)) for _ in range(colors)]
+            for _ in range(states)
+        ]
+        return cls.from_table(table)
+
+    @property
+    def spec(self) -> str:
+        """The rule in Golly notation."""
+
+        rows = []
+        for state in range(self.states):
+            entries = []
+            for color in range(self.colors):
+                index = state * self.colors + color
+                turn = _GOLLY_CODES[self.turns[index]]
+                entries.append(f"{{{self.write[index]},{turn},{self.next_state[index]}}}")
+            rows.append("{" + ",".join(entries) + "}")
+        return "{" + ",".join(rows) + "}"
+
+    def transition_table(self) -> Tuple[Tuple[Transition, ...], ...]:
+        """Return ``table[ant state][color] -> (write color, moves[heading code], next ant state)``."""
+
+        moves = {turn: _moves(turn) for turn in set(self.turns)}
+        return tuple(
+            tuple(
+                (
+                    self.write[state * self.colors + color],
+                    moves[self.turns[state * self.colors + color]],
+                    self.next_state[state * self.colors + color],
+                )
+                for color in range(self.colors)
+            )
+            for state in range(self.states)
+        )
+
+
+AnyRule = Rule | Turmite
+LANGTON = Rule.parse("RL")
+
+
+def as_rule(rule: AnyRule | str | None) -> AnyRule:
+    """Accept a rule object, a turn string, Golly turmite notation, or ``None`` for the classic ant."""
+
+    if rule is None:
+        return LANGTON
+    if isinstance(rule, (Rule, Turmite)):
+        return rule
+    if rule.lstrip().startswith("{"):
+        return Turmite.parse(rule)
+    return Rule.parse(rule)
+
+
+def inverse_transition_table(rule: AnyRule) -> Tuple[Tuple[InverseTransition | None, ...], ...]:
+    """Return ``table[ant state][color written] -> (previous color, headings before the turn, previous ant state)``.
+
+    Entries are ``None`` for pairs no transition produces. Raises ``ValueError``
+    when two transitions produce the same pair, as the rule then cannot be run
+    backwards.
+    """
+
+    table = rule.transition_table()
+    colors = len(table[0])
+    inverse: list[list[InverseTransition | None]] = [[None] * colors for _ in table]
+    for state, row in enumerate(table):
+        for color, (write, moves, target) in enumerate(row):
+            if inverse[target][write] is not None:
+                msg = f"Rule {rule.spec!r} is not reversible: several transitions write color {write} and enter state {target}"
+                raise ValueError(msg)
+            before = [0] * len(moves)
+            for heading, (turned, _, _) in enumerate(moves):
+                before[turned] = heading
+            inverse[target][write] = (color, tuple(before), state)
+    return tuple(tuple(row) for row in inverse)
+
+
+def load_rules(path: str | Path) -> list[AnyRule]:
+    """Read one rule per line, skipping blank lines and ``#`` comments."""
+
+    rules = []
+    for number, line in enumerate(Path(path).read_text().splitlines(), start=1):
+        text = line.split("#", 1)[0].strip()
+        if not text:
+            continue
+        try:
+            rules.append(as_rule(text))
+        except ValueError as exc:
+            msg = f"{path}:{number}: {exc}"
+            raise ValueError(msg) from exc
+    return rules
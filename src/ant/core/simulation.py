@@ -1,26 +1,28 @@
 """Simulation engine for Langton ants."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
 
-from ant.core.direction import Heading, heading_to_step
+from ant.core.ants import Ant, AntStore
+from ant.core.direction import HEADINGS, heading_to_step
 from ant.core.grid import Grid
+from ant.core.rules import AnyRule, as_rule, inverse_transition_table
+from ant.core.stats import RunStatistics, StatsSink
+from ant.core.visits import VisitCounts
 from ant.topology.base import Coordinates, Topology, TorusTopology
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ant.core.fork import Branch
+    from ant.core.frames import Frame
+    from ant.io.snapshots import SnapshotWriter
+    from ant.io.trajectory import TrajectoryRecorder
+    from ant.renderers.schedule import FrameSchedule
 
-@dataclass
-class Ant:
-    """Stateful Langton ant."""
 
-    ant_id: int
-    x: int
-    y: int
-    heading: Heading
-    trail_color: str
+__all__ = ["Ant", "Simulation"]
 
-    def position(self) -> Coordinates:
-        return Coordinates(self.x, self.y)
+_STEPS = tuple((step.dx, step.dy) for step in map(heading_to_step, HEADINGS))
 
 
 class Simulation:
@@ -30,53 +32,300 @@ class Simulation:
         self,
         width: int,
         height: int,
-        ants: Sequence[Ant],
+        ants: Iterable[Ant],
         topology: Topology | None = None,
         trail_lifetime: int = 20,
+        *,
+        grid: Grid | None = None,
+        rule: AnyRule | str | None = None,
     ) -> None:
-        self.grid = Grid(width=width, height=height)
-        self.topology = topology or TorusTopology(width, height)
-        if len({ant.ant_id for ant in ants}) != len(ants):
-            msg = "Ant IDs must be unique"
+        if grid is not None and (grid.width, grid.height) != (width, height):
+            msg = "grid dimensions must match width and height"
             raise ValueError(msg)
-        self.ants: List[Ant] = list(ants)
+        self.grid = grid or Grid(width=width, height=height)
+        self.topology = topology or TorusTopology(width, height)
+        self.ants = ants
         self.steps_executed = 0
         if trail_lifetime < 0:
             msg = "trail_lifetime must be non-negative"
             raise ValueError(msg)
         self.trail_lifetime = trail_lifetime
+        self.rule = as_rule(rule)
+        self._transitions = self.rule.transition_table()
+        self.stats: Optional[RunStatistics] = None
+        self.recorder: Optional["TrajectoryRecorder"] = None
+        self.visits: Optional[VisitCounts] = None
+        self.snapshots: Optional["SnapshotWriter"] = None
+
+    @property
+    def ants(self) -> AntStore:
+        """The colony; iterating yields :class:`Ant` views of the underlying arrays."""
+
+        return self._ants
+
+    @ants.setter
+    def ants(self, ants: Iterable[Ant]) -> None:
+        self._ants = AntStore(self.grid.width, self.grid.height, ants)
+
+    def add_ant(self, ant: Ant) -> Ant:
+        """Spawn ``ant`` (appended to the update order) and return its view."""
+
+        if self.recorder is not None:
+            msg = "Cannot add ants while a recorder is attached; recordings hold a fixed set of ants"
+            raise ValueError(msg)
+        return self._ants.add(ant)
+
+    def track_statistics(self, *, every: int = 1, sink: Optional[StatsSink] = None) -> RunStatistics:
+        """Start maintaining run metrics, sampling them into ``sink`` every ``every`` steps."""
+
+        self.stats = RunStatistics(self.grid, self.ants, every=every, sink=sink)
+        if sink is not None:
+            self.stats.sample(self.steps_executed)
+        return self.stats
+
+    def track_visits(self, *, per_ant: bool = False) -> VisitCounts:
+        """Start counting visits per cell (and, with ``per_ant``, each ant's last visit step)."""
+
+        self.visits = VisitCounts(self.grid, self._ants, per_ant=per_ant)
+        return self.visits
+
+    def take_snapshots(
+        self,
+        directory: str | Path,
+        *,
+        every: int,
+        format: str = "png",
+        workers: int = 2,
+        max_pending: int | None = None,
+    ) -> "SnapshotWriter":
+        """Start saving the grid to ``directory`` every ``every`` steps (PNG or ``.npy``).
+
+        Files are written by background threads; close the returned writer
+        to wait for them.
+        """
+
+        from ant.io.snapshots import SnapshotWriter
+
+        self.snapshots = SnapshotWriter(
+            directory,
+            every=every,
+            format=format,
+            workers=workers,
+            max_pending=max_pending,
+            states=self.rule.colors,
+        )
+        return self.snapshots
+
+    def record(
+        self,
+        path: str | Path,
+        *,
+        chunk_steps: int = 4096,
+        keyframe_interval: int | None = None,
+    ) -> "TrajectoryRecorder":
+        """Start appending every subsequent ant move to a trajectory file at ``path``.
+
+        With ``keyframe_interval`` the file is a seekable recording that also
+        stores the full state every ``keyframe_interval`` steps.
+        """
+
+        if keyframe_interval is None:
+            from ant.io.trajectory import TrajectoryRecorder
+
+            self.recorder = TrajectoryRecorder(path, self, chunk_steps=chunk_steps)
+        else:
+            from ant.io.recording import RecordingWriter
+
+            self.recorder = RecordingWriter(
+                path, self, chunk_steps=chunk_steps, keyframe_interval=keyframe_interval
+            )
+        return self.recorder
 
     def step(self) -> None:
-        for ant in self.ants:
-            self._apply_rules(ant)
+        store = self._ants
+        ids, xs, ys, headings, states = store.ids, store.xs, store.ys, store.headings, store.states
+        occupancy = store.occupancy
+        grid = self.grid
+        width, height = grid.width, grid.height
+        cells, owners, expiry = grid.buffers()
+        expires = grid.clock + self.trail_lifetime
+        transitions = self._transitions
+        cross = self.topology.cross
+        stats, recorder, visits = self.stats, self.recorder, self.visits
+        if visits is not None:
+            visits.sync()
+            counts, last_visits = visits.counts, visits.last_visits
+            step_number = self.steps_executed + 1
+        for slot in range(len(ids)):
+            x, y = xs[slot], ys[slot]
+            cell = y * width + x
+            color = cells[cell]
+            new_color, moves, states[slot] = transitions[states[slot]][color]
+            heading, dx, dy = moves[headings[slot]]
+            cells[cell] = new_color
+            owners[cell] = ids[slot]
+            expiry[cell] = expires
+            if stats is not None:
+                stats.record(ids[slot], x, y, color, new_color, dx, dy)
+            if visits is not None:
+                counts[cell] += 1
+                if last_visits is not None:
+                    last_visits[slot][cell] = step_number
+            x, y = x + dx, y + dy
+            if not (0 <= x < width and 0 <= y < height):
+                x, y, heading = cross(x, y, heading)
+            xs[slot], ys[slot], headings[slot] = x, y, heading
+            target = y * width + x
+            if target != cell:
+                here = occupancy[cell]
+                if len(here) == 1:
+                    del occupancy[cell]
+                else:
+                    here.remove(slot)
+                there = occupancy.get(target)
+                if there is None:
+                    occupancy[target] = [slot]
+                else:
+                    there.append(slot)
+            if recorder is not None:
+                recorder.record(x, y, heading, new_color)
         self.steps_executed += 1
         self.grid.decay_trails()
+        if self.stats is not None:
+            self.stats.on_step(self.steps_executed)
+        if self.recorder is not None:
+            self.recorder.end_step()
+        if self.snapshots is not None:
+            self.snapshots.on_step(self)
 
     def run(self, steps: int) -> None:
+        """Advance ``steps`` steps; a negative count rewinds (see :meth:`step_back`)."""
+
         if steps < 0:
-            msg = "Steps must be non-negative"
-            raise ValueError(msg)
+            self._rewind(-steps)
+            return
         for _ in range(steps):
             self.step()
 
-    def _apply_rules(self, ant: Ant) -> None:
-        state = self.grid.get_state(ant.x, ant.y)
-        if state == 0:
-            ant.heading = ant.heading.turn_right()
-        else:
-            ant.heading = ant.heading.turn_left()
-        self.grid.flip_state(ant.x, ant.y)
-        self.grid.mark_trail(ant.x, ant.y, ant.ant_id, self.trail_lifetime)
-        step_vec = heading_to_step(ant.heading)
-        wrapped = self.topology.wrap(ant.x + step_vec.dx, ant.y + step_vec.dy)
-        ant.x, ant.y = wrapped.x, wrapped.y
+    def iter_frames(
+        self,
+        every: "int | FrameSchedule" = 1,
+        until: int | None = None,
+        *,
+        copy: bool = False,
+    ) -> Iterator["Frame"]:
+        """Yield the current state, then a frame every ``every`` steps until step ``until``.
+
+        ``every`` may also be a :class:`~ant.renderers.schedule.FrameSchedule`.
+        Frames hold read-only NumPy arrays that are reused between yields
+        (see :class:`~ant.core.frames.FrameBuffers`); pass ``copy=True`` to
+        keep each frame. Without ``until`` the stream never ends.
+        """
+
+        from ant.core.frames import FrameBuffers
+
+        if isinstance(every, int) and every <= 0:
+            msg = "every must be a positive integer"
+            raise ValueError(msg)
+        if until is not None and until < self.steps_executed:
+            msg = f"until ({until}) lies before the current step ({self.steps_executed})"
+            raise ValueError(msg)
+        buffers = FrameBuffers(self)
+        start = self.steps_executed
+        yield buffers.capture(copy=copy)
+        while until is None or self.steps_executed < until:
+            limit = None if until is None else until - self.steps_executed
+            if isinstance(every, int):
+                self.run(every if limit is None else min(every, limit))
+            elif not every.advance(self, self.steps_executed - start, limit):
+                return
+            yield buffers.capture(copy=copy)
+
+    def step_back(self) -> None:
+        """Undo the most recent step, exactly and without any stored history.
+
+        Each move is inverted from the current cell colors, ant states and
+        headings through the rule's inverse transition table and the
+        topology's inverse edge table. Trail marks are rebuilt by rewinding
+        ``trail_lifetime`` steps further and replaying them. Raises
+        ``ValueError`` for rules or topologies that are not reversible.
+        """
+
+        self._rewind(1)
+
+    def _rewind(self, steps: int) -> None:
+        if steps > self.steps_executed:
+            msg = f"Cannot rewind {steps} steps; only {self.steps_executed} have run"
+            raise ValueError(msg)
+        if (
+            self.stats is not None
+            or self.recorder is not None
+            or self.visits is not None
+            or self.snapshots is not None
+        ):
+            msg = "Cannot rewind while statistics, visit counts, snapshots or a recorder are attached"
+            raise ValueError(msg)
+        inverse = inverse_transition_table(self.rule)
+        self.topology.inverse_edges  # noqa: B018 - fail early on irreversible surfaces
+        # Marks older than trail_lifetime - 1 steps have expired, so rewinding that
+        # much further and replaying restores every live mark.
+        replay = max(0, min(self.trail_lifetime - 1, self.steps_executed - steps))
+        for _ in range(steps + replay):
+            self._unstep(inverse)
+        for _ in range(replay):
+            self.step()
+
+    def _unstep(self, inverse) -> None:
+        store = self._ants
+        ids, xs, ys, headings, states = store.ids, store.xs, store.ys, store.headings, store.states
+        occupancy = store.occupancy
+        grid = self.grid
+        width, height = grid.width, grid.height
+        cells, owners, expiry = grid.buffers()
+        uncross = self.topology.uncross
+        for slot in range(len(ids) - 1, -1, -1):
+            x, y, heading = xs[slot], ys[slot], headings[slot]
+            dx, dy = _STEPS[heading]
+            back_x, back_y = x - dx, y - dy
+            if not (0 <= back_x < width and 0 <= back_y < height):
+                back_x, back_y, heading = uncross(x, y, heading)
+            cell = back_y * width + back_x
+            entry = inverse[states[slot]][cells[cell]]
+            if entry is None:
+                msg = f"Ant {ids[slot]} is in a state the rule cannot produce; cannot rewind"
+                raise ValueError(msg)
+            cells[cell], before, states[slot] = entry
+            xs[slot], ys[slot], headings[slot] = back_x, back_y, before[heading]
+            owners[cell] = expiry[cell] = 0
+            current = y * width + x
+            if current != cell:
+                here = occupancy[current]
+                if len(here) == 1:
+                    del occupancy[current]
+                else:
+                    here.remove(slot)
+                there = occupancy.get(cell)
+                if there is None:
+                    occupancy[cell] = [slot]
+                else:
+                    there.append(slot)
+        self.steps_executed -= 1
+        grid.clock -= 1
+
+    def fork(self, n: int = 1) -> List["Branch"]:
+        """Return ``n`` branches continuing from the current state.
+
+        Branches share every unchanged tile of the grid copy-on-write; see
+        :mod:`ant.core.fork` for running them on a process pool and measuring
+        how far they diverge.
+        """
+
+        from ant.core.fork import fork
+
+        return fork(self, n)
 
     def ants_positions(self) -> List[Coordinates]:
         return [ant.position() for ant in self.ants]
 
     def ant_by_id(self, ant_id: int) -> Ant:
-        for ant in self.ants:
-            if ant.ant_id == ant_id:
-                return ant
-        msg = f"Unknown ant id {ant_id}"
-        raise KeyError(msg)
+        return self._ants.by_id(ant_id)
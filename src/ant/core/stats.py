@@ -0,0 +1,107 @@
+"""Incrementally maintained run statistics."""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Protocol, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ant.core.grid import Grid
+    from ant.core.simulation import Ant
+
+
+class StatsSink(Protocol):
+    def write_row(self, row: Dict[str, float]) -> None:
+        ...
+
+
+class RunStatistics:
+    """Tracks grid and ant metrics in O(1) per flip and move.
+
+    ``black_cells`` counts non-white cells, ``unique_visited`` counts cells
+    any ant has stood on, ``bbox`` is the bounding box of those cells, and
+    per-ant displacement is the unwrapped sum of step vectors since tracking
+    began. Samples hold the displacement columns of the ants present when
+    tracking began, so every row has the same columns; ants spawned later
+    are still tracked by :meth:`displacement`.
+    """
+
+    def __init__(
+        self,
+        grid: "Grid",
+        ants: Sequence["Ant"],
+        *,
+        every: int = 1,
+        sink: Optional[StatsSink] = None,
+    ) -> None:
+        if every <= 0:
+            msg = "every must be a positive integer"
+            raise ValueError(msg)
+        self.width = grid.width
+        self.every = every
+        self.sink = sink
+        self.black_cells = grid.count_nonzero()
+        self.unique_visited = 0
+        self._visited = bytearray(grid.width * grid.height)
+        self.min_x = grid.width
+        self.min_y = grid.height
+        self.max_x = -1
+        self.max_y = -1
+        self._displacement: Dict[int, List[int]] = {ant.ant_id: [0, 0] for ant in ants}
+        self._sampled_ants = list(self._displacement)
+        self._last_sampled: Optional[int] = None
+
+    def record(self, ant_id: int, x: int, y: int, old_state: int, new_state: int, dx: int, dy: int) -> None:
+        """Account for one ant flipping ``(x, y)`` and moving by ``(dx, dy)``."""
+
+        index = y * self.width + x
+        if not self._visited[index]:
+            self._visited[index] = 1
+            self.unique_visited += 1
+            if x < self.min_x:
+                self.min_x = x
+            if x > self.max_x:
+                self.max_x = x
+            if y < self.min_y:
+                self.min_y = y
+            if y > self.max_y:
+                self.max_y = y
+        if not old_state:
+            if new_state:
+                self.black_cells += 1
+        elif not new_state:
+            self.black_cells -= 1
+        displacement = self._displacement.setdefault(ant_id, [0, 0])  # ants may spawn after tracking starts
+        displacement[0] += dx
+        displacement[1] += dy
+
+    def displacement(self, ant_id: int) -> tuple[int, int]:
+        dx, dy = self._displacement.get(ant_id, (0, 0))
+        return dx, dy
+
+    @property
+    def bbox(self) -> Optional[tuple[int, int, int, int]]:
+        if self.max_x < 0:
+            return None
+        return self.min_x, self.min_y, self.max_x, self.max_y
+
+    def on_step(self, step: int) -> None:
+        if self.sink is not None and step % self.every == 0:
+            self.sample(step)
+
+    def sample(self, step: int) -> Dict[str, float]:
+        row: Dict[str, float] = {
+            "step": step,
+            "black_cells": self.black_cells,
+            "unique_visited": self.unique_visited,
+            "bbox_min_x": self.min_x if self.max_x >= 0 else -1,
+            "bbox_min_y": self.min_y if self.max_y >= 0 else -1,
+            "bbox_max_x": self.max_x,
+            "bbox_max_y": self.max_y,
+        }
+        for ant_id in self._sampled_ants:
+            dx, dy = self._displacement[ant_id]
+            row[f"ant{ant_id}_dx"] = dx
+            row[f"ant{ant_id}_dy"] = dy
+        if self.sink is not None and step != self._last_sampled:
+            self.sink.write_row(row)
+            self._last_sampled = step
+        return row
@@ -0,0 +1,74 @@
+"""Per-cell visit counters and per-ant last-visit maps."""
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+    from ant.core.ants import AntStore
+    from ant.core.grid import Grid
+
+
+class VisitCounts:
+    """Counts how often ants stand on each cell, at O(1) per move.
+
+    :attr:`counts` holds a ``uint64`` per cell, incremented every time an ant
+    updates that cell, so long runs over small grids never wrap. With ``per_ant`` each ant also gets a map holding the
+    step at which it last stood on every cell (0 for never).
+    """
+
+    def __init__(self, grid: "Grid", ants: "AntStore", *, per_ant: bool = False) -> None:
+        self.width = grid.width
+        self.height = grid.height
+        self.counts = array("Q", bytes(8 * grid.width * grid.height))
+        self.last_visits: Optional[List[array]] = [] if per_ant else None
+        self._ants = ants
+        self.sync()
+
+    def sync(self) -> None:
+        """Allocate last-visit maps for ants spawned since the previous call."""
+
+        if self.last_visits is not None:
+            size = len(self.counts)
+            while len(self.last_visits) < len(self._ants):
+                self.last_visits.append(array("Q", bytes(8 * size)))
+
+    def record(self, slot: int, x: int, y: int, step: int) -> None:
+        """Account for the ant in ``slot`` standing on ``(x, y)`` during ``step``."""
+
+        index = y * self.width + x
+        self.counts[index] += 1
+        if self.last_visits is not None:
+            self.last_visits[slot][index] = step
+
+    def count_array(self) -> "np.ndarray":
+        """Return a zero-copy ``(height, width)`` ``uint64`` view of the visit counts."""
+
+        import numpy as np
+
+        return np.frombuffer(self.counts, dtype=np.uint64).reshape(self.height, self.width)
+
+    def last_visit_array(self, ant_id: int) -> "np.ndarray":
+        """Return a zero-copy view of the step at which ``ant_id`` last stood on each cell."""
+
+        import numpy as np
+
+        if self.last_visits is None:
+            msg = "Per-ant last-visit maps are disabled; use track_visits(per_ant=True)"
+            raise ValueError(msg)
+        self.sync()
+        slot = self._ants.slot(ant_id)
+        return np.frombuffer(self.last_visits[slot], dtype=np.uint64).reshape(self.height, self.width)
+
+    def save(self, path: str | Path, *, ant_id: int | None = None) -> None:
+        """Write the visit counts (or ``ant_id``'s last-visit map) as ``.npy`` or a PNG heatmap."""
+
+        from ant.io.heatmap import save_heatmap
+
+        if ant_id is None:
+            save_heatmap(self.count_array(), path)
+        else:
+            save_heatmap(self.last_visit_array(ant_id), path, log=False)
@@ -0,0 +1,19 @@
+"""File formats for simulation output."""
+from ant.io.cache import ResultCache
+from ant.io.columnar import ColumnWriter, CsvColumnWriter, NpzColumnWriter, open_column_writer
+from ant.io.recording import Recording, RecordingWriter
+from ant.io.trajectory import ReplaySimulation, Trajectory, TrajectoryRecorder, open_replay
+
+__all__ = [
+    "ColumnWriter",
+    "CsvColumnWriter",
+    "NpzColumnWriter",
+    "open_column_writer",
+    "Recording",
+    "RecordingWriter",
+    "ResultCache",
+    "ReplaySimulation",
+    "Trajectory",
+    "TrajectoryRecorder",
+    "open_replay",
+]
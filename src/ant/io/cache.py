@@ -0,0 +1,226 @@
+"""Content-addressed on-disk cache of simulation checkpoints.
+
+Runs are keyed by a SHA-256 of their normalized starting configuration
+(grid size, topology, rule, trail lifetime, ants and any pre-set cells).
+While advancing, a full-state checkpoint is stored whenever the step count
+reaches a power of two, so extending a run to ``N`` steps restarts from the
+largest cached power of two at or below ``N``. Layout::
+
+    <root>/<key>/config.json
+    <root>/<key>/<step>.npz
+
+Each checkpoint's modification time doubles as its last-use time; when the
+cache grows past ``max_bytes`` the least recently used checkpoints go first.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ant.core.simulation import Simulation
+from ant.io.checkpoint import encode_checkpoint, restore_checkpoint
+from ant.topology.base import GluedTopology
+
+DEFAULT_MAX_BYTES = 1 << 30
+_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def default_cache_dir() -> Path:
+    """``$ANT_SIM_CACHE``, else ``$XDG_CACHE_HOME/ant-sim``, else ``~/.cache/ant-sim``."""
+
+    override = os.environ.get("ANT_SIM_CACHE")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ant-sim"
+
+
+def parse_size(text: str) -> int:
+    """Parse byte counts such as ``500M``, ``2G`` or ``1048576``."""
+
+    value = text.strip().upper().removesuffix("B").removesuffix("I")
+    unit = value[-1:] if value[-1:] in _SIZE_UNITS else ""
+    try:
+        number = float(value[: len(value) - len(unit)])
+    except ValueError as exc:
+        msg = f"Invalid size {text!r}"
+        raise ValueError(msg) from exc
+    if number < 0:
+        msg = f"Invalid size {text!r}"
+        raise ValueError(msg)
+    return int(number * _SIZE_UNITS[unit])
+
+
+def run_config(simulation: Simulation) -> Dict[str, Any]:
+    """Return the normalized description of ``simulation``'s starting state."""
+
+    if simulation.steps_executed:
+        msg = "A run configuration describes step 0; this simulation has already advanced"
+        raise ValueError(msg)
+    grid = simulation.grid
+    cells = grid.cell_bytes()
+    topology = type(simulation.topology).__name__
+    if type(simulation.topology) is GluedTopology:
+        topology += f"({simulation.topology.spec!r}, reorient={simulation.topology.reorient})"
+    return {
+        "width": grid.width,
+        "height": grid.height,
+        "topology": topology,
+        "rule": simulation.rule.spec,
+        "trail_lifetime": simulation.trail_lifetime,
+        "ants": [
+            [ant.ant_id, ant.x, ant.y, ant.heading.name.lower(), ant.trail_color, ant.state]
+            for ant in simulation.ants
+        ],
+        "cells": hashlib.sha256(cells).hexdigest() if any(cells) else None,
+    }
+
+
+def config_key(config: Dict[str, Any]) -> str:
+    encoded = json.dumps(config, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """One cached configuration and its checkpoints."""
+
+    key: str
+    config: Dict[str, Any]
+    steps: List[int]
+    size: int
+    last_used: float
+
+
+class ResultCache:
+    """Power-of-two checkpoints for repeated runs, evicted by size in LRU order."""
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        min_checkpoint: int = 1024,
+    ) -> None:
+        if max_bytes < 0:
+            msg = "max_bytes must be non-negative"
+            raise ValueError(msg)
+        if min_checkpoint <= 0:
+            msg = "min_checkpoint must be a positive integer"
+            raise ValueError(msg)
+        self.root = Path(root) if root is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.min_checkpoint = min_checkpoint
+        self.hits = 0
+        self.steps_saved = 0
+
+    def _checkpoints(self, key: str) -> Dict[int, Path]:
+        directory = self.root / key
+        if not directory.is_dir():
+            return {}
+        return {int(path.stem): path for path in directory.glob("*.npz") if path.stem.isdigit()}
+
+    def advance(self, simulation: Simulation, steps: int) -> Simulation:
+        """Bring a fresh ``simulation`` to ``steps`` steps, reusing and extending the cache."""
+
+        if steps < 0:
+            msg = "Steps must be non-negative"
+            raise ValueError(msg)
+        if (
+            simulation.stats is not None
+            or simulation.recorder is not None
+            or simulation.visits is not None
+            or simulation.snapshots is not None
+        ):
+            msg = "Cached runs cannot skip steps while statistics, visit counts, snapshots or a recorder are attached"
+            raise ValueError(msg)
+        config = run_config(simulation)
+        key = config_key(config)
+        usable = [step for step in self._checkpoints(key) if step <= steps]
+        if usable:
+            best = max(usable)
+            path = self.root / key / f"{best}.npz"
+            restore_checkpoint(simulation, path, best)
+            os.utime(path)
+            self.hits += 1
+            self.steps_saved += best
+
+        wrote = False
+        checkpoint = max(self.min_checkpoint, 1 << max(0, simulation.steps_executed.bit_length()))
+        while checkpoint <= steps:
+            if checkpoint > simulation.steps_executed:
+                simulation.run(checkpoint - simulation.steps_executed)
+                self._store(key, config, simulation)
+                wrote = True
+            checkpoint <<= 1
+        simulation.run(steps - simulation.steps_executed)
+        if wrote:
+            self.prune(self.max_bytes)
+        return simulation
+
+    def _store(self, key: str, config: Dict[str, Any], simulation: Simulation) -> None:
+        directory = self.root / key
+        directory.mkdir(parents=True, exist_ok=True)
+        meta = directory / "config.json"
+        if not meta.exists():
+            meta.write_text(json.dumps(config, sort_keys=True))
+        target = directory / f"{simulation.steps_executed}.npz"
+        partial = target.with_suffix(f".tmp{os.getpid()}")
+        partial.write_bytes(encode_checkpoint(simulation))
+        os.replace(partial, target)
+
+    def entries(self) -> List[CacheEntry]:
+        """List cached configurations, most recently used first."""
+
+        entries = []
+        if not self.root.is_dir():
+            return entries
+        for directory in self.root.iterdir():
+            checkpoints = self._checkpoints(directory.name)
+            meta = directory / "config.json"
+            if not checkpoints or not meta.exists():
+                continue
+            stats = [path.stat() for path in checkpoints.values()]
+            entries.append(
+                CacheEntry(
+                    key=directory.name,
+                    config=json.loads(meta.read_text()),
+                    steps=sorted(checkpoints),
+                    size=sum(stat.st_size for stat in stats),
+                    last_used=max(stat.st_mtime for stat in stats),
+                )
+            )
+        entries.sort(key=lambda entry: entry.last_used, reverse=True)
+        return entries
+
+    def size(self) -> int:
+        return sum(entry.size for entry in self.entries())
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least recently used checkpoints until at most ``max_bytes`` remain; return bytes freed."""
+
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if not self.root.is_dir():
+            return 0
+        files = []
+        for directory in self.root.iterdir():
+            for path in self._checkpoints(directory.name).values():
+                stat = path.stat()
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _mtime, size, _path in files)
+        freed = 0
+        for _mtime, size, path in sorted(files, key=lambda item: item[0]):
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)  # another process may have evicted it already
+            total -= size
+            freed += size
+        for directory in list(self.root.iterdir()):
+            if directory.is_dir() and not self._checkpoints(directory.name):
+                shutil.rmtree(directory)
+        return freed
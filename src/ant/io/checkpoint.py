@@ -0,0 +1,77 @@
+"""Full-state simulation checkpoints stored as compressed ``.npz`` archives.
+
+A checkpoint holds the step count, trail clock, cell states, trail buffers and
+every ant column, which is everything needed to continue a run exactly.
+"""
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+
+from ant.core.simulation import Simulation
+
+
+def encode_checkpoint(simulation: Simulation) -> bytes:
+    import numpy as np
+
+    grid = simulation.grid
+    owners, expiry = grid.trail_arrays()
+    columns = simulation.ants.arrays()
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        steps=np.int64(simulation.steps_executed),
+        clock=np.int64(grid.clock),
+        cells=grid.cell_array(),
+        trail_owner=owners,
+        trail_expiry=expiry,
+        ant_x=columns["x"],
+        ant_y=columns["y"],
+        ant_heading=columns["heading"],
+        ant_state=columns["state"],
+    )
+    return buffer.getvalue()
+
+
+def write_checkpoint(simulation: Simulation, path: str | Path) -> None:
+    """Write ``simulation``'s state to ``path``, replacing it atomically."""
+
+    target = Path(path)
+    partial = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    partial.write_bytes(encode_checkpoint(simulation))
+    os.replace(partial, target)
+
+
+def restore_checkpoint(simulation: Simulation, path: str | Path, step: int | None = None) -> int:
+    """Load the checkpoint at ``path`` into ``simulation`` and return its step count.
+
+    The simulation must have the same grid size and number of ants as the run
+    that wrote the checkpoint.
+    """
+
+    import numpy as np
+
+    with np.load(path) as data:
+        grid = simulation.grid
+        store = simulation.ants
+        if data["cells"].shape != (grid.height, grid.width) or len(data["ant_x"]) != len(store):
+            msg = (
+                f"Checkpoint holds a {data['cells'].shape[1]}x{data['cells'].shape[0]} grid with "
+                f"{len(data['ant_x'])} ants; this run has {grid.width}x{grid.height} and {len(store)}"
+            )
+            raise ValueError(msg)
+        owners, expiry = grid.trail_arrays()
+        grid.cell_array()[:] = data["cells"]
+        owners[:] = data["trail_owner"]
+        expiry[:] = data["trail_expiry"]
+        grid.clock = int(data["clock"])
+        moves = zip(data["ant_x"].tolist(), data["ant_y"].tolist(), data["ant_heading"].tolist())
+        for slot, (x, y, heading) in enumerate(moves):
+            store.place(slot, x, y, heading)
+        for slot, state in enumerate(data["ant_state"].tolist()):
+            store.states[slot] = state
+        if step is None:
+            step = int(data["steps"])
+    simulation.steps_executed = step
+    return step
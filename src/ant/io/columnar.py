@@ -0,0 +1,122 @@
+"""Buffered column writers for time series sampled during a run."""
+from __future__ import annotations
+
+import csv
+from abc import ABC, abstractmethod
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ColumnWriter(ABC):
+    """Accepts rows with a fixed set of columns and persists them in batches."""
+
+    def __init__(self, path: str | Path, *, buffer_rows: int = 4096) -> None:
+        if buffer_rows <= 0:
+            msg = "buffer_rows must be a positive integer"
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.buffer_rows = buffer_rows
+        self.columns: Optional[List[str]] = None
+        self.rows_written = 0
+        self._closed = False
+
+    def write_row(self, row: Dict[str, float]) -> None:
+        if self._closed:
+            msg = "Writer is closed"
+            raise ValueError(msg)
+        if self.columns is None:
+            self.columns = list(row)
+            self._start(row)
+        elif len(row) != len(self.columns):
+            msg = f"Row has columns {list(row)}, expected {self.columns}"
+            raise ValueError(msg)
+        self._append(row)
+        self.rows_written += 1
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._finish()
+        self._closed = True
+
+    def __enter__(self) -> "ColumnWriter":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _start(self, row: Dict[str, float]) -> None:
+        """Hook called with the first row, once columns are known."""
+
+    @abstractmethod
+    def _append(self, row: Dict[str, float]) -> None:
+        ...
+
+    @abstractmethod
+    def _finish(self) -> None:
+        ...
+
+
+class CsvColumnWriter(ColumnWriter):
+    """Appends rows to a CSV file every ``buffer_rows`` rows."""
+
+    def __init__(self, path: str | Path, *, buffer_rows: int = 4096) -> None:
+        super().__init__(path, buffer_rows=buffer_rows)
+        self._pending: List[list] = []
+        self.path.write_text("")
+
+    def _start(self, row: Dict[str, float]) -> None:
+        self._pending.append(list(row))
+
+    def _append(self, row: Dict[str, float]) -> None:
+        self._pending.append([row[column] for column in self.columns or ()])
+        if len(self._pending) >= self.buffer_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self.path.open("a", newline="") as handle:
+            csv.writer(handle).writerows(self._pending)
+        self._pending.clear()
+
+    def _finish(self) -> None:
+        if self._pending:
+            self._flush()
+
+
+class NpzColumnWriter(ColumnWriter):
+    """Keeps each column in a compact typed array and saves an ``.npz`` on close."""
+
+    def __init__(self, path: str | Path, *, buffer_rows: int = 4096) -> None:
+        super().__init__(path, buffer_rows=buffer_rows)
+        self._data: Dict[str, array] = {}
+
+    def _start(self, row: Dict[str, float]) -> None:
+        for column, value in row.items():
+            self._data[column] = array("q" if isinstance(value, int) else "d")
+
+    def _append(self, row: Dict[str, float]) -> None:
+        for column, values in self._data.items():
+            values.append(row[column])
+
+    def _finish(self) -> None:
+        import numpy as np
+
+        arrays = {column: np.frombuffer(values, dtype=values.typecode) for column, values in self._data.items()}
+        with self.path.open("wb") as handle:
+            np.savez(handle, **arrays)
+
+
+_WRITERS = {"csv": CsvColumnWriter, "npz": NpzColumnWriter}
+
+
+def open_column_writer(path: str | Path, fmt: str | None = None, *, buffer_rows: int = 4096) -> ColumnWriter:
+    """Create a writer, picking the format from ``fmt`` or the file extension."""
+
+    key = (fmt or Path(path).suffix.lstrip(".")).lower()
+    try:
+        writer_cls = _WRITERS[key]
+    except KeyError as exc:
+        msg = f"Unsupported stats format '{key}'. Expected one of: {', '.join(sorted(_WRITERS))}"
+        raise ValueError(msg) from exc
+    return writer_cls(path, buffer_rows=buffer_rows)
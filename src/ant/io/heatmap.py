@@ -0,0 +1,35 @@
+"""Heatmap export for per-cell counters such as :class:`ant.core.visits.VisitCounts`."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+
+def save_heatmap(values: "np.ndarray", path: str | Path, *, log: bool = True, cmap: str = "inferno") -> None:
+    """Write ``values`` to ``path``: raw as ``.npy``, or color-mapped as ``.png``.
+
+    PNG heatmaps use ``log(1 + value)`` by default so that rarely visited
+    cells stay visible next to the ant's hot spots.
+    """
+
+    import numpy as np
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        np.save(path, values)
+        return
+    if suffix != ".png":
+        msg = f"Unsupported heatmap format {suffix or path.name!r}; use .npy or .png"
+        raise ValueError(msg)
+    try:
+        from matplotlib.image import imsave
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        msg = "PNG heatmaps require Matplotlib; install with `pip install .[viz]`"
+        raise ValueError(msg) from exc
+
+    data = np.log1p(values, dtype=np.float64) if log else values.astype(np.float64)
+    imsave(path, data, cmap=cmap, vmin=0, vmax=max(float(data.max(initial=0)), 1.0))
@@ -0,0 +1,177 @@
+"""Ant populations read from files or generated in bulk.
+
+Every helper returns keyword columns for :meth:`ant.core.ants.AntStore.add_arrays`,
+so a colony of any size is built from a handful of NumPy arrays.
+
+CSV files need a header naming their columns: ``x`` and ``y`` are required,
+``heading`` (``north``/``east``/``south``/``west``, ``n``/``e``/``s``/``w`` or a
+code 0-3, default north), ``color`` (default red), ``state`` and ``id`` are
+optional. ``.npy`` files hold either a structured array with the same field
+names or an integer array whose columns are ``x, y[, heading[, state]]``.
+
+Generator specs take the form ``KIND:N[,heading=H][,color=C]``:
+
+``lattice:N``  N ants spread evenly over the grid, heading north by default
+``random:N``   N ants on distinct random cells with random headings
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict
+
+from ant.core.direction import HEADINGS
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+Columns = Dict[str, object]
+
+_HEADING_NAMES = {
+    key: code
+    for code, heading in enumerate(HEADINGS)
+    for key in (heading.name.lower(), heading.name[0].lower(), str(code))
+}
+_GENERATORS = ("lattice", "random")
+
+
+def heading_codes(values: "np.ndarray") -> "np.ndarray":
+    """Translate heading names (or code strings) to heading codes."""
+
+    import numpy as np
+
+    known = {}
+    codes = []
+    for value in values.astype(str).tolist():
+        code = known.get(value)
+        if code is None:
+            try:
+                code = known[value] = _HEADING_NAMES[value.strip().lower()]
+            except KeyError:
+                msg = f"Unknown heading {value!r}; expected north/east/south/west or 0-3"
+                raise ValueError(msg) from None
+        codes.append(code)
+    return np.array(codes, dtype=np.int64)
+
+
+def load_ants(path: str | Path) -> Columns:
+    """Read ant columns from a ``.csv`` or ``.npy`` file."""
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return _load_csv(path)
+    if suffix == ".npy":
+        return _load_npy(path)
+    msg = f"Unsupported ants file format {suffix or path.name!r}; use .csv or .npy"
+    raise ValueError(msg)
+
+
+def _load_csv(path: Path) -> Columns:
+    import numpy as np
+
+    with path.open() as handle:
+        header = [name.strip().lower() for name in handle.readline().split(",")]
+        if not {"x", "y"} <= set(header):
+            msg = "Ants CSV needs a header with at least x and y columns"
+            raise ValueError(msg)
+        dtype = [(name, "U64" if name in ("heading", "color") else "i8") for name in header]
+        try:
+            table = np.loadtxt(handle, delimiter=",", dtype=dtype, ndmin=1, comments=None)
+        except ValueError as exc:
+            msg = f"Cannot parse ants CSV: {exc}"
+            raise ValueError(msg) from None
+    return _columns({name: table[name] for name in header})
+
+
+def _load_npy(path: Path) -> Columns:
+    import numpy as np
+
+    data = np.load(path)
+    if data.dtype.names:
+        return _columns({name.lower(): data[name] for name in data.dtype.names})
+    if data.ndim != 2 or not 2 <= data.shape[1] <= 4 or not np.issubdtype(data.dtype, np.integer):
+        msg = "Ants .npy must be a structured array or an integer array with columns x, y[, heading[, state]]"
+        raise ValueError(msg)
+    names = ("x", "y", "heading", "state")
+    return _columns({name: data[:, index] for index, name in enumerate(names[: data.shape[1]])})
+
+
+def _columns(fields: Dict[str, "np.ndarray"]) -> Columns:
+    import numpy as np
+
+    try:
+        columns: Columns = {
+            "xs": fields["x"].astype(np.int64),
+            "ys": fields["y"].astype(np.int64),
+        }
+        if "id" in fields:
+            columns["ids"] = fields["id"].astype(np.int64)
+        if "state" in fields:
+            columns["states"] = fields["state"].astype(np.int64)
+    except ValueError as exc:
+        msg = f"Ant coordinates, ids and states must be integers ({exc})"
+        raise ValueError(msg) from None
+    heading = fields.get("heading")
+    if heading is None:
+        columns["headings"] = np.zeros(len(columns["xs"]), dtype=np.int64)
+    elif np.issubdtype(heading.dtype, np.integer):
+        columns["headings"] = heading.astype(np.int64)
+    else:
+        columns["headings"] = heading_codes(heading)
+    if "color" in fields:
+        columns["trail_colors"] = [color.strip() for color in fields["color"].astype(str).tolist()]
+    return columns
+
+
+def generate_ants(spec: str, width: int, height: int, *, seed: int | None = None) -> Columns:
+    """Build ant columns from a generator spec such as ``random:5000`` or ``lattice:100,heading=east``."""
+
+    import numpy as np
+
+    kind, _, rest = spec.partition(":")
+    kind = kind.strip().lower()
+    count_text, *options = rest.split(",")
+    if kind not in _GENERATORS:
+        msg = f"Unknown ant generator {kind!r}; expected one of {', '.join(_GENERATORS)}"
+        raise ValueError(msg)
+    try:
+        count = int(count_text)
+        settings = dict(option.split("=", 1) for option in options)
+    except ValueError:
+        msg = f"Invalid ant generator {spec!r}; expected e.g. 'random:1000' or 'lattice:64,heading=east'"
+        raise ValueError(msg) from None
+    unknown = set(settings) - {"heading", "color"}
+    if count < 0 or unknown:
+        msg = f"Invalid ant generator {spec!r}; options are heading=... and color=..."
+        raise ValueError(msg)
+    if count > width * height:
+        msg = f"Cannot place {count} ants on distinct cells of a {width}x{height} grid"
+        raise ValueError(msg)
+
+    rng = np.random.default_rng(seed)
+    if kind == "lattice":
+        columns_per_row = max(1, min(width, int(np.ceil(np.sqrt(count * width / height))))) if count else 1
+        rows = max(1, -(-count // columns_per_row))
+        if rows > height:
+            rows = height
+            columns_per_row = -(-count // rows)
+        index = np.arange(count)
+        xs = (index % columns_per_row) * width // columns_per_row + width // (2 * columns_per_row)
+        ys = (index // columns_per_row) * height // rows + height // (2 * rows)
+        default_heading = "north"
+    else:
+        cells = rng.choice(width * height, size=count, replace=False)
+        ys, xs = np.divmod(cells, width)
+        default_heading = "random"
+
+    heading = settings.get("heading", default_heading).strip().lower()
+    if heading == "random":
+        headings = rng.integers(0, len(HEADINGS), size=count)
+    else:
+        headings = np.full(count, heading_codes(np.array([heading]))[0])
+    return {
+        "xs": xs.astype(np.int64),
+        "ys": ys.astype(np.int64),
+        "headings": headings,
+        "trail_colors": settings.get("color", "red").strip(),
+    }
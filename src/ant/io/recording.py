@@ -0,0 +1,195 @@
+"""Seekable recordings: periodic full-state keyframes plus per-step move deltas.
+
+Layout, in the spirit of a video container::
+
+    MAGIC | u32 header length | header JSON
+    segment*   (u32 keyframe length | keyframe .npz | delta records)
+    index JSON | u64 index offset | INDEX_MAGIC
+
+Every segment starts with a keyframe taken ``keyframe_interval`` steps after
+the previous one and is followed by the trajectory records of that interval
+(see :mod:`ant.io.trajectory`). The trailing index lets a reader locate any
+segment without scanning, so reaching an arbitrary step costs one keyframe
+load and at most one interval of deltas.
+"""
+from __future__ import annotations
+
+import io
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ant.core.direction import HEADING_CODES
+from ant.core.simulation import Simulation
+from ant.io.trajectory import (
+    Keyframe,
+    ReplaySimulation,
+    Trajectory,
+    TrajectoryRecorder,
+    record_dtype,
+)
+
+MAGIC = b"ANTSEEK1"
+INDEX_MAGIC = b"ANTIDX1\n"
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+
+def _encode_keyframe(simulation: Simulation) -> bytes:
+    import numpy as np
+
+    grid = simulation.grid
+    owners, expiry = grid.trail_arrays()
+    trail_y, trail_x = np.nonzero(expiry > grid.clock)
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        cells=grid.cell_array(),
+        trail_x=trail_x.astype(np.int32),
+        trail_y=trail_y.astype(np.int32),
+        trail_id=owners[trail_y, trail_x],
+        trail_ttl=(expiry[trail_y, trail_x] - grid.clock).astype(np.int32),
+        ant_x=np.array([ant.x for ant in simulation.ants], dtype=np.int32),
+        ant_y=np.array([ant.y for ant in simulation.ants], dtype=np.int32),
+        ant_heading=np.array([HEADING_CODES[ant.heading] for ant in simulation.ants], dtype=np.uint8),
+    )
+    return buffer.getvalue()
+
+
+class RecordingWriter(TrajectoryRecorder):
+    """Trajectory recorder that also stores a keyframe every ``keyframe_interval`` steps."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        simulation: Simulation,
+        *,
+        keyframe_interval: int = 10_000,
+        chunk_steps: int = 4096,
+    ) -> None:
+        if keyframe_interval <= 0:
+            msg = "keyframe_interval must be a positive integer"
+            raise ValueError(msg)
+        self.keyframe_interval = keyframe_interval
+        self._simulation = simulation
+        self._segments: List[List[int]] = []
+        super().__init__(path, simulation, chunk_steps=chunk_steps)
+
+    def _write_preamble(self, simulation: Simulation) -> None:
+        header = self._header(simulation)
+        header["keyframe_interval"] = self.keyframe_interval
+        encoded = json.dumps(header).encode()
+        self._handle.write(MAGIC + _U32.pack(len(encoded)) + encoded)
+        self._start_segment()
+
+    def _start_segment(self) -> None:
+        keyframe = _encode_keyframe(self._simulation)
+        offset = self._handle.tell()
+        self._handle.write(_U32.pack(len(keyframe)) + keyframe)
+        # [first step index, keyframe offset, keyframe length, delta offset, delta steps]
+        self._segments.append([self.steps_recorded, offset + _U32.size, len(keyframe), self._handle.tell(), 0])
+
+    def end_step(self) -> None:
+        self.steps_recorded += 1
+        self._segments[-1][4] += 1
+        if self.steps_recorded % self.keyframe_interval == 0:
+            self.flush()
+            self._start_segment()
+        elif len(self._buffer) >= self._chunk_bytes:
+            self.flush()
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.flush()
+        index_offset = self._handle.tell()
+        self._handle.write(json.dumps({"segments": self._segments}).encode())
+        self._handle.write(_U64.pack(index_offset) + INDEX_MAGIC)
+        self._handle.close()
+
+
+class Recording(Trajectory):
+    """Random-access reader for files produced by :class:`RecordingWriter`."""
+
+    def __init__(self, path: str | Path) -> None:
+        import numpy as np
+
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                msg = f"{self.path} is not a seekable ant recording"
+                raise ValueError(msg)
+            (length,) = _U32.unpack(handle.read(_U32.size))
+            self.meta: Dict[str, Any] = json.loads(handle.read(length))
+            handle.seek(-(_U64.size + len(INDEX_MAGIC)), io.SEEK_END)
+            trailer = handle.read()
+            if trailer[_U64.size:] != INDEX_MAGIC:
+                msg = f"{self.path} has no index; the recording was not closed cleanly"
+                raise ValueError(msg)
+            (index_offset,) = _U64.unpack(trailer[: _U64.size])
+            handle.seek(index_offset)
+            index = json.loads(handle.read(self.path.stat().st_size - index_offset - len(trailer)))
+        self.segments: List[List[int]] = index["segments"]
+        self.width: int = self.meta["width"]
+        self.height: int = self.meta["height"]
+        self.keyframe_interval: int = self.meta["keyframe_interval"]
+        self.ant_count = len(self.meta["ants"])
+        self._dtype = record_dtype()
+        self._deltas: Dict[int, np.ndarray] = {}
+        self.initial_cells = self.keyframe_before(0).cells
+
+    @property
+    def steps(self) -> int:
+        first, _offset, _length, _delta_offset, count = self.segments[-1]
+        return first + count
+
+    def _segment_deltas(self, segment: int) -> "np.ndarray":
+        import numpy as np
+
+        deltas = self._deltas.get(segment)
+        if deltas is None:
+            _first, _offset, _length, delta_offset, count = self.segments[segment]
+            if count and self.ant_count:
+                deltas = np.memmap(
+                    self.path, dtype=self._dtype, mode="r", offset=delta_offset, shape=(count, self.ant_count)
+                )
+            else:
+                deltas = np.zeros((0, self.ant_count), dtype=self._dtype)
+            self._deltas[segment] = deltas
+        return deltas
+
+    def moves(self, index: int) -> List[tuple]:
+        segment = index // self.keyframe_interval
+        return self._segment_deltas(segment)[index - self.segments[segment][0]].tolist()
+
+    def move_block(self, start: int, stop: int) -> "np.ndarray":
+        import numpy as np
+
+        parts = []
+        while start < stop:
+            segment = start // self.keyframe_interval
+            first = self.segments[segment][0]
+            end = min(stop, first + self.segments[segment][4])
+            parts.append(self._segment_deltas(segment)[start - first : end - first])
+            start = end
+        if not parts:
+            return np.zeros((0, self.ant_count), dtype=self._dtype)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def keyframe_before(self, index: int) -> Keyframe:
+        import numpy as np
+
+        segment = min(index // self.keyframe_interval, len(self.segments) - 1)
+        first, offset, length, _delta_offset, _count = self.segments[segment]
+        with self.path.open("rb") as handle:
+            handle.seek(offset)
+            data = np.load(io.BytesIO(handle.read(length)))
+            arrays = {name: data[name] for name in data.files}
+        cells = arrays.pop("cells")
+        return Keyframe(index=first, cells=cells if cells.any() else None, **arrays)
+
+    def state_at(self, step: int, *, trail_lifetime: int | None = None) -> ReplaySimulation:
+        """Return a replay positioned at absolute ``step``."""
+
+        return ReplaySimulation(self, trail_lifetime=trail_lifetime).seek(step)
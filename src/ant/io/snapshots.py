@@ -0,0 +1,162 @@
+"""Periodic grid snapshots written by a background thread pool.
+
+:class:`SnapshotWriter` copies the cell states on the simulation thread (one
+``bytes`` copy) and leaves encoding and writing to worker threads. Both
+formats are produced with the standard library. PNG files are 8-bit
+palette images compressed with :mod:`zlib`, which releases the GIL while
+it deflates, so compression overlaps the simulation. ``.npy`` files hold the
+raw ``(height, width)`` ``uint8`` cell states for ``numpy.load``.
+
+At most ``max_pending`` snapshots are in flight. That bounds memory to
+``max_pending`` grid copies. The simulation only waits when the writers fall
+further behind than that.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ant.core.simulation import Simulation
+
+FORMATS = ("png", "npy")
+Color = Tuple[int, int, int]
+
+# Stops of Matplotlib's viridis map, which colors states beyond white and black.
+_VIRIDIS: Sequence[Color] = ((68, 1, 84), (59, 82, 139), (33, 145, 140), (94, 201, 98), (253, 231, 37))
+
+
+def snapshot_palette(states: int) -> List[Color]:
+    """RGB colors for cell states: white, black, then viridis hues as in :func:`ant.renderers.mpl.state_palette`."""
+
+    colors: List[Color] = [(255, 255, 255), (0, 0, 0)][:states]
+    extra = states - 2
+    for index in range(max(0, extra)):
+        position = index / (extra - 1 or 1) * (len(_VIRIDIS) - 1)
+        low = min(int(position), len(_VIRIDIS) - 2)
+        fraction = position - low
+        (r0, g0, b0), (r1, g1, b1) = _VIRIDIS[low], _VIRIDIS[low + 1]
+        colors.append(
+            (round(r0 + (r1 - r0) * fraction), round(g0 + (g1 - g0) * fraction), round(b0 + (b1 - b0) * fraction))
+        )
+    return colors
+
+
+def encode_png(cells: bytes, width: int, height: int, palette: Sequence[Color], *, level: int = 6) -> bytes:
+    """Encode row-major 8-bit color indices as a palette PNG."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    view = memoryview(cells)
+    # Every row starts with filter type 0 ("none"); one compress call keeps the GIL released throughout.
+    rows = b"\0" + b"\0".join(view[y * width : (y + 1) * width] for y in range(height)) if height else b""
+    header = struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", header),
+            chunk(b"PLTE", bytes(channel for color in palette for channel in color)),
+            chunk(b"IDAT", zlib.compress(rows, level)),
+            chunk(b"IEND", b""),
+        )
+    )
+
+
+def encode_npy(cells: bytes, width: int, height: int) -> bytes:
+    """Wrap row-major ``uint8`` cell states in a version 1.0 ``.npy`` header."""
+
+    header = f"{{'descr': '|u1', 'fortran_order': False, 'shape': ({height}, {width}), }}"
+    padding = -(len(header) + 11) % 64  # magic (6) + version (2) + length (2) + newline (1)
+    header = (header + " " * padding + "\n").encode("latin1")
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header + cells
+
+
+class SnapshotWriter:
+    """Save the grid to ``directory`` every ``every`` steps as ``step<N>.png`` or ``.npy`` files."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        every: int,
+        format: str = "png",
+        workers: int = 2,
+        max_pending: Optional[int] = None,
+        states: int = 2,
+    ) -> None:
+        if every <= 0 or workers <= 0 or (max_pending is not None and max_pending <= 0):
+            msg = "every, workers and max_pending must be positive integers"
+            raise ValueError(msg)
+        if format not in FORMATS:
+            msg = f"Unsupported snapshot format {format!r}; use {' or '.join(FORMATS)}"
+            raise ValueError(msg)
+        if format == "png" and states > 256:
+            msg = "PNG snapshots support at most 256 cell states"
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.every = every
+        self.format = format
+        self.palette = snapshot_palette(states)
+        self.written: List[Path] = []
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ant-snapshot")
+        self._futures: List[Future] = []
+
+    def on_step(self, simulation: "Simulation") -> None:
+        if simulation.steps_executed % self.every == 0:
+            self.capture(simulation)
+
+    def capture(self, simulation: "Simulation") -> None:
+        """Copy the current cell states and queue them for writing."""
+
+        self._collect_finished()
+        grid = simulation.grid
+        self._slots.acquire()  # waits only while max_pending snapshots are still being written
+        cells = grid.cell_bytes()
+        path = self.directory / f"step{simulation.steps_executed:010d}.{self.format}"
+        future = self._pool.submit(self._write, cells, grid.width, grid.height, path)
+        future.add_done_callback(lambda _future: self._slots.release())
+        self._futures.append(future)
+
+    def _write(self, cells: bytes, width: int, height: int, path: Path) -> Path:
+        if self.format == "png":
+            data = encode_png(cells, width, height, self.palette)
+        else:
+            data = encode_npy(cells, width, height)
+        partial = path.with_name(f".{path.name}.tmp")
+        partial.write_bytes(data)
+        os.replace(partial, path)  # readers never see a half-written snapshot
+        return path
+
+    def _collect_finished(self) -> None:
+        pending = []
+        for future in self._futures:
+            if not future.done():
+                pending.append(future)
+                continue
+            self.written.append(future.result())  # re-raises a failed write
+        self._futures = pending
+
+    def close(self) -> None:
+        """Wait for every queued snapshot and stop the writer threads."""
+
+        try:
+            for future in self._futures:
+                future.result()
+            self._collect_finished()
+            self.written.sort()
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
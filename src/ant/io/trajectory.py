@@ -0,0 +1,380 @@
+"""Compact trajectory recordings and simulation-free replay.
+
+A recording stores a small JSON header describing the run followed by one
+fixed-size record per ant per step: the ant's position and heading after
+the move (``int32``, ``int32``, ``uint8``) and the state it wrote to the
+cell it left (``uint8``). Records are buffered and appended in chunks.
+"""
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ant.core.direction import HEADING_CODES, HEADINGS, Heading, heading_to_step
+from ant.core.grid import Grid
+from ant.core.simulation import Ant, Simulation
+from ant.topology.base import Topology, topology_from_spec, topology_spec
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+MAGIC = b"ANTREC1\n"
+_RECORD = struct.Struct("<iiBB")
+_HEADER_LENGTH = struct.Struct("<I")
+_STEPS = tuple((step.dx, step.dy) for step in map(heading_to_step, HEADINGS))
+
+
+def record_dtype() -> "np.dtype":
+    import numpy as np
+
+    return np.dtype([("x", "<i4"), ("y", "<i4"), ("heading", "u1"), ("state", "u1")])
+
+
+def _initial_cells(simulation: Simulation) -> bytes:
+    cells = simulation.grid.cell_bytes()
+    return cells if any(cells) else b""
+
+
+class TrajectoryRecorder:
+    """Appends per-step ant moves to a recording file in chunks."""
+
+    def __init__(self, path: str | Path, simulation: Simulation, *, chunk_steps: int = 4096) -> None:
+        if chunk_steps <= 0:
+            msg = "chunk_steps must be a positive integer"
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.ant_count = len(simulation.ants)
+        self._chunk_bytes = chunk_steps * self.ant_count * _RECORD.size
+        self._buffer = bytearray()
+        self._pack = _RECORD.pack
+        self.steps_recorded = 0
+        self._handle = self.path.open("wb")
+        self._write_preamble(simulation)
+
+    @staticmethod
+    def _header(simulation: Simulation) -> Dict[str, Any]:
+        return {
+            "width": simulation.grid.width,
+            "height": simulation.grid.height,
+            "topology": topology_spec(simulation.topology),
+            "trail_lifetime": simulation.trail_lifetime,
+            "rule": simulation.rule.spec,
+            "start_step": simulation.steps_executed,
+            "ants": [
+                {
+                    "ant_id": ant.ant_id,
+                    "x": ant.x,
+                    "y": ant.y,
+                    "heading": ant.heading.name.lower(),
+                    "trail_color": ant.trail_color,
+                }
+                for ant in simulation.ants
+            ],
+        }
+
+    def _write_preamble(self, simulation: Simulation) -> None:
+        cells = _initial_cells(simulation)
+        header = self._header(simulation)
+        header["initial_cells"] = "dense" if cells else "blank"
+        encoded = json.dumps(header).encode()
+        self._handle.write(MAGIC + _HEADER_LENGTH.pack(len(encoded)) + encoded + cells)
+
+    def record(self, x: int, y: int, heading: int, state: int) -> None:
+        """Append one ant move; ``heading`` is a code from :data:`~ant.core.direction.HEADING_CODES`."""
+
+        self._buffer += self._pack(x, y, heading, state)
+
+    def end_step(self) -> None:
+        self.steps_recorded += 1
+        if len(self._buffer) >= self._chunk_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._handle.write(self._buffer)
+            self._buffer.clear()
+        self._handle.flush()
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.flush()
+        self._handle.close()
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+@dataclass
+class Keyframe:
+    """Full replay state at ``index`` steps into a recording.
+
+    Trails are stored sparsely as parallel arrays; ``trail_ttl`` holds the
+    remaining lifetime under the recording's own trail lifetime.
+    """
+
+    index: int
+    cells: Optional["np.ndarray"]
+    trail_x: "np.ndarray"
+    trail_y: "np.ndarray"
+    trail_id: "np.ndarray"
+    trail_ttl: "np.ndarray"
+    ant_x: "np.ndarray"
+    ant_y: "np.ndarray"
+    ant_heading: "np.ndarray"
+
+
+def _empty_trails() -> Dict[str, "np.ndarray"]:
+    import numpy as np
+
+    return {
+        "trail_x": np.zeros(0, dtype=np.int32),
+        "trail_y": np.zeros(0, dtype=np.int32),
+        "trail_id": np.zeros(0, dtype=np.int64),
+        "trail_ttl": np.zeros(0, dtype=np.int32),
+    }
+
+
+class Trajectory:
+    """Read-only, memory-mapped view of a recording."""
+
+    def __init__(self, path: str | Path) -> None:
+        import numpy as np
+
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                msg = f"{self.path} is not an ant trajectory recording"
+                raise ValueError(msg)
+            (length,) = _HEADER_LENGTH.unpack(handle.read(_HEADER_LENGTH.size))
+            self.meta: Dict[str, Any] = json.loads(handle.read(length))
+        offset = len(MAGIC) + _HEADER_LENGTH.size + length
+        self.width: int = self.meta["width"]
+        self.height: int = self.meta["height"]
+        self.initial_cells: Optional[np.ndarray] = None
+        if self.meta["initial_cells"] == "dense":
+            self.initial_cells = np.fromfile(
+                self.path, dtype=np.uint8, count=self.width * self.height, offset=offset
+            ).reshape(self.height, self.width)
+            offset += self.width * self.height
+
+        self.ant_count = len(self.meta["ants"])
+        dtype = record_dtype()
+        available = (self.path.stat().st_size - offset) // dtype.itemsize
+        steps = available // self.ant_count if self.ant_count else 0
+        if steps:
+            self.records = np.memmap(
+                self.path, dtype=dtype, mode="r", offset=offset, shape=(steps, self.ant_count)
+            )
+        else:
+            self.records = np.zeros((0, self.ant_count), dtype=dtype)
+
+    @property
+    def steps(self) -> int:
+        return int(self.records.shape[0])
+
+    def moves(self, index: int) -> List[tuple]:
+        """Return ``(x, y, heading, state)`` for every ant at move ``index``."""
+
+        return self.records[index].tolist()
+
+    def move_block(self, start: int, stop: int) -> "np.ndarray":
+        return self.records[start:stop]
+
+    def keyframe_before(self, index: int) -> Keyframe:
+        """Return the closest stored state at or before ``index``; here only the start."""
+
+        import numpy as np
+
+        ants = self.meta["ants"]
+        return Keyframe(
+            index=0,
+            cells=self.initial_cells,
+            ant_x=np.array([spec["x"] for spec in ants], dtype=np.int32),
+            ant_y=np.array([spec["y"] for spec in ants], dtype=np.int32),
+            ant_heading=np.array(
+                [HEADING_CODES[Heading[spec["heading"].upper()]] for spec in ants], dtype=np.uint8
+            ),
+            **_empty_trails(),
+        )
+
+    def initial_ants(self) -> List[Ant]:
+        return [
+            Ant(
+                ant_id=spec["ant_id"],
+                x=spec["x"],
+                y=spec["y"],
+                heading=Heading[spec["heading"].upper()],
+                trail_color=spec["trail_color"],
+            )
+            for spec in self.meta["ants"]
+        ]
+
+
+def _topology_for(meta: Dict[str, Any]) -> Topology:
+    spec = meta["topology"]
+    if isinstance(spec, str):  # older recordings store only the class name
+        import ant.topology
+
+        if spec not in ant.topology.__all__:
+            msg = f"Unknown topology class {spec!r}"
+            raise ValueError(msg)
+        cls = getattr(ant.topology, spec)
+        spec = {"class": f"{cls.__module__}:{cls.__qualname__}"}
+    return topology_from_spec(spec, meta["width"], meta["height"])
+
+
+class ReplaySimulation(Simulation):
+    """Simulation stand-in that rebuilds the grid from a recording.
+
+    Rules and topology wrapping are never evaluated: each step copies the
+    recorded cell states and ant moves, so renderers and exporters can be
+    driven with a different frame rate or trail lifetime than the original run.
+    """
+
+    def __init__(self, trajectory: Trajectory, *, trail_lifetime: int | None = None) -> None:
+        meta = trajectory.meta
+        super().__init__(
+            width=trajectory.width,
+            height=trajectory.height,
+            ants=trajectory.initial_ants(),
+            topology=_topology_for(meta),
+            trail_lifetime=meta["trail_lifetime"] if trail_lifetime is None else trail_lifetime,
+            rule=meta.get("rule"),
+        )
+        self.trajectory = trajectory
+        self.start_step: int = meta["start_step"]
+        self._cursor = 0
+        self.seek(self.start_step)  # loads the first keyframe, trails included
+
+    @property
+    def steps_remaining(self) -> int:
+        return self.trajectory.steps - self._cursor
+
+    def step(self) -> None:
+        if self._cursor >= self.trajectory.steps:
+            msg = f"Recording ends after {self.trajectory.steps} steps"
+            raise IndexError(msg)
+        moves = self.trajectory.moves(self._cursor)
+        self._cursor += 1
+        grid = self.grid
+        store = self.ants
+        stats, visits = self.stats, self.visits
+        for slot, (x, y, heading, state) in enumerate(moves):
+            old_x, old_y = store.xs[slot], store.ys[slot]
+            if visits is not None:
+                visits.record(slot, old_x, old_y, self.steps_executed + 1)
+            if stats is not None:
+                dx, dy = self._offset(old_x, old_y, x, y, heading)
+                stats.record(store.ids[slot], old_x, old_y, grid.get_state(old_x, old_y), state, dx, dy)
+            grid.set_state(old_x, old_y, state)
+            grid.mark_trail(old_x, old_y, store.ids[slot], self.trail_lifetime)
+            store.place(slot, x, y, heading)
+        self.steps_executed += 1
+        grid.decay_trails()
+        if stats is not None:
+            stats.on_step(self.steps_executed)
+        if self.snapshots is not None:
+            self.snapshots.on_step(self)
+
+    def _offset(self, old_x: int, old_y: int, x: int, y: int, heading: int) -> tuple[int, int]:
+        """Unwrapped step of a recorded move, undoing a boundary crossing as :meth:`step_back` does."""
+
+        dx, dy = _STEPS[heading]
+        if (x - dx, y - dy) != (old_x, old_y):
+            dx, dy = _STEPS[self.topology.uncross(x, y, heading)[2]]
+        return dx, dy
+
+    def seek(self, step: int) -> "ReplaySimulation":
+        """Jump to absolute ``step`` from the nearest keyframe.
+
+        At most one keyframe interval of deltas is applied (plus one trail
+        lifetime when rebuilding with longer trails than were recorded).
+        """
+
+        import numpy as np
+
+        index = step - self.start_step
+        if not 0 <= index <= self.trajectory.steps:
+            msg = (
+                f"Step {step} is outside the recording "
+                f"({self.start_step}..{self.start_step + self.trajectory.steps})"
+            )
+            raise IndexError(msg)
+        recorded_lifetime = self.trajectory.meta["trail_lifetime"]
+        # Keyframes only hold trails that were visible under the recorded lifetime;
+        # a longer lifetime needs enough deltas to rebuild every visible trail.
+        lookback = self.trail_lifetime if self.trail_lifetime > recorded_lifetime else 0
+        keyframe = self.trajectory.keyframe_before(max(0, index - lookback))
+        count = index - keyframe.index
+        width = self.grid.width
+        ant_ids = np.array(self.ants.ids, dtype=np.int64)
+
+        cells = (
+            np.zeros((self.grid.height, width), dtype=np.uint8)
+            if keyframe.cells is None
+            else np.array(keyframe.cells, dtype=np.uint8)
+        )
+        trails: Dict[int, tuple[int, int]] = {}
+        drift = self.trail_lifetime - recorded_lifetime - count
+        for x, y, trail_id, ttl in zip(
+            keyframe.trail_x.tolist(),
+            keyframe.trail_y.tolist(),
+            keyframe.trail_id.tolist(),
+            keyframe.trail_ttl.tolist(),
+        ):
+            if ttl + drift >= 1:
+                trails[y * width + x] = (trail_id, ttl + drift)
+
+        ant_x, ant_y, ant_heading = keyframe.ant_x, keyframe.ant_y, keyframe.ant_heading
+        if count:
+            block = self.trajectory.move_block(keyframe.index, index)
+            prev_x = np.vstack([keyframe.ant_x[None, :], block["x"][:-1]]).ravel()
+            prev_y = np.vstack([keyframe.ant_y[None, :], block["y"][:-1]]).ravel()
+            flat = prev_y.astype(np.int64) * width + prev_x
+            # Later writes win: keep the last occurrence of every touched cell.
+            touched, first_from_end = np.unique(flat[::-1], return_index=True)
+            last = flat.size - 1 - first_from_end
+            cells.ravel()[touched] = block["state"].ravel()[last]
+            ages = count - last // len(self.ants)
+            owners = ant_ids[last % len(self.ants)]
+            for cell, owner, age in zip(touched.tolist(), owners.tolist(), ages.tolist()):
+                ttl = self.trail_lifetime - age
+                if ttl >= 1:
+                    trails[cell] = (owner, ttl)
+                else:
+                    trails.pop(cell, None)
+            ant_x, ant_y, ant_heading = block["x"][-1], block["y"][-1], block["heading"][-1]
+
+        self.grid = Grid(width=width, height=self.grid.height)
+        self._load_cells(cells)
+        for cell, (owner, ttl) in trails.items():
+            self.grid.mark_trail(cell % width, cell // width, owner, ttl)
+        for slot, (x, y, heading) in enumerate(zip(ant_x.tolist(), ant_y.tolist(), ant_heading.tolist())):
+            self.ants.place(slot, x, y, heading)
+        self._cursor = index
+        self.steps_executed = step
+        return self
+
+    def _load_cells(self, cells: "np.ndarray") -> None:
+        self.grid.cell_array()[:] = cells
+
+
+def open_replay(path: str | Path, *, trail_lifetime: int | None = None) -> ReplaySimulation:
+    """Open a plain trajectory or a seekable recording for replay."""
+
+    with Path(path).open("rb") as handle:
+        magic = handle.read(len(MAGIC))
+    if magic == MAGIC:
+        source: Trajectory = Trajectory(path)
+    else:
+        from ant.io.recording import Recording
+
+        source = Recording(path)
+    return ReplaySimulation(source, trail_lifetime=trail_lifetime)
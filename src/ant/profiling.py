@@ -0,0 +1,168 @@
+"""Phase timers for locating hot spots in simulation runs.
+
+The profiler wraps selected methods only while it is running, so an
+uninstrumented run executes the original functions with no extra cost.
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+Target = Tuple[type, str, str]  # (owner class, attribute name, phase label)
+
+
+@dataclass
+class PhaseStats:
+    """Accumulated timings for a single phase."""
+
+    calls: int = 0
+    total: float = 0.0
+    own: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+def default_targets(*, matplotlib: bool = False) -> List[Target]:
+    """Return the engine and renderer methods worth timing."""
+
+    from ant.core.grid import Grid
+    from ant.core.simulation import Simulation
+    from ant.renderers.ascii import AsciiRenderer
+    from ant.topology.base import Topology
+
+    targets: List[Target] = [
+        (Simulation, "step", "simulation.step"),
+        (Grid, "decay_trails", "grid.decay_trails"),
+        (AsciiRenderer, "render", "ascii.render"),
+    ]
+    targets.extend(
+        (topology_cls, "cross", "topology.cross") for topology_cls in _topology_classes(Topology)
+    )
+    if matplotlib:
+        from ant.renderers.mpl import MatplotlibAnimator
+
+        targets.append((MatplotlibAnimator, "_update", "mpl.update"))
+        targets.append((MatplotlibAnimator, "_save", "mpl.save"))
+    return targets
+
+
+def _topology_classes(base: type) -> List[type]:
+    found: List[type] = []
+    pending = [base]
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if "cross" in cls.__dict__ and not getattr(cls.__dict__["cross"], "__isabstractmethod__", False):
+            found.append(cls)
+    return found
+
+
+class PhaseProfiler:
+    """Collects inclusive and exclusive timings for instrumented methods."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self.phases: Dict[str, PhaseStats] = {}
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+        self.wall_time = 0.0
+        self._stack: List[str] = []
+        self._child_time: List[float] = []
+        self._patched: List[Tuple[type, str, Any]] = []
+        self._started_at: float | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._started_at is not None
+
+    def start(self, targets: Iterable[Target]) -> None:
+        if self.running:
+            msg = "Profiler is already running"
+            raise RuntimeError(msg)
+        for owner, attribute, phase in targets:
+            self._instrument(owner, attribute, phase)
+        self._started_at = self._clock()
+
+    def stop(self) -> None:
+        if self._started_at is None:
+            return
+        self.wall_time += self._clock() - self._started_at
+        self._started_at = None
+        while self._patched:
+            owner, attribute, original = self._patched.pop()
+            setattr(owner, attribute, original)
+
+    def _instrument(self, owner: type, attribute: str, phase: str) -> None:
+        original = owner.__dict__[attribute]
+        profiler = self
+
+        @wraps(original)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            return profiler._call(phase, original, args, kwargs)
+
+        setattr(owner, attribute, timed)
+        self._patched.append((owner, attribute, original))
+
+    def _call(self, phase: str, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        self._stack.append(phase)
+        self._child_time.append(0.0)
+        start = self._clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = self._clock() - start
+            own = elapsed - self._child_time.pop()
+            key = tuple(self._stack)
+            self._stack.pop()
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases[phase] = PhaseStats()
+            stats.calls += 1
+            stats.own += own
+            if phase not in self._stack:  # recursive calls are already counted by the outer frame
+                stats.total += elapsed
+            self.stacks[key] = self.stacks.get(key, 0.0) + own
+            if self._child_time:
+                self._child_time[-1] += elapsed
+
+    def summary(self) -> dict:
+        return {
+            "wall_time": self.wall_time,
+            "phases": {
+                name: {
+                    "calls": stats.calls,
+                    "total": stats.total,
+                    "self": stats.own,
+                    "mean": stats.mean,
+                }
+                for name, stats in sorted(self.phases.items(), key=lambda item: -item[1].total)
+            },
+        }
+
+    def format_table(self) -> str:
+        lines = [
+            f"{'phase':<20} {'calls':>10} {'total s':>10} {'self s':>10} {'mean us':>10} {'% wall':>7}"
+        ]
+        for name, stats in sorted(self.phases.items(), key=lambda item: -item[1].total):
+            share = 100.0 * stats.total / self.wall_time if self.wall_time else 0.0
+            lines.append(
+                f"{name:<20} {stats.calls:>10} {stats.total:>10.4f} {stats.own:>10.4f} "
+                f"{stats.mean * 1e6:>10.2f} {share:>6.1f}%"
+            )
+        lines.append(f"{'wall':<20} {'':>10} {self.wall_time:>10.4f}")
+        return "\n".join(lines)
+
+    def format_json(self) -> str:
+        return json.dumps(self.summary(), indent=2)
+
+    def collapsed_stacks(self) -> List[str]:
+        """Return ``frame;frame value`` lines (microseconds) for flame graph tools."""
+
+        return [
+            f"{';'.join(stack)} {int(round(seconds * 1e6))}"
+            for stack, seconds in sorted(self.stacks.items())
+        ]
@@ -1,13 +1,31 @@
-"""Rendering utilities for Langton ant simulations."""
+"""Rendering utilities for Langton ant simulations.
+
+The Matplotlib backend is imported on first attribute access so that
+``import ant.renderers`` (and every ASCII or headless run) does not pay
+Matplotlib's import cost.
+"""
+from __future__ import annotations
+
+from typing import Any
+
 from ant.renderers.ascii import AsciiRenderer
+from ant.renderers.headless import HeadlessRunner
 from ant.renderers.live import LiveAsciiRunner
 
-try:  # pragma: no cover - optional dependency import
-    from ant.renderers.mpl import MatplotlibAnimator, run_matplotlib
-except ImportError:  # pragma: no cover - matplotlib not installed
-    MatplotlibAnimator = None  # type: ignore[assignment]
-    run_matplotlib = None  # type: ignore[assignment]
+_LAZY_MPL = ("MatplotlibAnimator", "run_matplotlib")
+
+__all__ = ["AsciiRenderer", "HeadlessRunner", "LiveAsciiRunner", *_LAZY_MPL]
+
 
-__all__ = ["AsciiRenderer", "LiveAsciiRunner"]
-if MatplotlibAnimator is not None:  # pragma: no cover - conditional export
-    __all__.extend(["MatplotlibAnimator", "run_matplotlib"])
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_MPL:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    try:
+        from ant.renderers import mpl
+    except ImportError:  # pragma: no cover - matplotlib not installed
+        value = None
+    else:
+        value = getattr(mpl, name)
+    globals()[name] = value
+    return value
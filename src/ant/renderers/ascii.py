@@ -1,7 +1,7 @@
 """ASCII renderer for Langton ant simulations."""
 from __future__ import annotations
 
-from typing import Dict, Tuple
+from typing import Dict, Sequence
 
 from ant.core.direction import Heading
 from ant.core.simulation import Simulation
@@ -32,33 +32,37 @@ _HEADING_SYMBOL = {
 }
 
 
+# Cell color i is drawn as DEFAULT_PALETTE[i]; colors past the end reuse it cyclically.
+DEFAULT_PALETTE = "_#" + "23456789" + "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
 class AsciiRenderer:
     """Renders simulation state as a grid of ASCII characters."""
 
-    def __init__(self, use_color: bool = True) -> None:
+    def __init__(self, use_color: bool = True, palette: Sequence[str] = DEFAULT_PALETTE) -> None:
+        if not palette:
+            msg = "palette must contain at least one symbol"
+            raise ValueError(msg)
         self.use_color = use_color
+        self.palette = palette
 
     def render(self, simulation: Simulation) -> str:
-        ant_positions: Dict[Tuple[int, int], int] = {
-            (ant.x, ant.y): ant.ant_id for ant in simulation.ants
-        }
-        ant_by_id = {ant.ant_id: ant for ant in simulation.ants}
-
+        ants = simulation.ants
         lines = [f"steps={simulation.steps_executed}"]
         for y in range(simulation.grid.height):
             cells = []
             for x in range(simulation.grid.width):
-                symbol = "_"
+                state = simulation.grid.get_state(x, y)
+                symbol = self.palette[state % len(self.palette)]
                 color_code: str | None = None
-                if (x, y) in ant_positions:
-                    ant_id = ant_positions[(x, y)]
-                    ant = ant_by_id[ant_id]
+                ant = ants.at(x, y)
+                if ant is not None:
                     symbol = _HEADING_SYMBOL[ant.heading]
                     color_code = self._color_code(ant.trail_color)
                 else:
                     trail_id = simulation.grid.get_trail(x, y)
                     if trail_id is not None:
-                        ant = ant_by_id.get(trail_id)
+                        ant = ants.get(trail_id)
                         symbol = "."
                         if ant is not None:
                             color_code = self._color_code(ant.trail_color)
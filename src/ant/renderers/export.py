@@ -0,0 +1,207 @@
+"""Parallel GIF/MP4 export.
+
+:func:`export_parallel` splits the frame range into one contiguous segment
+per worker. A headless pass over the simulation produces the state at each
+segment boundary, and every segment is handed to a worker process as soon
+as its start state is known, so drawing overlaps with the pass itself.
+Workers draw and encode their segment into a file of its own. The segments
+are then stitched together: MP4 parts with FFmpeg's concat demuxer (no
+re-encoding), GIF parts by splicing their frame blocks into one file.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+from ant.core.simulation import Simulation
+
+
+def export_parallel(
+    simulation: Simulation,
+    path: str | Path,
+    *,
+    steps: int,
+    steps_per_frame: int = 1,
+    jobs: int | None = None,
+    writer: str = "pillow",
+    fps: int = 15,
+    **animator_options: object,
+) -> int:
+    """Render ``steps`` steps to ``path`` using ``jobs`` processes and return the frame count.
+
+    Frame ``i`` shows the state after ``(i + 1) * steps_per_frame`` steps (the
+    last one after exactly ``steps``). ``writer`` must be a Pillow (GIF) or
+    FFmpeg (MP4) Matplotlib writer. ``animator_options`` are passed to
+    :class:`~ant.renderers.mpl.MatplotlibAnimator`. The simulation itself ends
+    at ``steps`` steps further on.
+    """
+
+    if steps < 0 or steps_per_frame <= 0:
+        msg = "steps must be non-negative and steps_per_frame positive"
+        raise ValueError(msg)
+    if "pillow" not in writer and "ffmpeg" not in writer:
+        msg = f"Parallel export supports the pillow (GIF) and ffmpeg (MP4) writers, not {writer!r}"
+        raise ValueError(msg)
+    if simulation.stats is not None or simulation.recorder is not None or simulation.snapshots is not None:
+        msg = "Cannot export in parallel while statistics, snapshots or a recorder are attached"
+        raise ValueError(msg)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 0:
+        msg = "jobs must be a positive integer"
+        raise ValueError(msg)
+    path = Path(path)
+    frames = -(-steps // steps_per_frame)
+    segments = _segments(frames, jobs)
+    options = dict(animator_options, steps_per_frame=steps_per_frame)
+    start = simulation.steps_executed
+    if len(segments) <= 1:
+        _render_segment(simulation, frames, steps, options, path, writer, fps)
+        return frames
+
+    with tempfile.TemporaryDirectory(prefix="ant-export-") as workdir:
+        parts = [Path(workdir) / f"part{index:04d}{path.suffix}" for index in range(len(segments))]
+        with ProcessPoolExecutor(max_workers=len(segments)) as pool:
+            futures = []
+            for (first, count), part in zip(segments, parts):
+                simulation.run(start + first * steps_per_frame - simulation.steps_executed)
+                # Pickle now: the pool serializes arguments lazily, after later runs.
+                state = pickle.dumps(simulation)
+                remaining = steps - first * steps_per_frame
+                futures.append(
+                    pool.submit(_render_pickled, state, count, remaining, options, part, writer, fps)
+                )
+            simulation.run(start + steps - simulation.steps_executed)
+            for future in futures:
+                future.result()
+        if "ffmpeg" in writer:
+            _concat_mp4(parts, path, workdir)
+        else:
+            concat_gifs(parts, path)
+    return frames
+
+
+def _segments(frames: int, jobs: int) -> List[Tuple[int, int]]:
+    """Split ``frames`` into at most ``jobs`` contiguous ``(first, count)`` ranges."""
+
+    jobs = max(1, min(jobs, frames))
+    bounds = [index * frames // jobs for index in range(jobs + 1)]
+    return [(first, last - first) for first, last in zip(bounds, bounds[1:]) if last > first]
+
+
+def _render_pickled(state: bytes, *args: object) -> None:
+    from matplotlib import pyplot as plt
+
+    plt.switch_backend("Agg")  # workers never open windows
+    _render_segment(pickle.loads(state), *args)
+
+
+def _render_segment(
+    simulation: Simulation,
+    count: int,
+    steps: int,
+    options: dict,
+    path: Path,
+    writer: str,
+    fps: int,
+) -> None:
+    """Draw ``count`` frames, advancing at most ``steps`` steps, and encode them to ``path``."""
+
+    from matplotlib import pyplot as plt
+    from matplotlib.animation import writers
+
+    from ant.renderers.mpl import MatplotlibAnimator
+
+    animator = MatplotlibAnimator(simulation, **options)
+    stride = animator.steps_per_frame
+    encoder = writers[writer](fps=fps)
+    figure = animator._figure
+    try:
+        with encoder.saving(figure, str(path), figure.dpi):
+            for _ in range(count):
+                animator.advance(min(stride, steps))
+                steps -= min(stride, steps)
+                encoder.grab_frame()
+    finally:
+        plt.close(figure)
+
+
+def _concat_mp4(parts: List[Path], path: Path, workdir: str) -> None:
+    from matplotlib import rcParams
+
+    listing = Path(workdir) / "parts.txt"
+    listing.write_text("".join(f"file '{part}'\n" for part in parts))
+    command = [rcParams["animation.ffmpeg_path"], "-y", "-loglevel", "error", "-f", "concat", "-safe", "0"]
+    subprocess.run([*command, "-i", str(listing), "-c", "copy", str(path)], check=True)
+
+
+def concat_gifs(parts: List[Path], path: str | Path) -> None:
+    """Join GIF files of equal size into one animation without re-encoding any frame.
+
+    The first file supplies the header and loop settings. Frames of the
+    later files get their file's global color table as a local one.
+    """
+
+    with open(path, "wb") as out:
+        for index, part in enumerate(parts):
+            header, frames = _split_gif(Path(part).read_bytes(), keep_loop=index == 0)
+            if index == 0:
+                out.write(header)
+            out.writelines(frames)
+        out.write(b";")
+
+
+def _split_gif(data: bytes, *, keep_loop: bool) -> Tuple[bytes, List[bytes]]:
+    """Return a GIF's header (with its global color table) and its self-contained frames."""
+
+    if data[:6] not in (b"GIF87a", b"GIF89a"):
+        msg = "Not a GIF file"
+        raise ValueError(msg)
+    screen = data[10]
+    position = 13
+    colors = b""
+    if screen & 0x80:
+        colors = data[position : position + 3 * (2 << (screen & 7))]
+        position += len(colors)
+    header = bytearray(data[:position])
+    frames: List[bytes] = []
+    pending = bytearray()
+    while data[position] != 0x3B:
+        introducer = data[position]
+        if introducer == 0x21:  # extension
+            end = _skip_sub_blocks(data, position + 2)
+            if data[position + 1] == 0xFF and data[position + 3 : position + 14] == b"NETSCAPE2.0":
+                if keep_loop:
+                    header += data[position:end]
+            else:
+                pending += data[position:end]
+            position = end
+        elif introducer == 0x2C:  # image descriptor
+            descriptor = bytearray(data[position : position + 10])
+            position += 10
+            flags = descriptor[9]
+            if flags & 0x80:
+                table = data[position : position + 3 * (2 << (flags & 7))]
+                position += len(table)
+            else:
+                table = colors
+                if colors:
+                    descriptor[9] = (flags & ~0x07) | 0x80 | (screen & 7)
+            end = _skip_sub_blocks(data, position + 1)  # LZW code size, then image data
+            frames.append(bytes(pending + descriptor + table + data[position:end]))
+            pending.clear()
+            position = end
+        else:
+            msg = f"Malformed GIF block 0x{introducer:02x} at byte {position}"
+            raise ValueError(msg)
+    return bytes(header), frames
+
+
+def _skip_sub_blocks(data: bytes, position: int) -> int:
+    while data[position]:
+        position += data[position] + 1
+    return position + 1
@@ -0,0 +1,114 @@
+"""Compute-only runner that reports progress instead of drawing frames."""
+from __future__ import annotations
+
+import signal
+import sys
+import time
+from io import TextIOBase
+from typing import Callable, Optional
+
+from ant.core.simulation import Simulation
+
+# Steps run between clock and interrupt checks are sized to take about this long.
+_CHUNK_SECONDS = 0.05
+
+
+def format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+class HeadlessRunner:
+    """Advances a simulation at engine speed, printing progress every ``report_interval`` seconds.
+
+    SIGINT (Ctrl+C) stops the run after the current batch of steps, so the
+    simulation is always left between two whole steps; a second SIGINT
+    interrupts immediately.
+    """
+
+    def __init__(
+        self,
+        simulation: Simulation,
+        *,
+        report_interval: float = 1.0,
+        stream: Optional[TextIOBase] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if report_interval < 0:
+            msg = "report_interval must be non-negative"
+            raise ValueError(msg)
+        self.simulation = simulation
+        self.report_interval = report_interval
+        self.stream = stream or sys.stderr
+        self.clock = clock
+        self.steps_done = 0
+        self.elapsed = 0.0
+        self.interrupted = False
+
+    def stop(self) -> None:
+        """Ask a running :meth:`run` to return after the current batch."""
+
+        self.interrupted = True
+
+    def run(self, total_steps: int) -> bool:
+        """Run ``total_steps`` steps; return ``False`` if stopped early."""
+
+        if total_steps < 0:
+            msg = "total_steps must be non-negative"
+            raise ValueError(msg)
+        self.steps_done = 0
+        self.interrupted = False
+        previous = self._install_handler()
+        start = self.clock()
+        next_report = start + self.report_interval
+        chunk = 1
+        try:
+            while self.steps_done < total_steps and not self.interrupted:
+                batch = min(chunk, total_steps - self.steps_done)
+                before = self.clock()
+                self.simulation.run(batch)
+                now = self.clock()
+                self.steps_done += batch
+                spent = now - before
+                chunk = max(1, min(chunk * 2, int(batch * _CHUNK_SECONDS / spent))) if spent > 0 else chunk * 2
+                if self.report_interval and now >= next_report and self.steps_done < total_steps:
+                    self._report(total_steps, now - start)
+                    next_report = now + self.report_interval
+        finally:
+            self.elapsed = self.clock() - start
+            if previous is not None:
+                signal.signal(signal.SIGINT, previous)
+        self._summary(total_steps)
+        return not self.interrupted
+
+    def _install_handler(self):
+        def handle(_signum, _frame) -> None:
+            if self.interrupted:
+                raise KeyboardInterrupt
+            self.stop()
+
+        try:
+            return signal.signal(signal.SIGINT, handle)
+        except ValueError:  # not the main thread; rely on stop()
+            return None
+
+    def _rate(self, elapsed: float) -> float:
+        return self.steps_done / elapsed if elapsed > 0 else 0.0
+
+    def _report(self, total_steps: int, elapsed: float) -> None:
+        rate = self._rate(elapsed)
+        eta = format_duration((total_steps - self.steps_done) / rate) if rate else "?"
+        self.stream.write(
+            f"step {self.simulation.steps_executed:,}  {self.steps_done / total_steps:6.1%}  "
+            f"{rate:,.0f} steps/s  ETA {eta}\n"
+        )
+        self.stream.flush()
+
+    def _summary(self, total_steps: int) -> None:
+        verb = "Interrupted after" if self.interrupted else "Finished"
+        self.stream.write(
+            f"{verb} {self.steps_done:,}/{total_steps:,} steps in {self.elapsed:.2f}s "
+            f"({self._rate(self.elapsed):,.0f} steps/s); simulation at step {self.simulation.steps_executed:,}\n"
+        )
+        self.stream.flush()
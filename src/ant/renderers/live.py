@@ -8,6 +8,7 @@ from typing import Optional
 
 from ant.core.simulation import Simulation
 from ant.renderers.ascii import AsciiRenderer
+from ant.renderers.schedule import FrameSchedule, StrideSchedule
 
 _CLEAR_SEQUENCE = "\033[2J\033[H"
 
@@ -24,6 +25,7 @@ class LiveAsciiRunner:
         clear_screen: bool = True,
         stream: Optional[TextIOBase] = None,
         steps_per_frame: int = 1,
+        schedule: Optional[FrameSchedule] = None,
     ) -> None:
         if interval < 0:
             msg = "interval must be non-negative"
@@ -37,27 +39,25 @@ class LiveAsciiRunner:
         self.clear_screen = clear_screen
         self.stream = stream or sys.stdout
         self.steps_per_frame = steps_per_frame
+        self.schedule = schedule or StrideSchedule(steps_per_frame)
 
     def run(self, total_steps: Optional[int] = None) -> None:
-        """Render continuously, rendering once per batch of simulation steps."""
+        """Render continuously, once per frame of the schedule (every ``steps_per_frame`` steps by default)."""
 
         if total_steps is not None and total_steps < 0:
             msg = "total_steps must be non-negative"
             raise ValueError(msg)
 
         remaining = total_steps
+        elapsed = 0
         self._emit_frame()
         while True:
+            steps_this_frame = self.schedule.advance(self.simulation, elapsed, remaining)
+            if steps_this_frame == 0:
+                break
+            elapsed += steps_this_frame
             if remaining is not None:
-                if remaining == 0:
-                    break
-                steps_this_frame = min(self.steps_per_frame, remaining)
                 remaining -= steps_this_frame
-            else:
-                steps_this_frame = self.steps_per_frame
-
-            for _ in range(steps_this_frame):
-                self.simulation.step()
             if self.interval:
                 time.sleep(self.interval)
             self._emit_frame()
@@ -1,8 +1,10 @@
 """Matplotlib-based animation utilities for Langton ant simulations."""
 from __future__ import annotations
 
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 import warnings
 
 warnings.filterwarnings(
@@ -15,19 +17,57 @@ warnings.filterwarnings(
 import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.animation import FuncAnimation
-from matplotlib.colors import ListedColormap
+from matplotlib.colors import ListedColormap, LogNorm
 
 from ant.core.simulation import Simulation
+from ant.renderers.schedule import FrameSchedule
+
+LOD_MODES = ("any", "majority")
+_BAND_CELLS = 1 << 22  # grid cells converted to colormap indices at a time when reducing
+Region = Tuple[int, int, int, int, int, int]  # x0, x1, y0, y1, column block, row block
+
+
+def state_palette(states: int) -> list:
+    """Colors for cell states: white and black first, then evenly spaced ``viridis`` hues."""
+
+    colors: list = ["white", "black"][:states]
+    if states > 2:
+        cmap = plt.get_cmap("viridis")
+        colors.extend(cmap(index / (states - 3 or 1)) for index in range(states - 2))
+    return colors
 
 
 @dataclass
 class MatplotlibAnimator:
-    """Render a simulation using Matplotlib's animation tools."""
+    """Render a simulation using Matplotlib's animation tools.
+
+    With ``heatmap`` the simulation's visit counts are drawn over the grid on
+    a log scale (visit tracking is switched on if needed). A ``schedule``
+    replaces the fixed ``steps_per_frame`` stride and also draws the initial
+    state.
+
+    With ``blit`` (the default) the live window redraws only the grid image,
+    the heatmap and the step counter each frame, never the axes. Frames are
+    built into preallocated buffers: colormap indices in the smallest integer
+    type that holds them, then the RGBA pixels. While a window is shown, the
+    counter also reports the achieved frame rate (see :attr:`achieved_fps`).
+
+    ``lod`` draws only the visible part of the grid, reduced to the axes'
+    pixel size, and re-samples whenever the view is zoomed, panned or
+    resized. Each screen pixel then stands for a block of cells. ``"any"``
+    shows the highest colormap index in the block: an ant beats a trail,
+    and a trail beats the cell states. ``"majority"`` shows the most common
+    cell state, trail or ant of the block. ``None`` always draws every cell.
+    """
 
     simulation: Simulation
     frame_interval_ms: int = 100
     figure_size: tuple[int, int] | None = (6, 6)
     steps_per_frame: int = 1
+    heatmap: bool = False
+    schedule: Optional[FrameSchedule] = None
+    blit: bool = True
+    lod: Optional[str] = "any"
 
     def __post_init__(self) -> None:
         if self.frame_interval_ms < 0:
@@ -41,6 +81,9 @@ class MatplotlibAnimator:
         if self.steps_per_frame <= 0:
             msg = "steps_per_frame must be positive"
             raise ValueError(msg)
+        if self.lod is not None and self.lod not in LOD_MODES:
+            msg = f"lod must be None or one of {', '.join(LOD_MODES)}"
+            raise ValueError(msg)
 
         self._figure, self._axis = plt.subplots(figsize=self.figure_size)
         self._axis.set_title("Langton Ant Simulator")
@@ -49,31 +92,57 @@ class MatplotlibAnimator:
         self._axis.set_aspect("equal")
         self._axis.invert_yaxis()
 
+        states = self.simulation.rule.colors
         self._trail_indices = {
-            ant.ant_id: index for index, ant in enumerate(self.simulation.ants, start=2)
+            ant.ant_id: index for index, ant in enumerate(self.simulation.ants, start=states)
         }
         self._active_indices = {
             ant.ant_id: index
             for index, ant in enumerate(
-                self.simulation.ants, start=2 + len(self.simulation.ants)
+                self.simulation.ants, start=states + len(self.simulation.ants)
             )
         }
-        cmap_colors = ["white", "black"] + [
+        self._trail_ids = np.array(sorted(self._trail_indices), dtype=np.int64)
+        self._max_index = states + 2 * len(self.simulation.ants)
+        self._dtype = np.min_scalar_type(self._max_index)
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._trail_values = np.array(
+            [self._trail_indices[ant_id] for ant_id in self._trail_ids], dtype=self._dtype
+        )
+        cmap_colors = state_palette(states) + [
             ant.trail_color for ant in self.simulation.ants
         ]
         cmap_colors.extend(ant.trail_color for ant in self.simulation.ants)
         self._colormap = ListedColormap(cmap_colors)
-        self._max_index = 2 + 2 * len(self.simulation.ants)
-
-        initial_frame = self._build_frame()
-        self._image = self._axis.imshow(
-            initial_frame,
-            cmap=self._colormap,
-            vmin=0,
-            vmax=max(1, self._max_index),
-            interpolation="nearest",
-        )
+        # Colormap indices become RGBA through one lookup, which Matplotlib
+        # resamples much faster than an index image it has to normalize.
+        self._palette = self._colormap(np.arange(self._colormap.N), bytes=True)
+
+        grid = self.simulation.grid
+        self._region: Optional[Region] = None
+        full = (-0.5, grid.width - 0.5, grid.height - 0.5, -0.5)
+        self._image = self._axis.imshow(np.zeros((1, 1, 4), dtype=np.uint8), extent=full, interpolation="nearest")
+        self._axis.set_autoscale_on(False)  # extents follow the view, never the other way round
+        self._heatmap = None
+        if self.heatmap:
+            if self.simulation.visits is None:
+                self.simulation.track_visits()
+            self._heatmap = self._axis.imshow(
+                np.ma.masked_all((1, 1)),
+                extent=full,
+                cmap="inferno",
+                norm=LogNorm(vmin=1, vmax=2),
+                alpha=0.6,
+                interpolation="nearest",
+            )
+        self._render()
+        if self.lod is not None:
+            self._axis.callbacks.connect("xlim_changed", self._on_view_change)
+            self._axis.callbacks.connect("ylim_changed", self._on_view_change)
+            self._figure.canvas.mpl_connect("resize_event", self._on_view_change)
         self._steps_remaining: Optional[int] = None
+        self._frame_times: deque = deque(maxlen=32)
+        self._live = False
         self._annotation = self._axis.text(
             0.02,
             0.95,
@@ -86,21 +155,161 @@ class MatplotlibAnimator:
         )
         self._update_annotation()
 
+    def _buffer(self, name: str, shape: tuple, dtype: object) -> np.ndarray:
+        """A scratch array kept between frames and replaced only when the view changes shape."""
+
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = self._buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
+
     def _build_frame(self) -> np.ndarray:
-        data = np.zeros((self.simulation.grid.height, self.simulation.grid.width), dtype=int)
-        for y in range(self.simulation.grid.height):
-            for x in range(self.simulation.grid.width):
-                state = self.simulation.grid.get_state(x, y)
-                value = state
-                trail = self.simulation.grid.get_trail(x, y)
-                if trail is not None:
-                    value = self._trail_indices.get(trail, value)
-                data[y, x] = value
-
-        for ant in self.simulation.ants:
-            index = self._active_indices[ant.ant_id]
-            data[ant.y, ant.x] = index
-        return data
+        """Fill and return the reused full-resolution frame buffer (valid until the next call)."""
+
+        grid = self.simulation.grid
+        return self._fill(self._buffer("frame", (grid.height, grid.width), self._dtype), 0, 0)
+
+    def _fill(self, out: np.ndarray, x0: int, y0: int) -> np.ndarray:
+        """Write the colormap indices of the cells under ``out``, placed at ``(x0, y0)``."""
+
+        grid = self.simulation.grid
+        rows, columns = out.shape
+        window = np.s_[y0 : y0 + rows, x0 : x0 + columns]
+        np.copyto(out, grid.cell_array()[window], casting="unsafe")
+        owners, expiry = grid.trail_arrays()
+        live = expiry[window] > grid.clock
+        trail_rows = np.flatnonzero(live.any(axis=1))  # trails hug the ants: skip the empty rows cheaply
+        trail_y, trail_x = np.nonzero(live[trail_rows])
+        if trail_y.size:
+            trail_y = trail_rows[trail_y]
+            trail_ids = owners[window][trail_y, trail_x]
+            known = np.isin(trail_ids, self._trail_ids)
+            out[trail_y[known], trail_x[known]] = self._trail_lookup(trail_ids[known])
+
+        ants = self.simulation.ants.arrays()
+        xs, ys, ids = ants["x"], ants["y"], ants["id"]
+        if (rows, columns) != (grid.height, grid.width):
+            inside = (xs >= x0) & (xs < x0 + columns) & (ys >= y0) & (ys < y0 + rows)
+            xs, ys, ids = xs[inside], ys[inside], ids[inside]
+        out[ys - y0, xs - x0] = self._trail_lookup(ids) + len(self._trail_indices)
+        return out
+
+    def _visible_region(self) -> Region:
+        """The cells in view, widened to whole blocks, with the block size fitting the axes' pixels."""
+
+        grid = self.simulation.grid
+        if self.lod is None:
+            return 0, grid.width, 0, grid.height, 1, 1
+        if self._region is None:  # first frame: the limits are not set up yet
+            left, right, top, bottom = -0.5, grid.width - 0.5, -0.5, grid.height - 0.5
+        else:
+            left, right = sorted(self._axis.get_xlim())
+            top, bottom = sorted(self._axis.get_ylim())
+        x0, x1 = max(0, int(np.floor(left + 0.5))), min(grid.width, int(np.ceil(right + 0.5)))
+        y0, y1 = max(0, int(np.floor(top + 0.5))), min(grid.height, int(np.ceil(bottom + 0.5)))
+        if x1 <= x0 or y1 <= y0:  # panned off the grid
+            x0, x1, y0, y1 = 0, 1, 0, 1
+        bbox = self._axis.bbox
+        block_x = max(1, -(-(x1 - x0) // max(1, int(bbox.width))))
+        block_y = max(1, -(-(y1 - y0) // max(1, int(bbox.height))))
+        x0, y0 = x0 - x0 % block_x, y0 - y0 % block_y  # whole blocks keep panning from shimmering
+        return x0, x1, y0, y1, block_x, block_y
+
+    def _build_view(self, region: Region) -> np.ndarray:
+        """Colormap indices of ``region``, one per block of cells."""
+
+        x0, x1, y0, y1, block_x, block_y = region
+        columns = x1 - x0
+        if block_x == block_y == 1:
+            return self._fill(self._buffer("view", (y1 - y0, columns), self._dtype), x0, y0)
+        view = self._buffer("view", (-(-(y1 - y0) // block_y), -(-columns // block_x)), self._dtype)
+        band_rows = block_y * max(1, _BAND_CELLS // (block_y * columns))
+        band = self._buffer("band", (min(band_rows, y1 - y0), columns), self._dtype)
+        column_starts = np.arange(0, columns, block_x)
+        for start in range(y0, y1, band_rows):
+            part = self._fill(band[: min(band_rows, y1 - start)], x0, start)
+            first = (start - y0) // block_y
+            reduced = self._reduce(part, np.arange(0, len(part), block_y), column_starts)
+            view[first : first + len(reduced)] = reduced
+        return view
+
+    def _reduce(self, part: np.ndarray, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """Reduce each block of ``part`` (starting at ``rows`` x ``columns``) to one colormap index."""
+
+        highest = np.maximum.reduceat(np.maximum.reduceat(part, rows, axis=0), columns, axis=1)
+        if self.lod == "any":
+            return highest
+
+        def count(mask: np.ndarray) -> np.ndarray:
+            return np.add.reduceat(np.add.reduceat(mask, rows, axis=0, dtype=np.int32), columns, axis=1)
+
+        states = self.simulation.rule.colors
+        ants_from = states + len(self._trail_indices)
+        trails = (part >= states) & (part < ants_from)
+        votes = [count(part == state) for state in range(states)]
+        votes += [count(trails), count(part >= ants_from)]
+        winner = np.argmax(votes, axis=0)
+        trail_value = np.maximum.reduceat(
+            np.maximum.reduceat(np.where(trails, part, 0), rows, axis=0), columns, axis=1
+        )
+        return np.where(winner < states, winner, np.where(winner == states, trail_value, highest)).astype(
+            part.dtype
+        )
+
+    def _render(self) -> None:
+        """Draw the current state of the visible region into the image (and heatmap)."""
+
+        region = self._visible_region()
+        self._region = region
+        view = self._build_view(region)
+        x0, x1, y0, y1, block_x, block_y = region
+        extent = (
+            x0 - 0.5,
+            x0 + view.shape[1] * block_x - 0.5,
+            y0 + view.shape[0] * block_y - 0.5,
+            y0 - 0.5,
+        )
+        self._image.set_data(self._colorize(view))
+        self._image.set_extent(extent)
+        if self._heatmap is not None:
+            self._update_heatmap(region)
+            self._heatmap.set_extent(extent)
+
+    def _on_view_change(self, _event: object) -> None:
+        if self._region is not None and self._visible_region() != self._region:
+            self._render()
+
+    def _colorize(self, frame: np.ndarray) -> np.ndarray:
+        rgba = self._buffer("rgba", frame.shape + (4,), np.uint8)
+        return np.take(self._palette, frame, axis=0, out=rgba)
+
+    def _update_heatmap(self, region: Region) -> None:
+        x0, x1, y0, y1, block_x, block_y = region
+        counts = self.simulation.visits.count_array()[y0:y1, x0:x1]
+        if block_x > 1 or block_y > 1:
+            rows, columns = np.arange(0, y1 - y0, block_y), np.arange(0, x1 - x0, block_x)
+            counts = np.maximum.reduceat(np.maximum.reduceat(counts, rows, axis=0), columns, axis=1)
+        self._heatmap.set_data(np.ma.masked_equal(counts, 0, copy=False))
+        self._heatmap.set_clim(1, max(2, int(counts.max())))
+
+    def _trail_lookup(self, ids: np.ndarray) -> np.ndarray:
+        """Map ant ids (all known) to their trail colormap indices."""
+
+        order = np.searchsorted(self._trail_ids, ids)
+        return self._trail_values[order]
+
+    @property
+    def achieved_fps(self) -> Optional[float]:
+        """Frames per second over the last few drawn frames, or ``None`` before two frames."""
+
+        if len(self._frame_times) < 2:
+            return None
+        elapsed = self._frame_times[-1] - self._frame_times[0]
+        return (len(self._frame_times) - 1) / elapsed if elapsed > 0 else None
+
+    def _draw_frame(self, steps: int) -> List[plt.Artist]:
+        self._frame_times.append(time.perf_counter())
+        return self.advance(steps)
 
     def _update(self, _frame_index: int) -> List[plt.Artist]:
         if self._steps_remaining is None:
@@ -111,14 +320,20 @@ class MatplotlibAnimator:
             else:
                 steps_to_run = min(self.steps_per_frame, self._steps_remaining)
 
-        for _ in range(steps_to_run):
-            self.simulation.step()
-            if self._steps_remaining is not None:
-                self._steps_remaining -= 1
-        frame = self._build_frame()
-        self._image.set_data(frame)
+        if self._steps_remaining is not None:
+            self._steps_remaining -= steps_to_run
+        return self._draw_frame(steps_to_run)
+
+    def advance(self, steps: int) -> List[plt.Artist]:
+        """Run ``steps`` simulation steps and redraw; return the artists that changed."""
+
+        self.simulation.run(steps)
+        self._render()
         self._update_annotation()
-        return [self._image]
+        artists: List[plt.Artist] = [self._image, self._annotation]  # blitting draws them by zorder
+        if self._heatmap is not None:
+            artists.append(self._heatmap)
+        return artists
 
     def create_animation(self, steps: int | None = None) -> FuncAnimation:
         """Create a FuncAnimation for the current simulation."""
@@ -126,6 +341,17 @@ class MatplotlibAnimator:
             msg = "steps must be non-negative"
             raise ValueError(msg)
         self._steps_remaining = steps
+        if self.schedule is not None:
+            return FuncAnimation(
+                self._figure,
+                lambda _elapsed: self._draw_frame(0),
+                frames=self._scheduled_frames,
+                interval=self.frame_interval_ms,
+                init_func=self._init_frame,
+                blit=self.blit,
+                repeat=False,
+                cache_frame_data=False,
+            )
         if steps is not None:
             frames = max(0, (steps + self.steps_per_frame - 1) // self.steps_per_frame)
         else:
@@ -134,19 +360,40 @@ class MatplotlibAnimator:
             self._figure,
             self._update,
             frames=frames,
+            init_func=self._init_frame,
             interval=self.frame_interval_ms,
-            blit=False,
+            blit=self.blit,
             repeat=steps is None,
         )
         if getattr(animation, "_save_count", 0) == 0:  # pragma: no cover - attribute contract
             animation._save_count = 1
         return animation
 
+    def _init_frame(self) -> List[plt.Artist]:
+        # Without an init function Matplotlib draws (and so runs) the first frame to set up blitting.
+        return self.advance(0)
+
+    def _scheduled_frames(self) -> Iterator[int]:
+        """Yield the elapsed step count of each frame, running the simulation up to it."""
+
+        elapsed = 0
+        yield elapsed
+        while True:
+            steps = self.schedule.advance(self.simulation, elapsed, self._steps_remaining)
+            if not steps:
+                return
+            elapsed += steps
+            if self._steps_remaining is not None:
+                self._steps_remaining -= steps
+            yield elapsed
+
     def _update_annotation(self) -> None:
         topology_label = self._topology_label()
-        self._annotation.set_text(
-            f"steps: {self.simulation.steps_executed}\ntopology: {topology_label}"
-        )
+        text = f"steps: {self.simulation.steps_executed}\ntopology: {topology_label}"
+        fps = self.achieved_fps if self._live else None
+        if fps is not None:
+            text += f"\nfps: {fps:.1f}"
+        self._annotation.set_text(text)
 
     def _topology_label(self) -> str:
         topo_name = self.simulation.topology.__class__.__name__
@@ -166,11 +413,19 @@ class MatplotlibAnimator:
 
         animation = self.create_animation(steps)
         if save_path:
-            animation.save(save_path, **(save_kwargs or {}))
+            self._save(animation, save_path, save_kwargs)
         if show:
-            plt.show()
+            self._frame_times.clear()
+            self._live = True
+            try:
+                plt.show()
+            finally:
+                self._live = False
         return animation
 
+    def _save(self, animation: FuncAnimation, save_path: str, save_kwargs: dict | None) -> None:
+        animation.save(save_path, **(save_kwargs or {}))
+
 
 def run_matplotlib(
     simulation: Simulation,
@@ -178,6 +433,10 @@ def run_matplotlib(
     steps: int | None = None,
     interval_ms: int = 100,
     steps_per_frame: int = 1,
+    heatmap: bool = False,
+    schedule: FrameSchedule | None = None,
+    blit: bool = True,
+    lod: str | None = "any",
     show: bool = True,
     save_path: str | None = None,
     save_kwargs: dict | None = None,
@@ -188,6 +447,10 @@ def run_matplotlib(
         simulation=simulation,
         frame_interval_ms=interval_ms,
         steps_per_frame=steps_per_frame,
+        heatmap=heatmap,
+        schedule=schedule,
+        blit=blit,
+        lod=lod,
     )
     return animator.run(
         steps,
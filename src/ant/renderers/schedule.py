@@ -0,0 +1,216 @@
+"""Frame schedules: which steps of a run get rendered.
+
+A schedule advances the simulation straight to its next frame with
+:meth:`Simulation.run <ant.core.simulation.Simulation.run>`, so the steps in
+between cost nothing beyond the engine itself. Specs accepted by
+:func:`parse_schedule` (and ``--frame-schedule``):
+
+``every:N``          a frame every N steps (the classic ``--steps-per-frame``)
+``log:N``            N frames spaced geometrically over the run
+``geom:R``           frames at steps 1, R, R², … (for runs without an end)
+``steps:A,B,...``    frames at the listed steps
+``change:METRIC``    a frame whenever ``bbox`` or ``colored`` changes,
+                     checked every K steps with ``change:bbox,every=K``
+                     and forced after N unchanged steps with ``max_gap=N``
+
+The ``change:`` metrics read the counters of
+:class:`~ant.core.stats.RunStatistics`, which cost O(1) per check; attach
+them with :meth:`Simulation.track_statistics
+<ant.core.simulation.Simulation.track_statistics>` first. A change schedule
+never runs unbounded: without a step limit it needs ``max_gap``.
+
+Steps count from where the runner started. When a run ends between two
+scheduled steps, its final state gets a frame of its own.
+"""
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ant.core.simulation import Simulation
+    from ant.core.stats import RunStatistics
+
+
+class FrameSchedule:
+    """Base class: :meth:`next_frame` picks the step of the frame after ``elapsed``."""
+
+    def next_frame(self, elapsed: int) -> Optional[int]:
+        raise NotImplementedError
+
+    def advance(self, simulation: "Simulation", elapsed: int, limit: Optional[int] = None) -> int:
+        """Run ``simulation`` to the next frame and return the steps taken (0 once finished).
+
+        ``elapsed`` counts the steps run since the schedule started and
+        ``limit`` caps the steps still allowed.
+        """
+
+        target = self.next_frame(elapsed)
+        if target is None:
+            return 0
+        steps = target - elapsed
+        if limit is not None:
+            steps = min(steps, limit)
+        simulation.run(steps)
+        return steps
+
+
+class StrideSchedule(FrameSchedule):
+    """A frame every ``stride`` steps."""
+
+    def __init__(self, stride: int) -> None:
+        if stride <= 0:
+            msg = "stride must be a positive integer"
+            raise ValueError(msg)
+        self.stride = stride
+
+    def next_frame(self, elapsed: int) -> int:
+        return elapsed + self.stride
+
+
+class StepListSchedule(FrameSchedule):
+    """Frames at an explicit, finite list of steps."""
+
+    def __init__(self, steps: Sequence[int]) -> None:
+        if any(step < 0 for step in steps):
+            msg = "Scheduled steps must be non-negative"
+            raise ValueError(msg)
+        self.steps = sorted(set(steps) - {0})
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def next_frame(self, elapsed: int) -> Optional[int]:
+        index = bisect.bisect_right(self.steps, elapsed)
+        return self.steps[index] if index < len(self.steps) else None
+
+    @classmethod
+    def logarithmic(cls, frames: int, total: int) -> "StepListSchedule":
+        """At most ``frames`` steps spaced geometrically from 1 to ``total``."""
+
+        if frames <= 0 or total < 0:
+            msg = "log schedules need a positive frame count and a non-negative run length"
+            raise ValueError(msg)
+        if frames == 1 or total <= 1:
+            return cls([total])
+        return cls([round(total ** (index / (frames - 1))) for index in range(frames)])
+
+
+class GeometricSchedule(FrameSchedule):
+    """Frames at steps ``first``, ``first * ratio``, … (always at least one step apart)."""
+
+    def __init__(self, ratio: float, first: int = 1) -> None:
+        if ratio <= 1 or first <= 0:
+            msg = "ratio must exceed 1 and first must be positive"
+            raise ValueError(msg)
+        self.ratio = ratio
+        self.first = first
+
+    def next_frame(self, elapsed: int) -> int:
+        target = self.first
+        while target <= elapsed:
+            target = max(target + 1, round(target * self.ratio))
+        return target
+
+
+class ChangeSchedule(FrameSchedule):
+    """A frame whenever ``key(simulation)`` changes, checked every ``every`` steps.
+
+    ``max_gap`` forces a frame after that many steps without a change; it is
+    required when :meth:`advance` gets no ``limit``. ``uses_statistics``
+    marks keys that read :attr:`Simulation.stats
+    <ant.core.simulation.Simulation.stats>`.
+    """
+
+    def __init__(
+        self,
+        key: Callable[["Simulation"], object],
+        *,
+        every: int = 1,
+        max_gap: Optional[int] = None,
+        uses_statistics: bool = False,
+    ) -> None:
+        if every <= 0 or (max_gap is not None and max_gap <= 0):
+            msg = "every and max_gap must be positive integers"
+            raise ValueError(msg)
+        self.key = key
+        self.every = every
+        self.max_gap = max_gap
+        self.uses_statistics = uses_statistics
+
+    def advance(self, simulation: "Simulation", elapsed: int, limit: Optional[int] = None) -> int:
+        if limit is None and self.max_gap is None:
+            msg = "A change schedule without a step limit needs max_gap, or it may never yield a frame"
+            raise ValueError(msg)
+        before = self.key(simulation)
+        taken = 0
+        while limit is None or taken < limit:
+            steps = self.every if limit is None else min(self.every, limit - taken)
+            simulation.run(steps)
+            taken += steps
+            if self.key(simulation) != before or (self.max_gap is not None and taken >= self.max_gap):
+                break
+        return taken
+
+
+def _statistics(simulation: "Simulation") -> "RunStatistics":
+    if simulation.stats is None:
+        msg = "change: metrics read run statistics; call simulation.track_statistics() first"
+        raise ValueError(msg)
+    return simulation.stats
+
+
+def explored_bbox(simulation: "Simulation") -> Optional[Tuple[int, int, int, int]]:
+    """Bounding box of the cells any ant has visited, or ``None`` before the first move."""
+
+    return _statistics(simulation).bbox
+
+
+def colored_cells(simulation: "Simulation") -> int:
+    """Number of non-white cells."""
+
+    return _statistics(simulation).black_cells
+
+
+METRICS: Dict[str, Callable[["Simulation"], object]] = {
+    "bbox": explored_bbox,
+    "colored": colored_cells,
+}
+
+
+def parse_schedule(spec: str, total: Optional[int] = None) -> FrameSchedule:
+    """Build a schedule from a spec such as ``log:200`` or ``change:bbox,every=100``.
+
+    ``total`` is the run length, which ``log:N`` needs (as does ``change:``
+    without ``max_gap``).
+    """
+
+    kind, _, rest = spec.partition(":")
+    kind = kind.strip().lower()
+    try:
+        if kind == "every":
+            return StrideSchedule(int(rest))
+        if kind == "log":
+            if total is None:
+                msg = "log schedules need a run length; use geom:RATIO for endless runs"
+                raise ValueError(msg)
+            return StepListSchedule.logarithmic(int(rest), total)
+        if kind == "geom":
+            return GeometricSchedule(float(rest))
+        if kind == "steps":
+            return StepListSchedule([int(step) for step in rest.split(",") if step.strip()])
+        if kind == "change":
+            metric, *options = [part.strip() for part in rest.split(",")]
+            settings = {name: int(value) for name, value in (option.split("=", 1) for option in options)}
+            if metric not in METRICS or set(settings) - {"every", "max_gap"}:
+                msg = f"Unknown change trigger {rest!r}; use {' or '.join(METRICS)} with every=K or max_gap=N"
+                raise ValueError(msg)
+            if total is None and "max_gap" not in settings:
+                msg = "change schedules need a run length or max_gap=N"
+                raise ValueError(msg)
+            return ChangeSchedule(METRICS[metric], uses_statistics=True, **settings)
+    except ValueError as exc:
+        msg = f"Invalid frame schedule {spec!r}: {exc}"
+        raise ValueError(msg) from None
+    msg = f"Unknown frame schedule {spec!r}; expected every:, log:, geom:, steps: or change:"
+    raise ValueError(msg)
@@ -0,0 +1,220 @@
+"""Out-of-process rendering through a shared-memory double buffer.
+
+The simulation process copies grid, trail and ant state into whichever of two
+slots the renderer is not reading and then marks it as the latest snapshot.
+It never blocks: if the only free slot is still pinned by a slow renderer the
+snapshot is skipped and the next one is attempted later. The renderer pins the
+latest complete slot and reads it in place through memoryviews, so a frame is
+never copied between processes.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+
+from ant.core.ants import AntStore
+from ant.core.grid import Grid
+from ant.core.simulation import Simulation
+
+# Control words: latest complete slot, slot pinned by the reader, done flag,
+# skipped publishes, then one sequence counter per slot (odd while writing).
+_LATEST, _PINNED, _DONE, _SKIPPED, _SEQ = range(5)
+_CONTROL_WORDS = _SEQ + 2
+_SLOT_HEADER_WORDS = 2  # clock, steps executed
+
+
+class SharedFrameBuffer:
+    """Two snapshot slots plus a control block in one shared-memory segment."""
+
+    def __init__(self, width: int, height: int, ant_count: int, *, name: str | None = None) -> None:
+        self.width = width
+        self.height = height
+        self.ant_count = ant_count
+        cells = width * height
+        self._words = _SLOT_HEADER_WORDS + 2 * cells + 2 * ant_count
+        self._bytes = cells + ant_count
+        padded = (self._bytes + 7) // 8 * 8
+        self._slot_size = 8 * self._words + padded
+        size = 8 * _CONTROL_WORDS + 2 * self._slot_size
+        self.owner = name is None
+        self._shm = SharedMemory(name=name, create=self.owner, size=size)
+        self._control = self._shm.buf[: 8 * _CONTROL_WORDS].cast("q")
+        if self.owner:
+            self._control[:] = memoryview(bytes(8 * _CONTROL_WORDS)).cast("q")
+            self._control[_LATEST] = -1
+            self._control[_PINNED] = -1
+        self._slots = [self._map_slot(index) for index in range(2)]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def attach(cls, name: str, width: int, height: int, ant_count: int) -> "SharedFrameBuffer":
+        return cls(width, height, ant_count, name=name)
+
+    def _map_slot(self, index: int) -> Tuple[memoryview, ...]:
+        base = 8 * _CONTROL_WORDS + index * self._slot_size
+        cells = self.width * self.height
+        words = self._shm.buf[base : base + 8 * self._words].cast("q")
+        raw = self._shm.buf[base + 8 * self._words : base + 8 * self._words + self._bytes]
+        ants = self.ant_count
+        return (
+            words[:_SLOT_HEADER_WORDS],
+            raw[:cells],
+            words[_SLOT_HEADER_WORDS : _SLOT_HEADER_WORDS + cells],
+            words[_SLOT_HEADER_WORDS + cells : _SLOT_HEADER_WORDS + 2 * cells],
+            words[_SLOT_HEADER_WORDS + 2 * cells : _SLOT_HEADER_WORDS + 2 * cells + ants],
+            words[_SLOT_HEADER_WORDS + 2 * cells + ants :],
+            raw[cells:],
+            words,
+            raw,
+        )
+
+    @property
+    def skipped(self) -> int:
+        return self._control[_SKIPPED]
+
+    @property
+    def done(self) -> bool:
+        return bool(self._control[_DONE])
+
+    def mark_done(self) -> None:
+        self._control[_DONE] = 1
+
+    def publish(self, simulation: Simulation) -> bool:
+        """Copy the simulation state into the free slot; return False if it was skipped."""
+
+        control = self._control
+        target = 1 if control[_LATEST] == 0 else 0
+        if control[_PINNED] == target:
+            control[_SKIPPED] += 1
+            return False
+        header, cells, owners, expiry, ant_x, ant_y, headings, _words, _raw = self._slots[target]
+        control[_SEQ + target] += 1
+        grid_cells, grid_owners, grid_expiry = simulation.grid.buffers()
+        cells[:] = grid_cells
+        owners[:] = grid_owners
+        expiry[:] = grid_expiry
+        header[0] = simulation.grid.clock
+        header[1] = simulation.steps_executed
+        store = simulation.ants
+        ant_x[:] = store.xs
+        ant_y[:] = store.ys
+        headings[:] = store.headings
+        control[_SEQ + target] += 1
+        control[_LATEST] = target
+        return True
+
+    def acquire(self) -> Optional[int]:
+        """Pin and return the latest complete slot, or None before the first publish."""
+
+        control = self._control
+        while True:
+            latest = control[_LATEST]
+            if latest < 0:
+                return None
+            control[_PINNED] = latest
+            if control[_LATEST] == latest and control[_SEQ + latest] % 2 == 0:
+                return latest
+
+    def grid_view(self, slot: int) -> Grid:
+        header, cells, owners, expiry = self._slots[slot][:4]
+        return Grid.over_buffers(self.width, self.height, cells, owners, expiry, clock=header[0])
+
+    def ant_state(self, slot: int) -> Tuple[int, List[Tuple[int, int, int]]]:
+        header, _cells, _owners, _expiry, ant_x, ant_y, headings = self._slots[slot][:7]
+        return header[1], list(zip(ant_x.tolist(), ant_y.tolist(), headings.tolist()))
+
+    def close(self) -> None:
+        for slot in self._slots:
+            for view in slot:
+                view.release()
+        self._slots = []
+        self._control.release()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+class SharedSnapshotView:
+    """Read-only stand-in for a :class:`Simulation`, backed by the latest shared snapshot.
+
+    Renderers call ``step``/``run`` to advance; here that only swaps in the
+    newest published state, so a slow renderer simply shows fewer frames.
+    """
+
+    def __init__(self, buffer: SharedFrameBuffer, template: Simulation, *, timeout: float = 10.0) -> None:
+        self.buffer = buffer
+        self.topology = template.topology
+        self.trail_lifetime = template.trail_lifetime
+        self.rule = template.rule
+        self.ants = AntStore(template.grid.width, template.grid.height, template.ants)
+        self.grid = template.grid
+        self.steps_executed = template.steps_executed
+        deadline = time.monotonic() + timeout
+        while not self.refresh():
+            if time.monotonic() > deadline:
+                msg = "No snapshot was published by the simulation process"
+                raise TimeoutError(msg)
+            time.sleep(0.005)
+
+    def refresh(self) -> bool:
+        slot = self.buffer.acquire()
+        if slot is None:
+            return False
+        self.grid = self.buffer.grid_view(slot)
+        self.steps_executed, states = self.buffer.ant_state(slot)
+        for slot, (x, y, heading) in enumerate(states):
+            self.ants.place(slot, x, y, heading)
+        return True
+
+    def step(self) -> None:
+        self.refresh()
+
+    def run(self, _steps: int) -> None:
+        self.refresh()
+
+
+def publish_simulation(
+    simulation: Simulation,
+    buffer_name: str,
+    steps: int | None,
+    steps_per_publish: int = 1,
+) -> None:
+    """Run ``simulation`` and publish a snapshot every ``steps_per_publish`` steps."""
+
+    grid = simulation.grid
+    buffer = SharedFrameBuffer.attach(buffer_name, grid.width, grid.height, len(simulation.ants))
+    try:
+        buffer.publish(simulation)
+        remaining = steps
+        while remaining is None or remaining > 0:
+            batch = steps_per_publish if remaining is None else min(steps_per_publish, remaining)
+            simulation.run(batch)
+            if remaining is not None:
+                remaining -= batch
+            buffer.publish(simulation)
+        while not buffer.publish(simulation):  # make sure the final state becomes visible
+            time.sleep(0.001)
+        buffer.mark_done()
+    finally:
+        buffer.close()
+
+
+def start_publisher(
+    simulation: Simulation,
+    buffer: SharedFrameBuffer,
+    *,
+    steps: int | None,
+    steps_per_publish: int = 1,
+) -> multiprocessing.Process:
+    process = multiprocessing.Process(
+        target=publish_simulation,
+        args=(simulation, buffer.name, steps, steps_per_publish),
+        daemon=True,
+    )
+    process.start()
+    return process
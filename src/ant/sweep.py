@@ -0,0 +1,99 @@
+"""Run many rules headlessly on a process pool and summarize each run.
+
+Every rule runs a single ant from the grid centre for a fixed number of steps;
+rules are shipped to workers as their text form and in chunks, so sweeps over
+thousands of rules spend their time simulating rather than pickling.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Iterator, Sequence
+
+from ant.core.direction import Heading
+from ant.core.rules import as_rule
+from ant.core.simulation import Ant, Simulation
+from ant.topology.base import Topology, TorusTopology
+
+Summary = Dict[str, object]
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """Grid and run length shared by every rule in a sweep."""
+
+    width: int = 128
+    height: int = 128
+    steps: int = 10_000
+    topology: Topology | None = None
+    cache_dir: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.width <= 0 or self.height <= 0:
+            msg = "Width and height must be positive integers"
+            raise ValueError(msg)
+        if self.steps < 0:
+            msg = "Steps must be non-negative"
+            raise ValueError(msg)
+
+
+def run_rule(spec: str, config: SweepConfig) -> Summary:
+    """Simulate one rule and return its summary row."""
+
+    import numpy as np
+
+    rule = as_rule(spec)
+    ant = Ant(ant_id=1, x=config.width // 2, y=config.height // 2, heading=Heading.NORTH, trail_color="red")
+    topology = config.topology or TorusTopology(config.width, config.height)
+    simulation = Simulation(config.width, config.height, [ant], topology, trail_lifetime=0, rule=rule)
+    if config.cache_dir is None:
+        simulation.run(config.steps)
+    else:
+        from ant.io.cache import ResultCache
+
+        ResultCache(config.cache_dir).advance(simulation, config.steps)
+
+    cells = simulation.grid.cell_array()
+    rows, columns = np.nonzero(cells)
+    if rows.size:
+        bbox_width = int(columns.max() - columns.min() + 1)
+        bbox_height = int(rows.max() - rows.min() + 1)
+    else:
+        bbox_width = bbox_height = 0
+    return {
+        "rule": rule.spec,
+        "states": rule.states,
+        "colors": rule.colors,
+        "steps": config.steps,
+        "colored_cells": int(rows.size),
+        "bbox_width": bbox_width,
+        "bbox_height": bbox_height,
+        "ant_x": ant.x,
+        "ant_y": ant.y,
+        "ant_state": ant.state,
+    }
+
+
+def sweep(
+    specs: Sequence[str],
+    config: SweepConfig,
+    *,
+    jobs: int | None = None,
+    chunksize: int | None = None,
+) -> Iterator[Summary]:
+    """Yield one summary per rule, in input order, using ``jobs`` worker processes."""
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 0:
+        msg = "jobs must be a positive integer"
+        raise ValueError(msg)
+    task = partial(run_rule, config=config)
+    if jobs == 1 or len(specs) <= 1:
+        yield from map(task, specs)
+        return
+    if chunksize is None:
+        chunksize = max(1, len(specs) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(task, specs, chunksize=chunksize)
@@ -0,0 +1,243 @@
+"""Sweep work queue kept in a shared directory.
+
+Workers on any host that mounts the directory claim rules one at a time,
+so a sweep scales with the number of machines without a scheduler::
+
+    <root>/config.json            grid, run length, topology, lease length
+    <root>/jobs/<id>.json         one rule per job
+    <root>/leases/<id>.<n>        claim number n on a job; its mtime is a heartbeat
+    <root>/results/<id>.json      summary row of a finished job
+    <root>/cache/                 shared result cache with power-of-two checkpoints
+
+A claim is an exclusively created lease file, which only one worker can
+win. The owner touches it while it works, and a lease whose mtime is older
+than the lease length belongs to a dead worker: any worker may then claim
+the job again with the next lease number. The new owner resumes from the
+checkpoints in the shared cache. Results are written atomically, so a
+late duplicate from a worker that was only slow is harmless.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from ant.sweep import Summary, SweepConfig, run_rule
+from ant.topology.base import TorusTopology, topology_from_spec, topology_spec
+
+DEFAULT_LEASE_SECONDS = 60.0
+
+
+def _write_json(path: Path, data: object) -> None:
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    temporary.write_text(json.dumps(data, sort_keys=True))
+    os.replace(temporary, path)
+
+
+class SweepQueue:
+    """A sweep whose jobs, leases and results live in the directory ``root``."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.jobs = self.root / "jobs"
+        self.leases = self.root / "leases"
+        self.results = self.root / "results"
+
+    @classmethod
+    def create(
+        cls,
+        root: str | Path,
+        config: SweepConfig,
+        *,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> "SweepQueue":
+        """Create (or reopen) a queue for ``config``; reopening needs the same settings."""
+
+        if lease_seconds <= 0:
+            msg = "lease_seconds must be positive"
+            raise ValueError(msg)
+        queue = cls(root)
+        for directory in (queue.jobs, queue.leases, queue.results):
+            directory.mkdir(parents=True, exist_ok=True)
+        settings = {
+            "width": config.width,
+            "height": config.height,
+            "steps": config.steps,
+            "topology": topology_spec(config.topology or TorusTopology(config.width, config.height)),
+            "lease_seconds": lease_seconds,
+        }
+        path = queue.root / "config.json"
+        try:
+            with open(path, "x") as handle:
+                json.dump(settings, handle, sort_keys=True)
+        except FileExistsError:
+            existing = json.loads(path.read_text())
+            if existing != settings:
+                msg = f"Queue {queue.root} was created with different settings: {existing}"
+                raise ValueError(msg) from None
+        return queue
+
+    def settings(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.root / "config.json").read_text())
+        except FileNotFoundError:
+            msg = f"{self.root} is not a sweep queue (no config.json)"
+            raise ValueError(msg) from None
+
+    def config(self) -> SweepConfig:
+        """The sweep settings every worker runs with, sharing the queue's checkpoint cache."""
+
+        settings = self.settings()
+        width, height = settings["width"], settings["height"]
+        return SweepConfig(
+            width=width,
+            height=height,
+            steps=settings["steps"],
+            topology=topology_from_spec(settings["topology"], width, height),
+            cache_dir=str(self.root / "cache"),
+        )
+
+    def submit(self, specs: Sequence[str]) -> List[str]:
+        """Add one job per rule and return their ids (which sort in submission order)."""
+
+        ids = []
+        number = len(self.job_ids())
+        for spec in specs:
+            while True:
+                job_id = f"{number:08d}"
+                number += 1
+                try:  # exclusive create: concurrent submitters never share an id
+                    with open(self.jobs / f"{job_id}.json", "x") as handle:
+                        json.dump({"rule": spec}, handle)
+                except FileExistsError:
+                    continue
+                break
+            ids.append(job_id)
+        return ids
+
+    def job_ids(self) -> List[str]:
+        return sorted(path.stem for path in self.jobs.glob("*.json"))
+
+    def done(self, job_id: str) -> bool:
+        return (self.results / f"{job_id}.json").exists()
+
+    def pending(self) -> List[str]:
+        """Ids of jobs without a result yet."""
+
+        finished = {path.stem for path in self.results.glob("*.json")}
+        return [job_id for job_id in self.job_ids() if job_id not in finished]
+
+    def claim(self, job_id: str, worker: str) -> Optional["Lease"]:
+        """Try to take ``job_id``; return the lease, or ``None`` if it is held or finished."""
+
+        lease_seconds = self.settings()["lease_seconds"]
+        numbers = [int(path.suffix[1:]) for path in self.leases.glob(f"{job_id}.*") if path.suffix[1:].isdigit()]
+        if numbers:
+            latest = self.leases / f"{job_id}.{max(numbers)}"
+            try:
+                if time.time() - latest.stat().st_mtime < lease_seconds:
+                    return None
+            except FileNotFoundError:  # cleaned up by a worker that just finished it
+                return None
+        if self.done(job_id):
+            return None
+        path = self.leases / f"{job_id}.{max(numbers, default=-1) + 1}"
+        try:
+            with open(path, "x") as handle:
+                handle.write(worker)
+        except FileExistsError:  # another worker won this claim
+            return None
+        return Lease(path, lease_seconds / 3)
+
+    def work(self, *, worker: str | None = None, poll: float = 1.0, wait: bool = True) -> int:
+        """Run jobs until every job has a result and return how many this worker ran.
+
+        With ``wait=False`` the worker stops as soon as nothing is claimable,
+        instead of waiting for jobs leased by others to finish or expire.
+        """
+
+        worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        config = self.config()
+        completed = 0
+        while True:
+            pending = self.pending()
+            if not pending:
+                return completed
+            claimed = False
+            for job_id in pending:
+                lease = self.claim(job_id, worker)
+                if lease is None:
+                    continue
+                claimed = True
+                with lease:
+                    rule = json.loads((self.jobs / f"{job_id}.json").read_text())["rule"]
+                    _write_json(self.results / f"{job_id}.json", run_rule(rule, config))
+                completed += 1
+                for stale in self.leases.glob(f"{job_id}.*"):
+                    stale.unlink(missing_ok=True)
+            if not claimed:
+                if not wait:
+                    return completed
+                time.sleep(poll)
+
+    def summaries(self) -> Iterator[Summary]:
+        """Yield the result of every finished job in submission order."""
+
+        for job_id in self.job_ids():
+            path = self.results / f"{job_id}.json"
+            if path.exists():
+                yield json.loads(path.read_text())
+
+    def status(self) -> Dict[str, int]:
+        jobs = self.job_ids()
+        pending = self.pending()
+        return {"jobs": len(jobs), "done": len(jobs) - len(pending), "pending": len(pending)}
+
+
+def _work(root: str, poll: float) -> int:
+    return SweepQueue(root).work(poll=poll)
+
+
+def run_workers(queue: SweepQueue, jobs: int, *, poll: float = 1.0) -> int:
+    """Work ``queue`` with ``jobs`` local worker processes and return the jobs they ran."""
+
+    if jobs <= 0:
+        msg = "jobs must be a positive integer"
+        raise ValueError(msg)
+    if jobs == 1:
+        return queue.work(poll=poll)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_work, str(queue.root), poll) for _ in range(jobs)]
+        return sum(future.result() for future in futures)
+
+
+class Lease:
+    """A claimed job; while entered, a background thread keeps the lease file fresh."""
+
+    def __init__(self, path: Path, heartbeat: float) -> None:
+        self.path = path
+        self.heartbeat = heartbeat
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "Lease":
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.heartbeat):
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:  # pragma: no cover - job finished elsewhere
+                return
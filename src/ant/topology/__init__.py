@@ -1,13 +1,41 @@
-"""Topology helpers for Langton ant simulations."""
-from ant.topology.base import Coordinates, Topology, TorusTopology
-from ant.topology.nonorientable import KleinBottleTopology, ProjectivePlaneTopology
-from ant.topology.orientable import SphereAdjacentPairsTopology
-
-__all__ = [
-    "Coordinates",
-    "Topology",
-    "TorusTopology",
-    "KleinBottleTopology",
-    "ProjectivePlaneTopology",
-    "SphereAdjacentPairsTopology",
-]
+"""Topology helpers for Langton ant simulations.
+
+Concrete topologies are imported on first access, so importing one of them
+does not load the others.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "Coordinates": "ant.topology.base",
+    "Topology": "ant.topology.base",
+    "TorusTopology": "ant.topology.base",
+    "GluedTopology": "ant.topology.base",
+    "topology_spec": "ant.topology.base",
+    "topology_from_spec": "ant.topology.base",
+    "CylinderTopology": "ant.topology.surfaces",
+    "MobiusStripTopology": "ant.topology.surfaces",
+    "PillowSphereTopology": "ant.topology.surfaces",
+    "KleinBottleTopology": "ant.topology.nonorientable",
+    "ProjectivePlaneTopology": "ant.topology.nonorientable",
+    "SphereAdjacentPairsTopology": "ant.topology.orientable",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,20 @@
 """Topology abstractions for Langton ant simulations."""
 from __future__ import annotations
 
+import importlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Tuple
+from functools import cached_property
+from typing import Any, Dict, Optional, Tuple
+
+from ant.topology.gluing import INWARD, SIDES, format_gluing, parse_gluing
+
+# Off-grid neighbour cell -> (x, y, heading code or None to keep the heading).
+EdgeTable = Dict[Tuple[int, int], Tuple[int, int, Optional[int]]]
+# Landing (x, y, heading code) of a crossing -> (x, y, heading code) of the step that made it.
+InverseEdgeTable = Dict[Tuple[int, int, int], Tuple[int, int, int]]
+
+_STEPS = ((0, -1), (1, 0), (0, 1), (-1, 0))  # unit step per heading code
 
 
 @dataclass(frozen=True)
@@ -28,9 +39,202 @@ class Topology(ABC):
     def wrap(self, x: int, y: int) -> Coordinates:
         """Return new coordinates after applying topology wrapping."""
 
+    def edge_table(self) -> EdgeTable:
+        """Tabulate where a unit step onto each off-grid neighbour cell lands.
+
+        The default derives positions from :meth:`wrap` and keeps the heading.
+        """
+
+        width, height = self.width, self.height
+        outside = [(x, y) for x in range(width) for y in (-1, height)]
+        outside += [(x, y) for y in range(height) for x in (-1, width)]
+        table: EdgeTable = {}
+        for x, y in outside:
+            wrapped = self.wrap(x, y)
+            table[(x, y)] = (wrapped.x, wrapped.y, None)
+        return table
+
+    @cached_property
+    def edges(self) -> EdgeTable:
+        return self.edge_table()
+
+    def cross(self, x: int, y: int, heading: int) -> Tuple[int, int, int]:
+        """Resolve a unit step with heading code ``heading`` onto the off-grid cell ``(x, y)``."""
+
+        new_x, new_y, new_heading = self.edges[(x, y)]
+        return new_x, new_y, heading if new_heading is None else new_heading
+
+    def inverse_edge_table(self) -> InverseEdgeTable:
+        """Tabulate which boundary crossing leaves an ant at each ``(x, y, heading)``.
+
+        Raises ``ValueError`` when two different moves end on the same cell with
+        the same heading, since walks on such a surface cannot be reversed.
+        """
+
+        width, height = self.width, self.height
+        table: InverseEdgeTable = {}
+        for (x, y), (new_x, new_y, new_heading) in self.edges.items():
+            heading = 0 if y < 0 else 2 if y >= height else 3 if x < 0 else 1
+            dx, dy = _STEPS[heading]
+            if new_heading is None:
+                new_heading = heading
+            landing = (new_x, new_y, new_heading)
+            back_dx, back_dy = _STEPS[new_heading]
+            if landing in table or (0 <= new_x - back_dx < width and 0 <= new_y - back_dy < height):
+                msg = (
+                    f"{type(self).__name__} is not reversible: several moves end at "
+                    f"({new_x}, {new_y}) with heading {new_heading}"
+                )
+                raise ValueError(msg)
+            table[landing] = (x - dx, y - dy, heading)
+        return table
+
+    @cached_property
+    def inverse_edges(self) -> InverseEdgeTable:
+        return self.inverse_edge_table()
+
+    def uncross(self, x: int, y: int, heading: int) -> Tuple[int, int, int]:
+        """Undo the crossing that left an ant on ``(x, y)`` with heading code ``heading``.
+
+        Returns the cell the ant stepped from and the heading it stepped with.
+        """
+
+        try:
+            return self.inverse_edges[(x, y, heading)]
+        except KeyError:
+            msg = f"No boundary crossing ends at ({x}, {y}) with heading {heading}"
+            raise ValueError(msg) from None
+
+
+class GluedTopology(Topology):
+    """Rectangle whose sides are identified by a gluing spec (see :mod:`ant.topology.gluing`).
+
+    With ``reorient`` an ant crossing a glued side leaves the partner side
+    heading straight inwards; otherwise it keeps its heading. Unglued sides are
+    walls: the ant stays put and turns around.
+    """
+
+    gluing = ""
+    reorient = True
 
-class TorusTopology(Topology):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        gluing: str | None = None,
+        *,
+        reorient: bool | None = None,
+    ) -> None:
+        super().__init__(width, height)
+        if gluing is not None:
+            self.gluing = gluing
+        if reorient is not None:
+            self.reorient = reorient
+        self.gluings = parse_gluing(self.gluing)
+        self._partners: Dict[str, Tuple[str, bool]] = {}
+        for gluing_ in self.gluings:
+            first, second = gluing_.first, gluing_.second
+            if self._length(first) != self._length(second):
+                msg = (
+                    f"Cannot glue {first} (length {self._length(first)}) "
+                    f"to {second} (length {self._length(second)})"
+                )
+                raise ValueError(msg)
+            self._partners[first] = (second, gluing_.reversed)
+            self._partners[second] = (first, gluing_.reversed)
+
+    @property
+    def spec(self) -> str:
+        return format_gluing(self.gluings)
+
+    def _length(self, side: str) -> int:
+        return self.width if side in ("top", "bottom") else self.height
+
+    def _inside(self, side: str, along: int, depth: int) -> Tuple[int, int]:
+        if side == "top":
+            return along, depth
+        if side == "bottom":
+            return along, self.height - 1 - depth
+        if side == "left":
+            return depth, along
+        return self.width - 1 - depth, along
+
+    def _exit(self, x: int, y: int) -> Tuple[str, int, int] | None:
+        """Return the side ``(x, y)`` lies beyond, how far beyond, and the position along it."""
+
+        if y < 0:
+            return "top", -1 - y, x
+        if y >= self.height:
+            return "bottom", y - self.height, x
+        if x < 0:
+            return "left", -1 - x, y
+        if x >= self.width:
+            return "right", x - self.width, y
+        return None
+
+    def _fold(self, side: str, depth: int, along: int) -> Tuple[int, int]:
+        partner = self._partners.get(side)
+        if partner is None:
+            return self._inside(side, along, 0)
+        other, flipped = partner
+        if flipped:
+            along = self._length(side) - 1 - along
+        return self._inside(other, along, depth)
+
+    def wrap(self, x: int, y: int) -> Coordinates:
+        limit = 4 * (abs(x) + abs(y) + self.width + self.height)
+        for _ in range(limit):
+            exit_ = self._exit(x, y)
+            if exit_ is None:
+                return Coordinates(x, y)
+            x, y = self._fold(*exit_)
+        msg = f"Position ({x}, {y}) did not settle under gluing {self.spec!r}"
+        raise ValueError(msg)
+
+    def edge_table(self) -> EdgeTable:
+        table: EdgeTable = {}
+        for side in SIDES:
+            partner = self._partners.get(side)
+            for along in range(self._length(side)):
+                outside = self._inside(side, along, -1)
+                x, y = self._fold(side, 0, along)
+                if partner is None:
+                    table[outside] = (x, y, INWARD[side])
+                else:
+                    table[outside] = (x, y, INWARD[partner[0]] if self.reorient else None)
+        return table
+
+
+class TorusTopology(GluedTopology):
     """Wraps both axes modulo the grid size (classic torus)."""
 
+    gluing = "left=right, top=bottom"
+
     def wrap(self, x: int, y: int) -> Coordinates:
         return Coordinates(x % self.width, y % self.height)
+
+
+def topology_spec(topology: Topology) -> Dict[str, Any]:
+    """JSON-serialisable description of ``topology``, rebuilt by :func:`topology_from_spec`."""
+
+    cls = type(topology)
+    spec: Dict[str, Any] = {"class": f"{cls.__module__}:{cls.__qualname__}"}
+    if cls is GluedTopology:
+        spec.update(gluing=topology.gluing, reorient=topology.reorient)
+    return spec
+
+
+def topology_from_spec(spec: Dict[str, Any], width: int, height: int) -> Topology:
+    """Rebuild a topology saved by :func:`topology_spec` for a ``width`` by ``height`` grid."""
+
+    module_name, _, class_name = spec["class"].partition(":")
+    try:
+        cls = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError, ValueError):
+        cls = None
+    if not (isinstance(cls, type) and issubclass(cls, Topology)):
+        msg = f"Unknown topology class {spec['class']!r}"
+        raise ValueError(msg)
+    if cls is GluedTopology:
+        return cls(width, height, spec["gluing"], reorient=spec["reorient"])
+    return cls(width, height)
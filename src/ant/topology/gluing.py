@@ -0,0 +1,81 @@
+"""Declarative edge gluings for rectangular grids.
+
+A gluing spec lists which sides of the grid are identified, separated by
+commas. ``a=b`` glues side ``a`` to side ``b`` keeping the orientation (both
+run left-to-right or top-to-bottom), ``a~b`` glues them reversed, and
+``a~a`` folds a side onto itself. Sides are ``top``, ``bottom``, ``left`` and
+``right``; a side that is not glued is a wall the ant bounces off::
+
+    torus        left=right, top=bottom
+    klein        left=right, top~bottom
+    projective   left~right, top~bottom
+    cylinder     left=right
+    mobius       left~right
+    pillow       top~top, bottom~bottom, left~left, right~right
+
+:class:`~ant.topology.base.GluedTopology` compiles a spec into the table of
+boundary crossings used by the engine.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+SIDES = ("top", "right", "bottom", "left")
+
+# Heading codes (see ant.core.direction.HEADINGS) pointing out of and into each side.
+OUTWARD = {"top": 0, "right": 1, "bottom": 2, "left": 3}
+INWARD = {"top": 2, "right": 3, "bottom": 0, "left": 1}
+
+SURFACES = {
+    "torus": "left=right, top=bottom",
+    "klein": "left=right, top~bottom",
+    "projective": "left~right, top~bottom",
+    "sphere_diag": "top=left, bottom~right",
+    "cylinder": "left=right",
+    "mobius": "left~right",
+    "pillow": "top~top, bottom~bottom, left~left, right~right",
+}
+
+
+@dataclass(frozen=True)
+class Gluing:
+    """Identification of side ``first`` with side ``second``."""
+
+    first: str
+    second: str
+    reversed: bool = False
+
+    def __str__(self) -> str:
+        return f"{self.first}{'~' if self.reversed else '='}{self.second}"
+
+
+def parse_gluing(spec: str) -> Tuple[Gluing, ...]:
+    """Parse a spec such as ``"left=right, top~bottom"`` (or a name from :data:`SURFACES`)."""
+
+    spec = SURFACES.get(spec.strip().lower(), spec)
+    gluings = []
+    used: Dict[str, str] = {}
+    for part in (chunk.strip() for chunk in spec.split(",")):
+        if not part:
+            continue
+        operator = "~" if "~" in part else "="
+        sides = [side.strip().lower() for side in part.split(operator)]
+        if len(sides) != 2 or not all(side in SIDES for side in sides):
+            msg = f"Invalid gluing {part!r}; expected e.g. 'left=right' or 'top~bottom'"
+            raise ValueError(msg)
+        first, second = sides
+        if first == second and operator == "=":
+            msg = f"Side {first!r} can only be glued to itself reversed ({first}~{first})"
+            raise ValueError(msg)
+        for side in {first, second}:
+            if side in used:
+                msg = f"Side {side!r} is glued twice ({used[side]} and {part})"
+                raise ValueError(msg)
+            used[side] = part
+        gluings.append(Gluing(first, second, operator == "~"))
+    return tuple(gluings)
+
+
+def format_gluing(gluings: Tuple[Gluing, ...]) -> str:
+    return ", ".join(str(gluing) for gluing in gluings)
@@ -1,12 +1,14 @@
 """Non-orientable topology implementations."""
 from __future__ import annotations
 
-from ant.topology.base import Coordinates, Topology
+from ant.topology.base import Coordinates, GluedTopology
 
 
-class KleinBottleTopology(Topology):
+class KleinBottleTopology(GluedTopology):
     """Wraps vertically with a horizontal mirror, horizontally like a torus."""
 
+    gluing = "left=right, top~bottom"
+
     def wrap(self, x: int, y: int) -> Coordinates:
         new_x = x % self.width
         new_y = y
@@ -26,9 +28,11 @@ class KleinBottleTopology(Topology):
         return self.width - 1 - x
 
 
-class ProjectivePlaneTopology(Topology):
+class ProjectivePlaneTopology(GluedTopology):
     """Wraps both axes with mirroring to emulate the projective plane."""
 
+    gluing = "left~right, top~bottom"
+
     def wrap(self, x: int, y: int) -> Coordinates:
         new_x = x
         new_y = y
@@ -1,20 +1,27 @@
 """Orientable topology implementations."""
 from __future__ import annotations
 
-from ant.topology.base import Coordinates, Topology
+from ant.topology.base import Coordinates, GluedTopology
 
 
-class SphereAdjacentPairsTopology(Topology):
-    """Sphere via adjacent-edge identifications on a square grid."""
+class SphereAdjacentPairsTopology(GluedTopology):
+    """Sphere via adjacent-edge identifications on a square grid.
+
+    Ants keep their heading when crossing, so one leaving through the top
+    walks north along the left edge.
+    """
+
+    gluing = "top=left, bottom~right"
+    reorient = False
 
     def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
         if width != height:
             msg = "SphereAdjacentPairsTopology requires width == height"
             raise ValueError(msg)
         if width < 2:
             msg = "SphereAdjacentPairsTopology requires grid size >= 2"
             raise ValueError(msg)
+        super().__init__(width, height)
 
     def wrap(self, x: int, y: int) -> Coordinates:
         n = self.width
@@ -0,0 +1,22 @@
+"""Surfaces defined purely by edge gluings."""
+from __future__ import annotations
+
+from ant.topology.base import GluedTopology
+
+
+class CylinderTopology(GluedTopology):
+    """Left and right sides glued; top and bottom are walls."""
+
+    gluing = "left=right"
+
+
+class MobiusStripTopology(GluedTopology):
+    """Left and right sides glued with a half twist; top and bottom are walls."""
+
+    gluing = "left~right"
+
+
+class PillowSphereTopology(GluedTopology):
+    """Sphere on any rectangle: every side is folded onto itself at its midpoint."""
+
+    gluing = "top~top, bottom~bottom, left~left, right~right"
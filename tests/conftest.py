@@ -0,0 +1,55 @@
+"""Fixtures shared by the test modules."""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Sequence, Tuple, Type, Union
+
+import pytest
+
+from ant.core.direction import Heading
+from ant.core.simulation import Ant, Simulation
+
+# (ant_id, x, y, heading); build_simulation gives these ants the colors below in turn.
+AntSpec = Tuple[int, int, int, Heading]
+TRAIL_COLORS = ("red", "blue", "green")
+DEFAULT_ANTS: Sequence[AntSpec] = ((1, 5, 5, Heading.NORTH), (4, 2, 7, Heading.EAST))
+
+
+def _make_ant(ant_id: int, x: int, y: int, heading: Heading = Heading.NORTH, trail_color: str = "red") -> Ant:
+    return Ant(ant_id=ant_id, x=x, y=y, heading=heading, trail_color=trail_color)
+
+
+def _build_simulation(
+    width: int = 12,
+    height: int = 10,
+    ants: Sequence[Union[Ant, AntSpec]] = DEFAULT_ANTS,
+    *,
+    cls: Type[Simulation] = Simulation,
+    black: Iterable[Tuple[int, int]] = (),
+    **options: Any,
+) -> Simulation:
+    built = [
+        ant if isinstance(ant, Ant) else _make_ant(*ant, trail_color=TRAIL_COLORS[index % len(TRAIL_COLORS)])
+        for index, ant in enumerate(ants)
+    ]
+    simulation = cls(width, height, built, **options)
+    for x, y in black:
+        simulation.grid.set_state(x, y, 1)
+    return simulation
+
+
+@pytest.fixture
+def make_ant() -> Callable[..., Ant]:
+    """Factory: ``make_ant(ant_id, x, y, heading=NORTH, trail_color="red")``."""
+
+    return _make_ant
+
+
+@pytest.fixture
+def build_simulation() -> Callable[..., Simulation]:
+    """Factory: ``build_simulation(width, height, ants, *, cls, black, **options)``.
+
+    Ants are :class:`Ant` objects or ``(ant_id, x, y, heading)`` tuples, the
+    ``black`` cells start in state 1 and ``options`` go to ``cls``.
+    """
+
+    return _build_simulation
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pickle
+import random
+
+import pytest
+
+from ant.core.ants import AntStore
+from ant.core.direction import Heading
+from ant.renderers.ascii import AsciiRenderer
+
+
+def test_added_ant_becomes_view_of_store(build_simulation, make_ant) -> None:
+    ant = make_ant(5, 2, 3)
+    simulation = build_simulation(8, 8, [ant])
+    assert simulation.ants[0] is ant
+    simulation.step()
+    assert (ant.x, ant.y, ant.heading) == (3, 3, Heading.EAST)
+    assert simulation.ants.xs[0] == 3
+    ant.x = 6
+    assert simulation.ants.at(6, 3) is ant
+    assert simulation.ants.at(3, 3) is None
+    with pytest.raises(AttributeError):
+        ant.ant_id = 9
+
+
+def test_lookup_and_duplicate_ids(make_ant) -> None:
+    store = AntStore(10, 10, [make_ant(1, 0, 0), make_ant(42, 5, 5)])
+    assert store.by_id(42).x == 5
+    assert store.slot(42) == 1
+    assert store.get(7) is None
+    with pytest.raises(KeyError):
+        store.by_id(7)
+    with pytest.raises(ValueError):
+        store.add(make_ant(1, 3, 3))
+
+
+def test_occupancy_tracks_every_move(build_simulation, make_ant) -> None:
+    rng = random.Random(11)
+    ants = [make_ant(index, rng.randrange(12), rng.randrange(9), rng.choice(list(Heading))) for index in range(40)]
+    simulation = build_simulation(12, 9, ants)
+    for _ in range(60):
+        simulation.step()
+        expected: dict[int, list[int]] = {}
+        for slot, ant in enumerate(simulation.ants):
+            expected.setdefault(ant.y * 12 + ant.x, []).append(slot)
+        occupancy = simulation.ants.occupancy
+        assert {cell: sorted(slots) for cell, slots in occupancy.items()} == expected
+
+
+def test_spawn_mid_run_and_render(build_simulation, make_ant) -> None:
+    simulation = build_simulation(6, 4, [make_ant(1, 1, 1)], trail_lifetime=0)
+    simulation.run(3)
+    spawned = simulation.add_ant(make_ant(2, 4, 2, Heading.WEST))
+    assert simulation.ant_by_id(2) is spawned
+    simulation.step()
+    assert (spawned.x, spawned.y) == (4, 1)
+    row = AsciiRenderer(use_color=False).render(simulation).splitlines()[2]
+    assert row.split()[4] == "^"
+
+
+def test_ant_values_survive_copy_and_pickle(build_simulation, make_ant) -> None:
+    ant = make_ant(3, 1, 2)
+    first = build_simulation(5, 5, [ant])
+    first.step()
+    second = build_simulation(5, 5, [ant])  # already attached: the second simulation gets a copy
+    assert second.ants[0] is not ant
+    assert second.ants[0] == ant
+    restored = pickle.loads(pickle.dumps(ant))
+    assert restored == ant and restored._store is None
+    assert "Ant(ant_id=3, x=2, y=2" in repr(ant)
+
+
+def test_numpy_columns_are_zero_copy(build_simulation, make_ant) -> None:
+    simulation = build_simulation(9, 9, [make_ant(1, 4, 4), make_ant(2, 7, 1)])
+    columns = simulation.ants.arrays()
+    assert columns["x"].tolist() == [4, 7]
+    simulation.step()
+    assert columns["x"].tolist() == [5, 8]
+    assert columns["heading"].tolist() == [1, 1]
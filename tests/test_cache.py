@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from ant.cli import main
+from ant.core.simulation import Simulation
+from ant.io.cache import ResultCache, config_key, parse_size, run_config
+
+
+def snapshot(simulation: Simulation) -> tuple:
+    return (
+        simulation.steps_executed,
+        simulation.grid.cells,
+        simulation.grid.trails,
+        [ant.fields() for ant in simulation.ants],
+    )
+
+
+def test_cached_run_matches_plain_run_and_resumes(build_simulation, tmp_path) -> None:
+    cache = ResultCache(tmp_path, min_checkpoint=16)
+    first = cache.advance(build_simulation(trail_lifetime=7), 100)
+    expected = build_simulation(trail_lifetime=7)
+    expected.run(100)
+    assert snapshot(first) == snapshot(expected)
+    key = config_key(run_config(build_simulation(trail_lifetime=7)))
+    assert sorted(int(path.stem) for path in (tmp_path / key).glob("*.npz")) == [16, 32, 64]
+
+    resumed = cache.advance(build_simulation(trail_lifetime=7), 300)
+    expected.run(200)
+    assert snapshot(resumed) == snapshot(expected)
+    assert (cache.hits, cache.steps_saved) == (1, 64)
+    assert (tmp_path / key / "256.npz").exists()
+
+
+def test_key_depends_on_configuration(build_simulation, tmp_path) -> None:
+    base = config_key(run_config(build_simulation(trail_lifetime=7)))
+    assert config_key(run_config(build_simulation(trail_lifetime=7))) == base
+    assert config_key(run_config(build_simulation(trail_lifetime=7, rule="LLRR"))) != base
+    painted = build_simulation(trail_lifetime=7)
+    painted.grid.set_state(0, 0, 1)
+    assert config_key(run_config(painted)) != base
+    advanced = build_simulation(trail_lifetime=7)
+    advanced.step()
+    with pytest.raises(ValueError):
+        run_config(advanced)
+
+
+def test_prune_evicts_least_recently_used(build_simulation, tmp_path) -> None:
+    cache = ResultCache(tmp_path, min_checkpoint=8)
+    cache.advance(build_simulation(trail_lifetime=7, rule="RL"), 16)
+    cache.advance(build_simulation(trail_lifetime=7, rule="LLRR"), 16)
+    old, recent = cache.entries()[::-1]
+    for step in old.steps:
+        os.utime(tmp_path / old.key / f"{step}.npz", (1_000, 1_000))
+    keep = recent.size
+    freed = cache.prune(keep)
+    assert freed == old.size
+    assert [entry.key for entry in cache.entries()] == [recent.key]
+    assert not (tmp_path / old.key).exists()
+
+
+def test_parse_size() -> None:
+    assert parse_size("512") == 512
+    assert parse_size("2K") == 2048
+    assert parse_size("1.5MiB") == 3 << 19
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_cache_cli_lists_and_prunes(build_simulation, tmp_path, capsys: pytest.CaptureFixture[str]) -> None:
+    ResultCache(tmp_path, min_checkpoint=8).advance(build_simulation(trail_lifetime=7), 20)
+    assert main(["cache", "--cache-dir", str(tmp_path), "ls"]) == 0
+    listing = capsys.readouterr().out
+    assert "12x10 TorusTopology rule=RL ants=2  steps=8,16" in listing
+    assert main(["cache", "--cache-dir", str(tmp_path), "prune", "--all"]) == 0
+    assert ResultCache(tmp_path).entries() == []
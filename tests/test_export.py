@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from ant.cli import main
+from ant.renderers.export import _segments, concat_gifs, export_parallel
+
+
+def read_frames(path) -> list:
+    with Image.open(path) as image:
+        return [np.asarray(frame.convert("RGB")) for frame in ImageSequence.Iterator(image)]
+
+
+def test_parallel_gif_matches_single_process(build_simulation, tmp_path) -> None:
+    single, parallel = build_simulation(20, 20, trail_lifetime=4), build_simulation(20, 20, trail_lifetime=4)
+    options = {"steps": 75, "steps_per_frame": 10, "figure_size": (2, 2)}
+    assert export_parallel(single, tmp_path / "one.gif", jobs=1, **options) == 8
+    assert export_parallel(parallel, tmp_path / "three.gif", jobs=3, **options) == 8
+    one, three = read_frames(tmp_path / "one.gif"), read_frames(tmp_path / "three.gif")
+    assert len(one) == len(three) == 8
+    for expected, actual in zip(one, three):
+        np.testing.assert_array_equal(actual, expected)
+    assert single.steps_executed == parallel.steps_executed == 75
+    assert single.grid.cells == parallel.grid.cells
+
+
+def test_concat_gifs_keeps_each_palette(tmp_path) -> None:
+    frames = []
+    for index, colors in enumerate([("red", "blue"), ("green", "yellow", "black")]):
+        images = [Image.new("RGB", (6, 4), color) for color in colors]
+        images[0].save(tmp_path / f"part{index}.gif", save_all=True, append_images=images[1:], duration=50, loop=0)
+        frames.extend(np.asarray(image) for image in images)
+    concat_gifs([tmp_path / "part0.gif", tmp_path / "part1.gif"], tmp_path / "joined.gif")
+    joined = read_frames(tmp_path / "joined.gif")
+    assert len(joined) == 5
+    for expected, actual in zip(frames, joined):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_segments_and_validation(build_simulation, tmp_path) -> None:
+    assert _segments(10, 3) == [(0, 3), (3, 3), (6, 4)]
+    assert _segments(2, 8) == [(0, 1), (1, 1)]
+    with pytest.raises(ValueError, match="pillow"):
+        export_parallel(build_simulation(20, 20, trail_lifetime=4), tmp_path / "out.gif", steps=10, writer="imagemagick")
+
+
+def test_cli_save_jobs(tmp_path) -> None:
+    path = tmp_path / "anim.gif"
+    args = ["--backend", "mpl", "--width", "12", "--height", "12", "--steps", "40", "--steps-per-frame", "10"]
+    assert main([*args, "--save-path", str(path), "--save-jobs", "2", "--no-show"]) == 0
+    assert len(read_frames(path)) == 4
+
+
+@pytest.mark.parametrize("blit", [[], ["--no-blit"]])
+def test_cli_sequential_save_matches_save_jobs(tmp_path, blit: list[str]) -> None:
+    sequential, parallel = tmp_path / "sequential.gif", tmp_path / "parallel.gif"
+    args = ["--backend", "mpl", "--width", "12", "--height", "12", "--steps", "40", "--steps-per-frame", "10", "--no-show"]
+    assert main([*args, *blit, "--save-path", str(sequential)]) == 0
+    assert main([*args, "--save-path", str(parallel), "--save-jobs", "2"]) == 0
+    assert len(read_frames(sequential)) == len(read_frames(parallel)) == 4
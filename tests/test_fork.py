@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import gc
+import os
+
+import numpy as np
+import pytest
+
+from ant.core.direction import Heading
+from ant.core.fork import divergence, run_branches
+from ant.core.simulation import Simulation
+
+
+ANTS = ((1, 30, 20, Heading.NORTH), (7, 10, 5, Heading.WEST))
+
+
+@pytest.fixture
+def simulation(build_simulation) -> Simulation:
+    simulation = build_simulation(64, 48, ANTS, trail_lifetime=9, rule="RLR")
+    simulation.run(300)
+    return simulation
+
+
+def state(simulation: Simulation) -> tuple:
+    return (
+        simulation.steps_executed,
+        simulation.grid.clock,
+        simulation.grid.cells,
+        simulation.grid.trails,
+        [ant.fields() for ant in simulation.ants],
+    )
+
+
+def test_branches_are_independent_copies(simulation: Simulation) -> None:
+    branches = simulation.fork(3)
+    assert all(state(branch) == state(simulation) for branch in branches)
+
+    branches[1].grid.set_state(0, 0, 2)
+    branches[2].ant_by_id(7).x = 11
+    simulation.run(50)
+    for branch in branches:
+        branch.run(50)
+    assert state(branches[0]) == state(simulation)
+    assert simulation.grid.get_state(0, 0) == branches[0].grid.get_state(0, 0) == 0
+    assert branches[1].grid.get_state(0, 0) == 2
+    assert branches[0].changed_tiles() and len(branches[0].changed_tiles()) < branches[0].snapshot.length // 4096
+
+
+def test_pool_matches_serial_run(simulation: Simulation) -> None:
+    serial, pooled = simulation.fork(3), simulation.fork(3)
+    for group in (serial, pooled):
+        group[1].grid.set_state(31, 19, 1)
+        group[2].ant_by_id(1).heading = Heading.EAST
+    views = [branch.ants[0] for branch in pooled]
+    run_branches(serial, 200, jobs=1)
+    run_branches(pooled, 200, jobs=2)
+    for expected, actual, view in zip(serial, pooled, views):
+        assert state(actual) == state(expected)
+        assert view.fields() == expected.ants[0].fields()
+        assert actual.ants.at(view.x, view.y) is not None
+
+
+def test_pool_refuses_branches_with_snapshots(simulation: Simulation, tmp_path) -> None:
+    branches = simulation.fork(2)
+    with branches[1].take_snapshots(tmp_path, every=10, format="npy"):
+        with pytest.raises(ValueError, match="snapshots"):
+            run_branches(branches, 20, jobs=2)
+
+
+def test_divergence_metrics(simulation: Simulation) -> None:
+    branches = simulation.fork(3)
+    branches[1].grid.set_state(1, 1, 1)
+    branches[1].grid.set_state(2, 1, 1)
+    branches[2].ant_by_id(1).x += 3
+    branches[2].ant_by_id(1).y += 4
+    branches[2].ant_by_id(7).heading = Heading.SOUTH
+    result = divergence(simulation, branches)
+    assert result.cells.tolist() == [0, 2, 0]
+    np.testing.assert_allclose(result.ant_distance, [[0, 0], [0, 0], [5, 0]])
+    np.testing.assert_allclose(result.mean_ant_distance, [0, 0, 2.5])
+    assert result.heading_changes.tolist() == [0, 0, 1]
+    with pytest.raises(ValueError):
+        divergence(simulation, [Simulation(64, 48, [])])
+
+
+def test_snapshot_file_is_removed_with_its_branches(simulation: Simulation) -> None:
+    branches = simulation.fork(2)
+    path = branches[0].snapshot.path
+    assert os.path.exists(path)
+    del branches
+    gc.collect()
+    assert not os.path.exists(path)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ant.core.direction import Heading
+from ant.renderers.schedule import StepListSchedule
+
+
+def test_frames_match_the_simulation_and_reuse_buffers(build_simulation) -> None:
+    simulation = build_simulation(trail_lifetime=4)
+    reference = build_simulation(trail_lifetime=4)
+    frames = simulation.iter_frames(every=7, until=30)
+    previous = None
+    steps = []
+    for frame in frames:
+        steps.append(frame.step)
+        np.testing.assert_array_equal(frame.cells, reference.grid.cell_array())
+        expected = [[owner or 0 for owner in row] for row in reference.grid.trails]
+        np.testing.assert_array_equal(frame.trail_owners, expected)
+        assert frame.ants["id"].tolist() == [1, 4]
+        assert frame.ants["x"].tolist() == [ant.x for ant in reference.ants]
+        for array in (frame.cells, frame.trail_owners, *frame.ants.values()):
+            assert not array.flags.writeable
+        if previous is not None:
+            assert np.shares_memory(frame.trail_owners, previous.trail_owners)
+            assert np.shares_memory(frame.ants["x"], previous.ants["x"])
+        previous = frame
+        reference.run(min(7, 30 - reference.steps_executed))
+    assert steps == [0, 7, 14, 21, 28, 30]
+    assert simulation.steps_executed == 30
+
+
+def test_copied_frames_are_independent(build_simulation, make_ant) -> None:
+    simulation = build_simulation(trail_lifetime=4)
+    frames = list(simulation.iter_frames(every=10, until=20, copy=True))
+    assert [frame.step for frame in frames] == [0, 10, 20]
+    assert frames[0].cells.sum() == 0 and frames[1].cells.sum() > 0
+    assert not np.shares_memory(frames[1].trail_owners, frames[2].trail_owners)
+    simulation.add_ant(make_ant(8, 0, 0, Heading.SOUTH))
+    assert len(frames[2].ants["id"]) == 2
+
+
+def test_frames_follow_a_schedule(build_simulation) -> None:
+    simulation = build_simulation(trail_lifetime=4)
+    steps = [frame.step for frame in simulation.iter_frames(StepListSchedule([3, 40, 400]), until=100)]
+    assert steps == [0, 3, 40, 100]
+    endless = simulation.iter_frames(every=5)
+    assert [next(endless).step for _ in range(3)] == [100, 105, 110]
+
+
+def test_invalid_arguments(build_simulation) -> None:
+    simulation = build_simulation(trail_lifetime=4)
+    simulation.run(5)
+    with pytest.raises(ValueError, match="every"):
+        next(simulation.iter_frames(every=0))
+    with pytest.raises(ValueError, match="before the current step"):
+        next(simulation.iter_frames(until=2))
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.core.simulation import Ant, Simulation
+from ant.topology.base import Coordinates, GluedTopology, Topology, TorusTopology
+from ant.topology.gluing import OUTWARD, SURFACES, parse_gluing
+from ant.topology.nonorientable import KleinBottleTopology, ProjectivePlaneTopology
+from ant.topology.orientable import SphereAdjacentPairsTopology
+from ant.topology.surfaces import CylinderTopology, MobiusStripTopology, PillowSphereTopology
+
+LEGACY = [
+    ("torus", TorusTopology),
+    ("klein", KleinBottleTopology),
+    ("projective", ProjectivePlaneTopology),
+    ("sphere_diag", SphereAdjacentPairsTopology),
+]
+
+
+class WrapOnlyTorus(Topology):
+    def wrap(self, x: int, y: int) -> Coordinates:
+        return Coordinates(x % self.width, y % self.height)
+
+
+def outward_heading(topology: Topology, x: int, y: int) -> int:
+    if y < 0:
+        return OUTWARD["top"]
+    if y >= topology.height:
+        return OUTWARD["bottom"]
+    return OUTWARD["left"] if x < 0 else OUTWARD["right"]
+
+
+@pytest.mark.parametrize(("name", "topology_cls"), LEGACY)
+@pytest.mark.parametrize("size", [(1, 1), (2, 2), (5, 5), (7, 4), (4, 9)])
+def test_compiled_edges_match_legacy_wrap(name: str, topology_cls: type, size: tuple[int, int]) -> None:
+    width, height = size
+    if topology_cls is SphereAdjacentPairsTopology and (width != height or width < 2):
+        pytest.skip("sphere_diag needs a square grid")
+    topology = topology_cls(width, height)
+    generic = GluedTopology(width, height, SURFACES[name], reorient=topology.reorient)
+    expected = Topology.edge_table(topology)  # positions from the hand-written wrap()
+    assert set(topology.edges) == set(expected)
+    for (x, y), (wrapped_x, wrapped_y, _heading) in expected.items():
+        heading = outward_heading(topology, x, y)
+        assert topology.cross(x, y, heading) == (wrapped_x, wrapped_y, heading)
+        assert generic.cross(x, y, heading) == (wrapped_x, wrapped_y, heading)
+        assert generic.wrap(x, y) == Coordinates(wrapped_x, wrapped_y)
+
+
+def test_runs_match_wrap_only_topology() -> None:
+    def build(topology: Topology) -> Simulation:
+        ants = [
+            Ant(ant_id=index, x=index % 9, y=index % 6, heading=list(Heading)[index % 4], trail_color="red")
+            for index in range(6)
+        ]
+        return Simulation(9, 6, ants, topology, rule="RLR")
+
+    expected, actual = build(WrapOnlyTorus(9, 6)), build(TorusTopology(9, 6))
+    expected.run(500)
+    actual.run(500)
+    assert actual.grid.cells == expected.grid.cells
+    assert [ant.fields() for ant in actual.ants] == [ant.fields() for ant in expected.ants]
+
+
+def test_parse_gluing() -> None:
+    assert [str(gluing) for gluing in parse_gluing("Left=RIGHT,top~bottom")] == ["left=right", "top~bottom"]
+    assert parse_gluing("mobius") == parse_gluing("left~right")
+    for spec in ["left=up", "left=right=top", "top=top", "left=right, right~top"]:
+        with pytest.raises(ValueError):
+            parse_gluing(spec)
+    with pytest.raises(ValueError, match="length"):
+        GluedTopology(5, 4, "top=left")
+
+
+def test_unglued_sides_are_walls() -> None:
+    cylinder = CylinderTopology(6, 4)
+    assert cylinder.cross(2, -1, OUTWARD["top"]) == (2, 0, OUTWARD["bottom"])
+    assert cylinder.cross(6, 3, OUTWARD["right"]) == (0, 3, OUTWARD["right"])
+    assert cylinder.wrap(3, 9) == Coordinates(3, 3)
+
+    ant = Ant(ant_id=1, x=2, y=0, heading=Heading.WEST, trail_color="red")
+    simulation = Simulation(6, 4, [ant], cylinder)
+    simulation.step()  # white cell: turn right into the top wall
+    assert (ant.x, ant.y, ant.heading) == (2, 0, Heading.SOUTH)
+
+
+def test_mobius_and_pillow_reorient() -> None:
+    mobius = MobiusStripTopology(6, 4)
+    assert mobius.cross(-1, 0, OUTWARD["left"]) == (5, 3, OUTWARD["left"])
+    assert mobius.wrap(-2, 1) == Coordinates(4, 2)
+
+    pillow = PillowSphereTopology(6, 4)
+    assert pillow.cross(1, -1, OUTWARD["top"]) == (4, 0, OUTWARD["bottom"])
+    assert pillow.cross(-1, 0, OUTWARD["left"]) == (0, 3, OUTWARD["right"])
+    turned = GluedTopology(5, 5, "top=left")
+    assert turned.cross(3, -1, OUTWARD["top"]) == (0, 3, OUTWARD["right"])
+    assert GluedTopology(5, 5, "top=left", reorient=False).cross(3, -1, OUTWARD["top"]) == (0, 3, OUTWARD["top"])
+
+
+def test_cli_glue_option(capsys: pytest.CaptureFixture[str]) -> None:
+    args = ["--width", "6", "--height", "4", "--steps", "5", "--interval", "0", "--no-clear"]
+    assert main([*args, "--glue", "left~right"]) == 0
+    assert main([*args, "--topology", "pillow"]) == 0
+    capsys.readouterr()
+    with pytest.raises(SystemExit):
+        main([*args, "--glue", "top=left"])
+    assert "Invalid --glue" in capsys.readouterr().err
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import os
+import signal
+
+import numpy as np
+import pytest
+
+from ant.cli import main
+from ant.core.simulation import Simulation
+from ant.renderers.headless import HeadlessRunner, format_duration
+
+
+class InterruptedSimulation(Simulation):
+    """Delivers SIGINT to this process once ``at`` steps have run."""
+
+    at = 40
+
+    def step(self) -> None:
+        super().step()
+        if self.steps_executed == self.at:
+            os.kill(os.getpid(), signal.SIGINT)
+
+
+def test_runner_reports_progress_and_summary(build_simulation) -> None:
+    stream = io.StringIO()
+    ticks = itertools.count()
+    runner = HeadlessRunner(build_simulation(trail_lifetime=5), report_interval=2, stream=stream, clock=lambda: next(ticks))
+    assert runner.run(100) is True
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith("step 1 ") and "steps/s  ETA" in lines[0]
+    assert lines[-1].startswith("Finished 100/100 steps") and lines[-1].endswith("simulation at step 100")
+    assert runner.simulation.steps_executed == 100
+
+
+def test_sigint_stops_between_steps(build_simulation) -> None:
+    previous = signal.getsignal(signal.SIGINT)
+    simulation = build_simulation(cls=InterruptedSimulation)
+    stream = io.StringIO()
+    runner = HeadlessRunner(simulation, report_interval=0, stream=stream)
+    assert runner.run(10_000) is False
+    assert 40 <= simulation.steps_executed < 10_000
+    assert runner.steps_done == simulation.steps_executed
+    assert stream.getvalue().startswith(f"Interrupted after {simulation.steps_executed:,}/10,000 steps")
+    assert signal.getsignal(signal.SIGINT) is previous
+
+
+def test_cli_headless_checkpoint_and_resume(tmp_path, capsys: pytest.CaptureFixture[str]) -> None:
+    args = ["--backend", "none", "--width", "16", "--height", "16", "--progress-interval", "0"]
+    first, resumed, direct = tmp_path / "first.npz", tmp_path / "resumed.npz", tmp_path / "direct.npz"
+    assert main([*args, "--steps", "300", "--checkpoint", str(first)]) == 0
+    assert main([*args, "--steps", "200", "--resume", str(first), "--checkpoint", str(resumed)]) == 0
+    assert main([*args, "--steps", "500", "--checkpoint", str(direct)]) == 0
+    err = capsys.readouterr().err
+    assert "Finished 200/200 steps" in err and "simulation at step 500" in err
+    with np.load(resumed) as got, np.load(direct) as want:
+        assert int(got["steps"]) == 500
+        for name in want.files:
+            np.testing.assert_array_equal(got[name], want[name])
+
+    with pytest.raises(SystemExit):
+        main(["--backend", "none", "--width", "8", "--height", "8", "--resume", str(first)])
+    assert "Cannot resume" in capsys.readouterr().err
+
+
+def test_cli_resume_feeds_restored_state_to_stats(tmp_path, capsys: pytest.CaptureFixture[str]) -> None:
+    args = ["--backend", "none", "--width", "16", "--height", "16", "--progress-interval", "0", "--stats-every", "100"]
+    checkpoint, resumed, direct = tmp_path / "state.npz", tmp_path / "resumed.csv", tmp_path / "direct.csv"
+    assert main([*args, "--steps", "300", "--checkpoint", str(checkpoint)]) == 0
+    assert main([*args, "--steps", "200", "--resume", str(checkpoint), "--stats-out", str(resumed)]) == 0
+    assert main([*args, "--steps", "500", "--stats-out", str(direct)]) == 0
+    capsys.readouterr()
+    with resumed.open() as handle:
+        got = {row["step"]: row["black_cells"] for row in csv.DictReader(handle)}
+    with direct.open() as handle:
+        want = {row["step"]: row["black_cells"] for row in csv.DictReader(handle)}
+    assert list(got) == ["300", "400", "500"]
+    assert got == {step: want[step] for step in got}
+
+
+def test_cli_second_interrupt_skips_checkpoint(tmp_path, monkeypatch) -> None:
+    step = Simulation.step
+
+    def torn_step(self) -> None:
+        if self.steps_executed == 50:
+            self.grid.set_state(0, 0, 1)  # half of a step...
+            raise KeyboardInterrupt  # ...cut short by a second Ctrl+C
+        step(self)
+
+    monkeypatch.setattr(Simulation, "step", torn_step)
+    path = tmp_path / "state.npz"
+    with pytest.raises(KeyboardInterrupt):
+        main(["--backend", "none", "--steps", "100", "--progress-interval", "0", "--checkpoint", str(path)])
+    assert not path.exists()
+
+
+def test_format_duration() -> None:
+    assert format_duration(0.4) == "0:00:00"
+    assert format_duration(3725) == "1:02:05"
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+import pytest
+
+from ant.cli import _build_simulation, build_parser, main
+from ant.core.grid import Grid
+from ant.io.initial import check_states, load_cells, random_cells
+
+
+def build(argv: list[str]):
+    parser = build_parser()
+    return _build_simulation(parser.parse_args(argv), parser)
+
+
+def test_npy_is_memory_mapped_copy_on_write(tmp_path) -> None:
+    pattern = np.zeros((6, 9), dtype=np.uint8)
+    pattern[2, 3] = 1
+    path = tmp_path / "pattern.npy"
+    np.save(path, pattern)
+
+    cells = load_cells(path)
+    assert isinstance(cells, np.memmap)
+    grid = Grid.from_array(cells)
+    assert (grid.width, grid.height, grid.get_state(3, 2)) == (9, 6, 1)
+    grid.set_state(0, 0, 1)
+    assert cells[0, 0] == 1  # no copy: the grid writes into the mapping...
+    assert np.load(path)[0, 0] == 0  # ...privately, never back to the file
+    restored = pickle.loads(pickle.dumps(grid))
+    assert restored.cells == grid.cells
+
+
+def test_npy_dtypes_and_errors(tmp_path) -> None:
+    np.save(tmp_path / "bool.npy", np.eye(3, dtype=bool))
+    assert load_cells(tmp_path / "bool.npy").tolist() == np.eye(3, dtype=np.uint8).tolist()
+    np.save(tmp_path / "wide.npy", np.full((2, 2), 3, dtype=np.int64))
+    assert load_cells(tmp_path / "wide.npy").dtype == np.uint8
+    with pytest.raises(ValueError, match="rule has only 2 colors"):
+        check_states(load_cells(tmp_path / "wide.npy"), 2)
+    np.save(tmp_path / "cube.npy", np.zeros((2, 2, 2), dtype=np.uint8))
+    with pytest.raises(ValueError, match="2-D"):
+        load_cells(tmp_path / "cube.npy")
+    with pytest.raises(ValueError, match="Unsupported"):
+        load_cells(tmp_path / "cells.txt")
+
+
+def test_png_is_thresholded(tmp_path) -> None:
+    image = pytest.importorskip("PIL.Image")
+    pixels = np.full((4, 5), 255, dtype=np.uint8)
+    pixels[1, 2] = 0
+    pixels[3, 4] = 100
+    image.fromarray(pixels).save(tmp_path / "seed.png")
+    cells = load_cells(tmp_path / "seed.png")
+    assert np.argwhere(cells).tolist() == [[1, 2], [3, 4]]
+
+
+def test_random_cells_density_and_seed() -> None:
+    cells = random_cells(300, 200, 0.25, seed=7)
+    assert cells.shape == (200, 300)
+    assert abs(cells.mean() - 0.25) < 0.01
+    assert np.array_equal(cells, random_cells(300, 200, 0.25, seed=7))
+    colored = random_cells(50, 40, 0.5, seed=1, colors=4)
+    assert set(np.unique(colored).tolist()) == {0, 1, 2, 3}
+    assert random_cells(3, 2, 1.0).all() and not random_cells(3, 2, 0.0).any()
+    with pytest.raises(ValueError):
+        random_cells(3, 3, 1.5)
+
+
+def test_cli_init_options(tmp_path, capsys: pytest.CaptureFixture[str]) -> None:
+    np.save(tmp_path / "grid.npy", np.ones((7, 11), dtype=np.uint8))
+    simulation = build(["--init-grid", str(tmp_path / "grid.npy")])
+    assert (simulation.grid.width, simulation.grid.height, simulation.grid.count_nonzero()) == (11, 7, 77)
+
+    first = build(["--width", "30", "--height", "20", "--init-random", "0.3", "--seed", "5"])
+    second = build(["--width", "30", "--height", "20", "--init-random", "0.3", "--seed", "5"])
+    assert first.grid.cells == second.grid.cells and 0 < first.grid.count_nonzero() < 600
+
+    for argv in (
+        ["--init-grid", str(tmp_path / "grid.npy"), "--width", "12"],
+        ["--init-random", "2"],
+        ["--init-grid", str(tmp_path / "grid.npy"), "--init-random", "0.5"],
+    ):
+        with pytest.raises(SystemExit):
+            main(argv)
+    assert "does not match --width" in capsys.readouterr().err
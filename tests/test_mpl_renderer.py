@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gc
 import warnings
 
 import pytest
@@ -81,3 +82,132 @@ def test_matplotlib_animator_run_can_save(monkeypatch, simulation: Simulation, t
     animator.run(steps=2, show=False, save_path=str(target), save_kwargs={"fps": 15})
 
     assert dummy.saved == (str(target), {"fps": 15})
+
+
+def test_matplotlib_animator_offsets_indices_by_rule_states() -> None:
+    ant = Ant(ant_id=1, x=0, y=0, heading=Heading.NORTH, trail_color="red")
+    sim = Simulation(width=3, height=1, ants=[ant], trail_lifetime=0, rule="RLLR")
+    sim.grid.set_state(1, 0, 3)
+    animator = MatplotlibAnimator(sim, frame_interval_ms=10)
+    frame = animator._build_frame()
+    assert frame[0].tolist() == [5, 3, 0]
+    assert animator._colormap.N == 4 + 2
+    plt.close(animator._figure)
+
+
+def test_matplotlib_animator_reuses_uint8_frame(simulation: Simulation) -> None:
+    animator = MatplotlibAnimator(simulation, frame_interval_ms=10)
+    frame = animator._build_frame()
+    assert frame.dtype == np.uint8
+    animator.advance(1)
+    assert animator._build_frame() is frame
+    pixels = animator._image.get_array()
+    assert pixels.shape == (3, 4, 4)
+    np.testing.assert_array_equal(pixels[0, 0], animator._colormap(int(frame[0, 0]), bytes=True))
+    plt.close(animator._figure)
+
+    crowd = [Ant(ant_id=i, x=i % 20, y=i // 20, heading=Heading.NORTH, trail_color="red") for i in range(200)]
+    animator = MatplotlibAnimator(Simulation(width=20, height=10, ants=crowd), frame_interval_ms=10)
+    assert animator._build_frame().dtype == np.uint16
+    plt.close(animator._figure)
+
+
+@pytest.mark.filterwarnings("ignore:Animation was deleted:UserWarning")
+def test_matplotlib_animator_blits_image_and_text(simulation: Simulation) -> None:
+    animator = MatplotlibAnimator(simulation, frame_interval_ms=0, figure_size=(2, 2))
+    animation = animator.create_animation(steps=3)
+    assert animation._blit
+    animator._figure.canvas.draw()
+    animation._init_draw()
+    for frame in range(3):
+        animation._draw_next_frame(frame, blit=True)
+    assert simulation.steps_executed == 3
+    assert set(animation._drawn_artists) == {animator._image, animator._annotation}
+    assert animator._annotation.get_animated()
+    plt.close(animator._figure)
+
+    animator = MatplotlibAnimator(simulation, frame_interval_ms=0, blit=False)
+    assert not animator.create_animation(steps=1)._blit
+    plt.close(animator._figure)
+    gc.collect()  # report the discarded animation inside this test's warning filter
+
+
+def test_matplotlib_animator_reports_fps_while_shown(simulation: Simulation) -> None:
+    animator = MatplotlibAnimator(simulation, frame_interval_ms=0)
+    assert animator.achieved_fps is None
+    for frame in range(3):
+        animator._update(frame)
+    assert animator.achieved_fps > 0
+    assert "fps:" not in animator._annotation.get_text()  # saved frames stay free of timing noise
+    animator._live = True
+    animator._update(3)
+    assert "fps:" in animator._annotation.get_text()
+    plt.close(animator._figure)
+
+
+def _block_reduce(frame: np.ndarray, block_x: int, block_y: int, reduce) -> np.ndarray:
+    rows, columns = -(-frame.shape[0] // block_y), -(-frame.shape[1] // block_x)
+    return np.array(
+        [
+            [reduce(frame[r * block_y : (r + 1) * block_y, c * block_x : (c + 1) * block_x]) for c in range(columns)]
+            for r in range(rows)
+        ]
+    )
+
+
+def _big_simulation() -> Simulation:
+    rng = np.random.default_rng(5)
+    ants = [Ant(ant_id=i, x=37 * i, y=301 - 29 * i, heading=Heading.EAST, trail_color="red") for i in range(1, 6)]
+    sim = Simulation(width=310, height=290, ants=ants, trail_lifetime=20)
+    for x, y in rng.integers(0, 290, size=(4000, 2)).tolist():
+        sim.grid.set_state(x, y, 1)
+    sim.run(300)
+    return sim
+
+
+@pytest.mark.parametrize("mode", ["any", "majority"])
+def test_matplotlib_animator_reduces_large_grids_to_pixels(mode: str) -> None:
+    sim = _big_simulation()
+    animator = MatplotlibAnimator(sim, figure_size=(1, 1), lod=mode)
+    x0, x1, y0, y1, block_x, block_y = animator._region
+    assert (x0, x1, y0, y1) == (0, 310, 0, 290) and block_x > 1 and block_y > 1
+    frame = animator._build_frame().copy()
+    states = sim.rule.colors
+    ants_from = states + len(sim.ants)
+
+    def majority(block: np.ndarray) -> int:
+        votes = [np.count_nonzero(block == state) for state in range(states)]
+        trails = block[(block >= states) & (block < ants_from)]
+        votes += [trails.size, np.count_nonzero(block >= ants_from)]
+        winner = int(np.argmax(votes))
+        return winner if winner < states else int(trails.max() if winner == states else block.max())
+
+    expected = _block_reduce(frame, block_x, block_y, np.max if mode == "any" else majority)
+    view = animator._build_view(animator._region)
+    np.testing.assert_array_equal(view, expected)
+    assert animator._image.get_array().shape == expected.shape + (4,)
+    if mode == "any":  # every ant stays visible however far the view is zoomed out
+        assert np.count_nonzero(view >= ants_from) == len(sim.ants)
+    plt.close(animator._figure)
+
+
+def test_matplotlib_animator_resamples_on_zoom() -> None:
+    sim = _big_simulation()
+    animator = MatplotlibAnimator(sim, figure_size=(1, 1))
+    animator._axis.set_xlim(99.5, 139.5)
+    animator._axis.set_ylim(79.5, 49.5)
+    assert animator._region == (100, 140, 50, 80, 1, 1)
+    np.testing.assert_array_equal(
+        animator._image.get_array(), animator._colorize(animator._build_frame()[50:80, 100:140])
+    )
+    assert animator._image.get_extent() == [99.5, 139.5, 79.5, 49.5]
+    animator._axis.set_xlim(-0.5, 309.5)
+    animator._axis.set_ylim(289.5, -0.5)
+    assert animator._region[4] > 1
+    plt.close(animator._figure)
+
+    animator = MatplotlibAnimator(sim, figure_size=(1, 1), lod=None)
+    assert animator._image.get_array().shape == (290, 310, 4)
+    plt.close(animator._figure)
+    with pytest.raises(ValueError, match="lod"):
+        MatplotlibAnimator(sim, lod="median")
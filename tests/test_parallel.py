@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.core.parallel import ParallelSimulation
+from ant.core.simulation import Ant, Simulation
+from ant.topology import (
+    KleinBottleTopology,
+    ProjectivePlaneTopology,
+    SphereAdjacentPairsTopology,
+    TorusTopology,
+)
+
+
+def scattered_ants(count: int, width: int, height: int, seed: int = 7) -> list[Ant]:
+    rng = random.Random(seed)
+    return [
+        Ant(
+            ant_id=index + 1,
+            x=rng.randrange(width),
+            y=rng.randrange(height),
+            heading=rng.choice(list(Heading)),
+            trail_color="red",
+        )
+        for index in range(count)
+    ]
+
+
+def clone(ants: list[Ant]) -> list[Ant]:
+    return [Ant(ant.ant_id, ant.x, ant.y, ant.heading, ant.trail_color) for ant in ants]
+
+
+@pytest.mark.parametrize(
+    "topology_cls",
+    [TorusTopology, KleinBottleTopology, ProjectivePlaneTopology, SphereAdjacentPairsTopology],
+)
+def test_parallel_matches_sequential(topology_cls) -> None:
+    size = 48
+    ants = scattered_ants(6, size, size)
+    sequential = Simulation(size, size, clone(ants), topology_cls(size, size), trail_lifetime=5)
+    sequential.run(1500)
+
+    with ParallelSimulation(
+        size, size, clone(ants), topology_cls(size, size), trail_lifetime=5, workers=3, min_parallel_batch=2
+    ) as parallel:
+        parallel.run(1500)
+        assert parallel.parallel_steps > 0
+        assert parallel.steps_executed == 1500
+        assert parallel.grid.cells == sequential.grid.cells
+        assert parallel.grid.trails == sequential.grid.trails
+        assert [(a.x, a.y, a.heading) for a in parallel.ants] == [
+            (a.x, a.y, a.heading) for a in sequential.ants
+        ]
+
+
+def test_plan_batch_keeps_ants_inside_domains() -> None:
+    ants = [
+        Ant(ant_id=1, x=5, y=10, heading=Heading.NORTH, trail_color="red"),
+        Ant(ant_id=2, x=40, y=10, heading=Heading.NORTH, trail_color="red"),
+        Ant(ant_id=3, x=42, y=30, heading=Heading.NORTH, trail_color="red"),
+    ]
+    with ParallelSimulation(80, 40, ants, workers=2) as sim:
+        steps, domains, members = sim.plan_batch(1000)
+        assert sorted(index for group in members for index in group) == [0, 1, 2]
+        assert members[[1 in group for group in members].index(True)] == [1, 2]
+        assert sum(stop - start for start, stop in domains) == 80
+        # Ants 1 and 2 both sit 17 columns from the cut through the 5..40 gap.
+        assert steps == 18
+
+
+def test_parallel_falls_back_when_recording_stats() -> None:
+    ants = scattered_ants(4, 30, 30)
+    with ParallelSimulation(30, 30, clone(ants), workers=2) as sim:
+        sim.track_statistics()
+        sim.run(50)
+        assert sim.parallel_steps == 0
+        assert sim.stats is not None and sim.stats.black_cells == sim.grid.count_nonzero()
+
+
+def test_close_keeps_final_state() -> None:
+    sim = ParallelSimulation(20, 20, scattered_ants(2, 20, 20), workers=2)
+    sim.run(30)
+    cells = sim.grid.cells
+    sim.close()
+    assert sim.grid.cells == cells
+
+
+def test_cli_workers_flag(capsys) -> None:
+    main(["--steps", "40", "--interval", "0", "--no-clear", "--no-color", "--steps-per-frame", "40"])
+    sequential = capsys.readouterr().out
+    main(["--steps", "40", "--interval", "0", "--no-clear", "--no-color", "--steps-per-frame", "40", "--workers", "2"])
+    assert capsys.readouterr().out == sequential
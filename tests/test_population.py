@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ant.cli import _build_simulation, build_parser, main
+from ant.core.ants import AntStore
+from ant.core.direction import Heading
+from ant.core.simulation import Ant, Simulation
+from ant.io.population import generate_ants, load_ants
+
+
+def build(argv: list[str]) -> Simulation:
+    parser = build_parser()
+    return _build_simulation(parser.parse_args(argv), parser)
+
+
+def test_add_arrays_matches_adding_ants_one_by_one() -> None:
+    bulk = AntStore(8, 6)
+    bulk.add(Ant(ant_id=4, x=1, y=1, heading=Heading.WEST, trail_color="blue"))
+    slots = bulk.add_arrays([2, 5, 5], [3, 0, 0], [0, 1, 2], states=[0, 1, 0], trail_colors=["red", "blue", "red"])
+    assert slots == range(1, 4)
+    assert [ant.ant_id for ant in bulk] == [4, 5, 6, 7]
+    assert bulk.by_id(6).fields() == (6, 5, 0, Heading.EAST, "blue", 1)
+    assert bulk.palette == ["blue", "red"]
+    assert bulk.occupancy == {9: [0], 26: [1], 5: [2, 3]}
+    assert bulk.at(5, 0).ant_id == 7
+
+
+def test_add_arrays_validates_before_adding() -> None:
+    store = AntStore(5, 5)
+    with pytest.raises(ValueError, match="outside the 5x5 grid"):
+        store.add_arrays([0, 5], [0, 0], [0, 0])
+    with pytest.raises(ValueError, match="Heading codes"):
+        store.add_arrays([0], [0], [4])
+    with pytest.raises(ValueError, match="unique"):
+        store.add_arrays([0, 1], [0, 0], [0, 0], ids=[3, 3])
+    assert len(store) == 0 and store.occupancy == {}
+
+
+def test_csv_and_npy_files(tmp_path) -> None:
+    csv_path = tmp_path / "ants.csv"
+    csv_path.write_text("x, y, heading, color\n1,2,north,red\n3,4,W,#00ff00\n0,0,2, red\n")
+    columns = load_ants(csv_path)
+    assert columns["headings"].tolist() == [0, 3, 2]
+    assert columns["trail_colors"] == ["red", "#00ff00", "red"]
+
+    np.save(tmp_path / "plain.npy", np.array([[1, 2, 1], [3, 4, 3]]))
+    assert load_ants(tmp_path / "plain.npy")["headings"].tolist() == [1, 3]
+    records = np.array([(7, 1, 1, "east")], dtype=[("id", "i8"), ("x", "i8"), ("y", "i8"), ("heading", "U5")])
+    np.save(tmp_path / "records.npy", records)
+    assert load_ants(tmp_path / "records.npy")["ids"].tolist() == [7]
+
+    csv_path.write_text("x,y,heading\n1,2,up\n")
+    with pytest.raises(ValueError, match="Unknown heading"):
+        load_ants(csv_path)
+
+
+def test_generators() -> None:
+    lattice = generate_ants("lattice:12,heading=east", 12, 6)
+    cells = set(zip(lattice["xs"].tolist(), lattice["ys"].tolist()))
+    assert len(cells) == 12 and set(lattice["headings"].tolist()) == {1}
+    packed = generate_ants("lattice:72", 12, 6)
+    assert len(set(zip(packed["xs"].tolist(), packed["ys"].tolist()))) == 72
+
+    first = generate_ants("random:50,color=blue", 20, 10, seed=3)
+    second = generate_ants("random:50,color=blue", 20, 10, seed=3)
+    assert first["xs"].tolist() == second["xs"].tolist()
+    assert len(set(zip(first["xs"].tolist(), first["ys"].tolist()))) == 50
+    for spec in ("spiral:5", "random:x", "random:5,speed=2", "random:201"):
+        with pytest.raises(ValueError):
+            generate_ants(spec, 20, 10)
+
+
+def test_cli_bulk_ants(tmp_path, capsys: pytest.CaptureFixture[str]) -> None:
+    (tmp_path / "ants.csv").write_text("x,y\n1,1\n2,2\n")
+    simulation = build(["--width", "10", "--height", "10", "--ants-file", str(tmp_path / "ants.csv")])
+    assert [(ant.x, ant.y, ant.heading) for ant in simulation.ants] == [(1, 1, Heading.NORTH), (2, 2, Heading.NORTH)]
+    simulation = build(["--width", "30", "--height", "20", "--ants-generate", "random:100", "--seed", "1"])
+    assert len(simulation.ants) == 100
+    simulation.run(3)
+
+    with pytest.raises(SystemExit):
+        main(["--width", "2", "--height", "2", "--ants-file", str(tmp_path / "ants.csv")])
+    assert "outside the 2x2 grid" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(["--ant", "0,0,north,red", "--ants-generate", "random:3"])
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.core.grid import Grid
+from ant.core.simulation import Simulation
+from ant.profiling import PhaseProfiler, default_targets
+from ant.topology.base import Topology
+
+
+def test_profiler_records_nested_phases(build_simulation) -> None:
+    sim = build_simulation(5, 5, [(1, 2, 0, Heading.WEST)])  # crosses the top edge twice
+    profiler = PhaseProfiler()
+    profiler.start(default_targets())
+    try:
+        sim.run(4)
+    finally:
+        profiler.stop()
+
+    assert profiler.phases["simulation.step"].calls == 4
+    assert profiler.phases["grid.decay_trails"].calls == 4
+    assert profiler.phases["topology.cross"].calls == 2
+    step = profiler.phases["simulation.step"]
+    assert step.own <= step.total
+    stacks = profiler.collapsed_stacks()
+    assert any(line.startswith("simulation.step;topology.cross ") for line in stacks)
+
+
+def test_profiler_restores_original_methods() -> None:
+    originals = (Simulation.step, Grid.decay_trails, Topology.cross)
+    profiler = PhaseProfiler()
+    profiler.start(default_targets())
+    assert Simulation.step is not originals[0]
+    profiler.stop()
+    assert (Simulation.step, Grid.decay_trails, Topology.cross) == originals
+
+
+def test_cli_profile_emits_json_summary(capsys) -> None:
+    main(["--steps", "3", "--interval", "0", "--no-clear", "--profile", "--profile-format", "json"])
+    summary = json.loads(capsys.readouterr().err)
+    assert summary["phases"]["simulation.step"]["calls"] == 3
+    assert summary["phases"]["ascii.render"]["calls"] == 4
+
+
+def test_cli_profile_dumps_cprofile_and_collapsed(tmp_path, capsys) -> None:
+    prof_path = tmp_path / "run.prof"
+    folded_path = tmp_path / "run.folded"
+    main(["--steps", "2", "--interval", "0", "--no-clear", "--profile-dump", str(prof_path)])
+    main(["--steps", "2", "--interval", "0", "--no-clear", "--profile-dump", str(folded_path)])
+    capsys.readouterr()
+
+    import pstats
+
+    assert pstats.Stats(str(prof_path)).total_calls > 0
+    assert "simulation.step" in folded_path.read_text()
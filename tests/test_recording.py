@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.core.simulation import Simulation
+from ant.io.recording import Recording
+from ant.io.trajectory import open_replay
+from ant.topology.nonorientable import ProjectivePlaneTopology
+
+ANTS = ((1, 2, 2, Heading.NORTH), (2, 2, 3, Heading.EAST), (3, 6, 1, Heading.SOUTH))
+PLANE = ProjectivePlaneTopology(8, 7)
+
+
+def snapshot(sim: Simulation) -> tuple:
+    return (
+        sim.steps_executed,
+        [list(row) for row in sim.grid.cells],
+        sim.grid.trails,
+        [(ant.x, ant.y, ant.heading) for ant in sim.ants],
+    )
+
+
+@pytest.fixture
+def recorded(build_simulation, tmp_path):
+    path = tmp_path / "run.antseek"
+    sim = build_simulation(8, 7, ANTS, topology=PLANE, trail_lifetime=4, black=[(5, 5)])
+    states = [snapshot(sim)]
+    with sim.record(path, keyframe_interval=16, chunk_steps=5):
+        for _ in range(100):
+            sim.step()
+            states.append(snapshot(sim))
+    return path, states
+
+
+def test_state_at_matches_sequential_run(recorded) -> None:
+    path, states = recorded
+    recording = Recording(path)
+    assert recording.steps == 100
+    assert len(recording.segments) == 7
+    for step in (0, 1, 15, 16, 17, 63, 99, 100):
+        assert snapshot(recording.state_at(step)) == states[step]
+
+
+def test_seek_applies_at_most_one_interval(recorded, monkeypatch) -> None:
+    path, _states = recorded
+    recording = Recording(path)
+    requested = []
+    original = recording.move_block
+    monkeypatch.setattr(
+        recording, "move_block", lambda start, stop: requested.append(stop - start) or original(start, stop)
+    )
+    recording.state_at(95)
+    assert requested == [95 - 80]
+
+
+def test_replay_continues_after_seek(recorded) -> None:
+    path, states = recorded
+    replay = open_replay(path)
+    replay.seek(40)
+    replay.run(25)
+    assert snapshot(replay) == states[65]
+
+
+def test_seek_with_new_trail_lifetime_rebuilds_recent_trails(build_simulation, tmp_path) -> None:
+    path = tmp_path / "run.antseek"
+    sim = build_simulation(8, 7, ANTS, topology=PLANE, trail_lifetime=2, black=[(5, 5)])
+    with sim.record(path, keyframe_interval=10):
+        sim.run(30)
+    reference = build_simulation(8, 7, ANTS, topology=PLANE, trail_lifetime=6, black=[(5, 5)])
+    reference.run(30)
+    assert Recording(path).state_at(30, trail_lifetime=6).grid.trails == reference.grid.trails
+
+
+def test_cli_inspect_prints_requested_step(recorded, tmp_path, capsys) -> None:
+    path, states = recorded
+    out = tmp_path / "cells.npy"
+    assert main(["inspect", str(path), "--step", "42", "--no-color", "--npy", str(out)]) == 0
+    assert capsys.readouterr().out.startswith("steps=42\n")
+    assert np.load(out).tolist() == states[42][1]
+
+
+def test_cli_records_seekable_file(tmp_path, capsys) -> None:
+    path = tmp_path / "cli.antseek"
+    main(["--steps", "9", "--interval", "0", "--no-clear", "--record", str(path), "--keyframe-interval", "4"])
+    capsys.readouterr()
+    assert Recording(path).steps == 9
+
+
+def test_replay_starts_with_trails_from_before_the_recording(build_simulation, tmp_path) -> None:
+    path = tmp_path / "run.antseek"
+    sim = build_simulation(8, 7, ANTS, topology=PLANE, trail_lifetime=4, black=[(5, 5)])
+    sim.run(6)
+    states = [snapshot(sim)]
+    with sim.record(path, keyframe_interval=16):
+        for _ in range(10):
+            sim.step()
+            states.append(snapshot(sim))
+    replay = open_replay(path)
+    assert snapshot(replay) == states[0]
+    replay.run(3)
+    assert snapshot(replay) == states[3]
+
+
+def test_spawning_while_recording_is_refused(build_simulation, make_ant, tmp_path) -> None:
+    sim = build_simulation(8, 7, ANTS, topology=PLANE)
+    with sim.record(tmp_path / "run.antseek"):
+        with pytest.raises(ValueError, match="recorder"):
+            sim.add_ant(make_ant(9, 0, 0))
+    assert len(sim.ants) == 3
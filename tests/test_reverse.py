@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+from ant.cli import make_topology
+from ant.core.direction import Heading
+from ant.core.rules import Turmite, inverse_transition_table
+from ant.core.simulation import Simulation
+from ant.topology.base import GluedTopology
+
+
+def state(simulation: Simulation) -> tuple:
+    return (
+        simulation.steps_executed,
+        simulation.grid.clock,
+        simulation.grid.cells,
+        simulation.grid.trails,
+        [ant.fields() for ant in simulation.ants],
+    )
+
+
+ANTS = ((1, 4, 4, Heading.NORTH), (2, 0, 8, Heading.WEST), (3, 4, 5, Heading.EAST))
+
+
+@pytest.mark.parametrize("topology", ["torus", "klein", "projective", "cylinder", "mobius", "pillow"])
+@pytest.mark.parametrize("rule", ["RL", "LLRR", "{{{1,2,1},{0,8,0}},{{1,4,0},{0,1,1}}}"])
+def test_step_back_retraces_every_step(build_simulation, topology: str, rule: str) -> None:
+    simulation = build_simulation(9, 9, ANTS, topology=make_topology(topology, 9, 9), trail_lifetime=6, rule=rule)
+    history = [state(simulation)]
+    for _ in range(150):
+        simulation.step()
+        history.append(state(simulation))
+    for expected in reversed(history[:-1]):
+        simulation.step_back()
+        assert state(simulation) == expected
+
+
+def test_negative_run_rewinds_in_bulk(build_simulation) -> None:
+    simulation = build_simulation(9, 9, ANTS, topology=make_topology("mobius", 9, 9), trail_lifetime=6)
+    simulation.run(120)
+    expected = state(simulation)
+    simulation.run(300)
+    simulation.run(-300)
+    assert state(simulation) == expected
+    simulation.run(-120)
+    assert simulation.grid.count_nonzero() == 0
+    with pytest.raises(ValueError, match="only 0 have run"):
+        simulation.step_back()
+
+
+def test_walls_are_reversible(build_simulation) -> None:
+    topology = GluedTopology(3, 2, "")
+    simulation = build_simulation(3, 2, [(1, 1, 0, Heading.NORTH)], topology=topology)
+    simulation.run(50)
+    simulation.run(-50)
+    assert simulation.ants[0].fields() == (1, 1, 0, Heading.NORTH, "red", 0)
+    assert simulation.grid.count_nonzero() == 0
+
+
+def test_irreversible_setups_are_rejected(build_simulation) -> None:
+    simulation = build_simulation(9, 9, ANTS, topology=make_topology("sphere_diag", 9, 9))
+    simulation.run(5)
+    with pytest.raises(ValueError, match="not reversible"):
+        simulation.step_back()
+    assert simulation.steps_executed == 5
+
+    with pytest.raises(ValueError, match="not reversible"):
+        inverse_transition_table(Turmite.parse("{{{1,2,0},{1,8,0}}}"))
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from ant.cli import build_parser, main
+from ant.core.direction import HEADING_CODES, Heading, heading_to_step
+from ant.core.parallel import ParallelSimulation
+from ant.core.rules import LANGTON, Rule
+from ant.core.simulation import Ant, Simulation
+from ant.io.trajectory import open_replay
+from ant.renderers.ascii import AsciiRenderer
+
+
+def reference_run(rule: str, width: int, height: int, steps: int) -> tuple[list[list[int]], tuple[int, int, Heading]]:
+    """Straightforward generalized-ant loop used as an oracle for the table-driven engine."""
+
+    cells = [[0] * width for _ in range(height)]
+    x, y, heading = width // 2, height // 2, Heading.NORTH
+    for _ in range(steps):
+        state = cells[y][x]
+        letter = rule[state]
+        if letter == "R":
+            heading = heading.turn_right()
+        elif letter == "L":
+            heading = heading.turn_left()
+        elif letter == "U":
+            heading = heading.turn_right().turn_right()
+        cells[y][x] = (state + 1) % len(rule)
+        step = heading_to_step(heading)
+        x, y = (x + step.dx) % width, (y + step.dy) % height
+    return cells, (x, y, heading)
+
+
+def test_parse_builds_lookup_tables() -> None:
+    rule = Rule.parse("rlr")
+    assert rule.spec == "RLR"
+    assert rule.colors == 3
+    assert rule.next_state == (1, 2, 0)
+    ((white, black, _third),) = rule.transition_table()
+    north = HEADING_CODES[Heading.NORTH]
+    assert white == (1, white[1], 0) and white[1][north] == (HEADING_CODES[Heading.EAST], 1, 0)
+    assert black[1][north] == (HEADING_CODES[Heading.WEST], -1, 0)
+    assert LANGTON.spec == "RL"
+
+
+@pytest.mark.parametrize("spec", ["", "R", "RXL", "R" * 257])
+def test_parse_rejects_invalid_rules(spec: str) -> None:
+    with pytest.raises(ValueError):
+        Rule.parse(spec)
+
+
+@pytest.mark.parametrize("spec", ["RL", "RLR", "LLRR", "RRLLLRLLLRRR", "RNUL"])
+def test_engine_matches_reference(spec: str) -> None:
+    ant = Ant(ant_id=1, x=8, y=7, heading=Heading.NORTH, trail_color="red")
+    simulation = Simulation(16, 14, [ant], rule=spec)
+    simulation.run(900)
+    cells, (x, y, heading) = reference_run(spec, 16, 14, 900)
+    assert simulation.grid.cells == cells
+    assert (ant.x, ant.y, ant.heading) == (x, y, heading)
+    assert max(max(row) for row in cells) < len(spec)
+
+
+def test_parallel_and_replay_keep_the_rule(tmp_path) -> None:
+    ants = [
+        Ant(ant_id=1, x=4, y=10, heading=Heading.NORTH, trail_color="red"),
+        Ant(ant_id=2, x=40, y=10, heading=Heading.EAST, trail_color="blue"),
+    ]
+    sequential = Simulation(48, 20, [Ant(*ant.fields()) for ant in ants], rule="LLRR")
+    path = tmp_path / "run.antrec"
+    sequential.record(path)
+    sequential.run(300)
+    sequential.recorder.close()
+    with ParallelSimulation(48, 20, ants, workers=2, min_parallel_batch=1, rule="LLRR") as parallel:
+        parallel.run(300)
+        assert parallel.grid.cells == sequential.grid.cells
+
+    replay = open_replay(path)
+    assert replay.rule.spec == "LLRR"
+    replay.run(300)
+    assert replay.grid.cells == sequential.grid.cells
+
+
+def test_ascii_renderer_uses_palette() -> None:
+    simulation = Simulation(3, 1, [], rule="RLR")
+    simulation.grid.set_state(1, 0, 1)
+    simulation.grid.set_state(2, 0, 2)
+    render = AsciiRenderer(use_color=False, palette="abc").render(simulation)
+    assert render.splitlines()[1].split() == ["a", "b", "c"]
+
+
+def test_cli_rule_option(capsys: pytest.CaptureFixture[str]) -> None:
+    args = build_parser().parse_args(["--rule", "llrr"])
+    assert args.rule == Rule.parse("LLRR")
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--rule", "RQ"])
+    assert "Unknown turn letter" in capsys.readouterr().err
+    main(["--rule", "RLR", "--steps", "5", "--steps-per-frame", "5", "--interval", "0", "--no-clear", "--no-color"])
+    assert "steps=5" in capsys.readouterr().out
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import io
+import re
+
+import pytest
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.renderers import AsciiRenderer
+from ant.renderers.live import LiveAsciiRunner
+from ant.renderers.schedule import (
+    ChangeSchedule,
+    GeometricSchedule,
+    StepListSchedule,
+    explored_bbox,
+    parse_schedule,
+)
+
+CENTERED = [(1, 20, 20, Heading.NORTH)]
+
+
+@pytest.fixture
+def frame_steps(build_simulation):
+    def run(schedule, total: int | None) -> list[int]:
+        simulation = build_simulation(40, 40, CENTERED, trail_lifetime=0)
+        stream = io.StringIO()
+        runner = LiveAsciiRunner(
+            simulation,
+            renderer=AsciiRenderer(use_color=False),
+            interval=0,
+            clear_screen=False,
+            stream=stream,
+            schedule=schedule,
+        )
+        runner.run(total)
+        return [int(step) for step in re.findall(r"steps=(\d+)", stream.getvalue())]
+
+    return run
+
+
+def test_log_schedule_bounds_frame_count(frame_steps) -> None:
+    schedule = StepListSchedule.logarithmic(6, 100_000)
+    assert schedule.steps == [1, 10, 100, 1_000, 10_000, 100_000]
+    assert frame_steps(schedule, 100_000) == [0, 1, 10, 100, 1_000, 10_000, 100_000]
+    assert len(StepListSchedule.logarithmic(50, 10**8)) <= 50
+
+
+def test_explicit_steps_end_with_the_run(frame_steps) -> None:
+    assert frame_steps(parse_schedule("steps:5,50,500"), 120) == [0, 5, 50, 120]
+    assert frame_steps(parse_schedule("every:40"), 100) == [0, 40, 80, 100]
+
+
+def test_geometric_schedule_never_repeats_a_step() -> None:
+    schedule = GeometricSchedule(1.5)
+    targets = [0]
+    while targets[-1] < 100:
+        targets.append(schedule.next_frame(targets[-1]))
+    assert targets[:6] == [0, 1, 2, 3, 4, 6]
+    assert all(b > a for a, b in zip(targets, targets[1:]))
+
+
+def test_change_schedule_fires_when_bbox_grows(build_simulation) -> None:
+    simulation = build_simulation(40, 40, CENTERED, trail_lifetime=0)
+    stats = simulation.track_statistics()
+    schedule = ChangeSchedule(explored_bbox, every=10)
+    boxes = [explored_bbox(simulation)]
+    elapsed = 0
+    while elapsed < 2_000:
+        elapsed += schedule.advance(simulation, elapsed, 2_000 - elapsed)
+        boxes.append(explored_bbox(simulation))
+    assert boxes[0] is None and boxes[-1] == stats.bbox
+    assert len(boxes) < 200
+    changes = boxes[:-1]  # the last frame marks the end of the run
+    assert all(before != after for before, after in zip(changes, changes[1:]))
+    assert simulation.steps_executed == 2_000
+
+
+def test_change_metrics_need_attached_statistics(build_simulation, monkeypatch) -> None:
+    simulation = build_simulation(40, 40, CENTERED, trail_lifetime=0)
+    schedule = parse_schedule("change:colored", 1_000)
+    with pytest.raises(ValueError, match="track_statistics"):
+        schedule.advance(simulation, 0, 1_000)
+    assert simulation.stats is None and simulation.steps_executed == 0
+
+    stats = simulation.track_statistics()
+
+    def full_scan(*_args):
+        raise AssertionError("change metrics must not scan the grid")
+
+    monkeypatch.setattr(simulation.grid, "count_nonzero", full_scan)
+    monkeypatch.setattr(simulation.grid, "cell_bytes", full_scan)
+    assert schedule.advance(simulation, 0, 1_000) == 1  # every early step paints a cell
+    assert stats.black_cells == int(simulation.grid.cell_array().astype(bool).sum())
+
+
+def test_change_schedule_is_always_bounded(build_simulation) -> None:
+    simulation = build_simulation(40, 40, CENTERED, trail_lifetime=0)
+    simulation.track_statistics()
+    frozen = ChangeSchedule(lambda _simulation: 0, every=3)
+    with pytest.raises(ValueError, match="max_gap"):
+        frozen.advance(simulation, 0)
+    assert frozen.advance(simulation, 0, 10) == 10
+    assert parse_schedule("change:bbox,max_gap=7").advance(simulation, 10) <= 7
+    with pytest.raises(ValueError, match="max_gap"):
+        parse_schedule("change:bbox")
+
+
+@pytest.mark.parametrize("spec", ["log:5", "change:ants", "steps:1,x", "fps:3", "every:0"])
+def test_invalid_specs(spec: str) -> None:
+    with pytest.raises(ValueError):
+        parse_schedule(spec)
+
+
+def test_cli_frame_schedule(capsys: pytest.CaptureFixture[str]) -> None:
+    args = ["--backend", "ascii", "--no-color", "--no-clear", "--interval", "0", "--steps", "1000"]
+    assert main([*args, "--frame-schedule", "log:4"]) == 0
+    assert re.findall(r"steps=(\d+)", capsys.readouterr().out) == ["0", "1", "10", "100", "1000"]
+    with pytest.raises(SystemExit):
+        main([*args, "--frame-schedule", "log:x"])
+    assert main([*args, "--frame-schedule", "change:colored,every=100"]) == 0  # the CLI attaches statistics
+    steps = re.findall(r"steps=(\d+)", capsys.readouterr().out)
+    assert steps[0] == "0" and steps[-1] == "1000"
+
+
+def test_mpl_animator_follows_schedule(build_simulation, tmp_path) -> None:
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    from PIL import Image
+
+    from ant.renderers.mpl import MatplotlibAnimator
+
+    simulation = build_simulation(40, 40, CENTERED, trail_lifetime=0)
+    animator = MatplotlibAnimator(simulation, figure_size=(2, 2), schedule=StepListSchedule.logarithmic(5, 10_000))
+    animator.run(10_000, show=False, save_path=str(tmp_path / "log.gif"), save_kwargs={"writer": "pillow", "fps": 5})
+    with Image.open(tmp_path / "log.gif") as image:
+        assert image.n_frames == 6
+    assert simulation.steps_executed == 10_000
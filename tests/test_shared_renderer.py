@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+
+from ant.cli import main
+from ant.renderers.ascii import AsciiRenderer
+from ant.renderers.shared import SharedFrameBuffer, SharedSnapshotView, start_publisher
+
+
+def test_snapshot_view_matches_published_state(build_simulation) -> None:
+    simulation = build_simulation(trail_lifetime=5)
+    simulation.run(37)
+    buffer = SharedFrameBuffer(12, 10, 2)
+    try:
+        assert buffer.publish(simulation)
+        view = SharedSnapshotView(buffer, simulation)
+        renderer = AsciiRenderer(use_color=False)
+        assert renderer.render(view) == renderer.render(simulation)
+        assert view.steps_executed == 37
+        assert view.grid.cells == simulation.grid.cells
+    finally:
+        buffer.close()
+
+
+def test_publish_skips_slot_pinned_by_reader(build_simulation) -> None:
+    simulation = build_simulation(trail_lifetime=5)
+    buffer = SharedFrameBuffer(12, 10, 2)
+    try:
+        assert buffer.publish(simulation)
+        pinned = buffer.acquire()
+        simulation.run(1)
+        assert buffer.publish(simulation)  # writes the other slot
+        simulation.run(1)
+        assert not buffer.publish(simulation)  # only free slot is still pinned
+        assert buffer.skipped == 1
+        assert buffer.ant_state(pinned)[0] == 0
+        assert buffer.ant_state(buffer.acquire())[0] == 1
+    finally:
+        buffer.close()
+
+
+def test_publisher_process_delivers_final_state(build_simulation) -> None:
+    simulation = build_simulation(trail_lifetime=5)
+    expected = build_simulation(trail_lifetime=5)
+    expected.run(250)
+    buffer = SharedFrameBuffer(12, 10, 2)
+    try:
+        process = start_publisher(simulation, buffer, steps=250, steps_per_publish=10)
+        process.join(timeout=30)
+        assert process.exitcode == 0
+        assert buffer.done
+        view = SharedSnapshotView(buffer, simulation)
+        assert view.steps_executed == 250
+        assert view.grid.cells == expected.grid.cells
+        assert [(ant.x, ant.y, ant.heading) for ant in view.ants] == [
+            (ant.x, ant.y, ant.heading) for ant in expected.ants
+        ]
+    finally:
+        buffer.close()
+
+
+def test_cli_render_process_rejects_conflicting_options(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        main(["--backend", "mpl", "--render-process", "--save-path", "out.gif"])
+    assert "--save-path" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(["--render-process"])
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.core.parallel import ParallelSimulation
+from ant.io import snapshots
+from ant.io.snapshots import SnapshotWriter, snapshot_palette
+
+ANTS = ((1, 10, 12, Heading.NORTH), (2, 30, 20, Heading.EAST))
+
+
+@pytest.fixture
+def states_at(build_simulation):
+    def run(steps: list[int]) -> list:
+        simulation = build_simulation(40, 32, ANTS, rule="RLR")
+        grids = []
+        for step in steps:
+            simulation.run(step - simulation.steps_executed)
+            grids.append(simulation.grid.cell_array().copy())
+        return grids
+
+    return run
+
+
+def test_periodic_npy_snapshots_match_the_run(build_simulation, states_at, tmp_path) -> None:
+    simulation = build_simulation(40, 32, ANTS, rule="RLR")
+    with simulation.take_snapshots(tmp_path, every=50, format="npy") as writer:
+        simulation.run(220)
+    assert [path.name for path in writer.written] == [f"step{step:010d}.npy" for step in (50, 100, 150, 200)]
+    for path, expected in zip(writer.written, states_at([50, 100, 150, 200])):
+        np.testing.assert_array_equal(np.load(path), expected)
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_png_snapshots_are_palette_images(build_simulation, states_at, tmp_path) -> None:
+    image_module = pytest.importorskip("PIL.Image")
+    simulation = build_simulation(40, 32, ANTS, rule="RLR")
+    with simulation.take_snapshots(tmp_path, every=300) as writer:
+        simulation.run(300)
+    with image_module.open(writer.written[0]) as image:
+        assert image.mode == "P"
+        np.testing.assert_array_equal(np.asarray(image), states_at([300])[0])
+        palette = image.getpalette()[:9]
+    assert palette == [channel for color in snapshot_palette(3) for channel in color]
+
+
+def test_in_flight_snapshots_are_bounded(build_simulation, tmp_path, monkeypatch) -> None:
+    release = threading.Event()
+    original = snapshots.encode_npy
+
+    def slow_encode(*args):
+        release.wait(5)
+        return original(*args)
+
+    monkeypatch.setattr(snapshots, "encode_npy", slow_encode)
+    simulation = build_simulation(40, 32, ANTS, rule="RLR")
+    writer = simulation.take_snapshots(tmp_path, every=1, format="npy", workers=1, max_pending=2)
+    simulation.run(2)  # two copies queued while the writer is stuck: the run carries on
+    third = threading.Thread(target=simulation.run, args=(1,))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()  # a third copy would exceed max_pending
+    release.set()
+    third.join(5)
+    writer.close()
+    assert len(writer.written) == 3
+
+
+def test_failed_writes_surface_on_close(build_simulation, tmp_path, monkeypatch) -> None:
+    def broken(*_args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshots, "encode_png", broken)
+    writer = SnapshotWriter(tmp_path, every=1)
+    writer.capture(build_simulation(40, 32, ANTS, rule="RLR"))
+    with pytest.raises(OSError, match="disk full"):
+        writer.close()
+    with pytest.raises(ValueError):
+        SnapshotWriter(tmp_path, every=1, format="gif")
+
+
+def test_parallel_runs_stop_at_snapshot_steps(build_simulation, states_at, tmp_path) -> None:
+    with build_simulation(
+        40, 32, ANTS, cls=ParallelSimulation, rule="RLR", workers=2, min_parallel_batch=2
+    ) as simulation:
+        with simulation.take_snapshots(tmp_path, every=37, format="npy") as writer:
+            simulation.run(150)
+        assert simulation.parallel_steps > 0
+    assert len(writer.written) == 4
+    for path, expected in zip(writer.written, states_at([37, 74, 111, 148])):
+        np.testing.assert_array_equal(np.load(path), expected)
+
+
+def test_cli_snapshot_every(tmp_path) -> None:
+    args = ["--backend", "none", "--width", "16", "--height", "16", "--steps", "100", "--progress-interval", "0"]
+    assert main([*args, "--snapshot-every", "25", "--snapshot-dir", str(tmp_path), "--snapshot-format", "npy"]) == 0
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"step{step:010d}.npy" for step in (25, 50, 75, 100)]
+    with pytest.raises(SystemExit):
+        main([*args, "--snapshot-dir", str(tmp_path)])
+
+
+def test_cli_replay_writes_snapshots(tmp_path) -> None:
+    recording, direct, replayed = tmp_path / "run.antrec", tmp_path / "direct", tmp_path / "replayed"
+    args = ["--backend", "none", "--width", "16", "--height", "16", "--steps", "60", "--progress-interval", "0"]
+    snapshot = ["--snapshot-every", "20", "--snapshot-format", "npy", "--snapshot-dir"]
+    assert main([*args, "--record", str(recording), *snapshot, str(direct)]) == 0
+    assert main([*args, "--replay", str(recording), *snapshot, str(replayed)]) == 0
+    names = sorted(path.name for path in direct.iterdir())
+    assert names == [f"step{step:010d}.npy" for step in (20, 40, 60)]
+    assert sorted(path.name for path in replayed.iterdir()) == names
+    for name in names:
+        np.testing.assert_array_equal(np.load(replayed / name), np.load(direct / name))
+
+
+def test_rewinding_is_refused_while_taking_snapshots(build_simulation, tmp_path) -> None:
+    simulation = build_simulation(40, 32, ANTS, rule="RLR")
+    with simulation.take_snapshots(tmp_path, every=5, format="npy") as writer:
+        simulation.run(10)
+        with pytest.raises(ValueError, match="snapshots"):
+            simulation.step_back()
+    assert simulation.steps_executed == 10
+    assert len(writer.written) == 2
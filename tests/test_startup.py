@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import ant.renderers
+
+# Generous enough for slow CI machines; the ASCII path typically needs tens of milliseconds.
+IMPORT_BUDGET_US = int(os.environ.get("ANT_IMPORT_BUDGET_MS", "300")) * 1000
+HEAVY_MODULES = ("numpy", "matplotlib", "multiprocessing")
+
+
+def import_times(statement: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_skips_heavy_modules_and_meets_budget() -> None:
+    times = import_times("import ant.cli")
+    loaded = {name.split(".")[0] for name in times}
+    assert loaded.isdisjoint(HEAVY_MODULES)
+    assert times["ant.cli"] < IMPORT_BUDGET_US
+
+
+def test_ascii_run_never_imports_numpy_or_matplotlib() -> None:
+    code = (
+        "import sys\n"
+        "from ant.cli import main\n"
+        "main(['--steps', '50', '--steps-per-frame', '50', '--interval', '0', '--no-clear', '--no-color'])\n"
+        "print(','.join(sorted(m for m in ('numpy', 'matplotlib') if m in sys.modules)))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == ""
+
+
+def test_lazy_renderer_exports_resolve() -> None:
+    pytest.importorskip("matplotlib")
+    from ant.renderers.mpl import MatplotlibAnimator
+
+    assert ant.renderers.MatplotlibAnimator is MatplotlibAnimator
+    with pytest.raises(AttributeError):
+        ant.renderers.NoSuchRenderer  # noqa: B018
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import csv
+
+import numpy as np
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.core.simulation import Ant, Simulation
+from ant.io.columnar import open_column_writer
+from ant.topology.nonorientable import ProjectivePlaneTopology
+
+
+def count_black(sim: Simulation) -> int:
+    return sum(1 for row in sim.grid.cells for state in row if state)
+
+
+def test_incremental_stats_match_full_rescan() -> None:
+    ants = [
+        Ant(ant_id=1, x=2, y=2, heading=Heading.NORTH, trail_color="red"),
+        Ant(ant_id=2, x=5, y=4, heading=Heading.WEST, trail_color="blue"),
+    ]
+    sim = Simulation(width=7, height=6, ants=ants, topology=ProjectivePlaneTopology(7, 6))
+    sim.grid.set_state(0, 0, 1)
+    stats = sim.track_statistics()
+    visited: set[tuple[int, int]] = set()
+    for _ in range(300):
+        visited.update((ant.x, ant.y) for ant in sim.ants)
+        sim.step()
+        assert stats.black_cells == count_black(sim)
+
+    assert stats.unique_visited == len(visited)
+    xs = [x for x, _ in visited]
+    ys = [y for _, y in visited]
+    assert stats.bbox == (min(xs), min(ys), max(xs), max(ys))
+
+
+def test_displacement_is_unwrapped() -> None:
+    ant = Ant(ant_id=3, x=0, y=0, heading=Heading.WEST, trail_color="red")
+    sim = Simulation(width=4, height=4, ants=[ant])
+    stats = sim.track_statistics()
+    sim.step()
+    assert stats.displacement(3) == (0, -1)
+    assert (sim.ant_by_id(3).x, sim.ant_by_id(3).y) == (0, 3)
+
+
+def test_ants_spawned_after_tracking_get_displacement() -> None:
+    sim = Simulation(width=6, height=6, ants=[Ant(ant_id=1, x=1, y=1, heading=Heading.NORTH, trail_color="red")])
+    stats = sim.track_statistics()
+    sim.run(3)
+    sim.add_ant(Ant(ant_id=9, x=4, y=4, heading=Heading.EAST, trail_color="blue"))
+    assert stats.displacement(9) == (0, 0)
+    sim.step()
+    assert stats.displacement(9) == (0, 1)  # white cell: turn right, from east to south
+    assert stats.black_cells == count_black(sim)
+
+
+def test_spawning_mid_run_keeps_the_csv_columns(tmp_path) -> None:
+    sim = Simulation(width=6, height=6, ants=[Ant(ant_id=1, x=1, y=1, heading=Heading.NORTH, trail_color="red")])
+    path = tmp_path / "stats.csv"
+    writer = open_column_writer(path)
+    stats = sim.track_statistics(every=2, sink=writer)
+    sim.run(3)
+    sim.add_ant(Ant(ant_id=9, x=4, y=4, heading=Heading.EAST, trail_color="blue"))
+    sim.run(3)
+    writer.close()
+    with path.open() as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["step"] for row in rows] == ["0", "2", "4", "6"]
+    assert "ant9_dx" not in rows[0]
+    assert stats.displacement(9) != (0, 0)
+
+
+def test_stats_sampled_into_npz(tmp_path) -> None:
+    ant = Ant(ant_id=1, x=3, y=3, heading=Heading.NORTH, trail_color="red")
+    sim = Simulation(width=8, height=8, ants=[ant])
+    path = tmp_path / "stats.npz"
+    with open_column_writer(path) as writer:
+        sim.track_statistics(every=5, sink=writer)
+        sim.run(20)
+
+    data = np.load(path)
+    assert data["step"].tolist() == [0, 5, 10, 15, 20]
+    assert data["black_cells"][0] == 0
+    assert data["ant1_dx"].dtype == np.int64
+
+
+def test_cli_stats_out_writes_csv(tmp_path, capsys) -> None:
+    path = tmp_path / "stats.csv"
+    main(["--steps", "7", "--interval", "0", "--no-clear", "--stats-out", str(path), "--stats-every", "3"])
+    capsys.readouterr()
+    with path.open() as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["step"] for row in rows] == ["0", "3", "6", "7"]
+    assert "ant2_dy" in rows[0]
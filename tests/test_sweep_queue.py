@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import csv
+import os
+import time
+
+import pytest
+
+from ant.cli import main, make_topology
+from ant.sweep import SweepConfig, run_rule
+from ant.sweep_queue import SweepQueue, run_workers
+from ant.topology.base import GluedTopology
+
+SPECS = ["RL", "RLR", "LLRR", "RRL", "LRRRRRLLR", "RLLR"]
+
+
+def test_worker_processes_share_one_queue(tmp_path) -> None:
+    config = SweepConfig(width=24, height=24, steps=300, topology=make_topology("mobius", 24, 24))
+    queue = SweepQueue.create(tmp_path / "queue", config)
+    queue.submit(SPECS)
+    assert queue.status() == {"jobs": len(SPECS), "done": 0, "pending": len(SPECS)}
+
+    assert run_workers(queue, 3, poll=0.05) == len(SPECS)
+    assert queue.status()["pending"] == 0
+    assert list(queue.summaries()) == [run_rule(spec, config) for spec in SPECS]
+    assert not list(queue.leases.iterdir())
+
+
+def test_expired_lease_is_reclaimed(tmp_path) -> None:
+    queue = SweepQueue.create(tmp_path, SweepConfig(width=16, height=16, steps=100), lease_seconds=5)
+    (job_id,) = queue.submit(["RL"])
+    lease = queue.claim(job_id, "dead-worker")
+    assert lease is not None
+    assert queue.claim(job_id, "other") is None
+    assert queue.work(wait=False) == 0  # still leased: nothing to do yet
+
+    past = time.time() - 10
+    os.utime(lease.path, (past, past))
+    assert queue.work(wait=False) == 1
+    assert queue.done(job_id)
+    assert [row["rule"] for row in queue.summaries()] == ["RL"]
+
+
+def test_reopening_requires_matching_settings(tmp_path) -> None:
+    config = SweepConfig(width=16, height=16, steps=100, topology=GluedTopology(16, 16, "left~right", reorient=False))
+    SweepQueue.create(tmp_path, config).submit(["RL"])
+    reopened = SweepQueue.create(tmp_path, config)
+    assert reopened.submit(["RLR"]) == ["00000001"]
+    topology = reopened.config().topology
+    assert type(topology) is GluedTopology and topology.gluing == "left~right" and not topology.reorient
+    with pytest.raises(ValueError, match="different settings"):
+        SweepQueue.create(tmp_path, SweepConfig(width=16, height=16, steps=200))
+    with pytest.raises(ValueError, match="not a sweep queue"):
+        SweepQueue(tmp_path / "missing").settings()
+
+
+def test_cli_sweep_queue_submits_and_joins(tmp_path) -> None:
+    queue = tmp_path / "queue"
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    common = ["--steps", "2048", "--width", "16", "--height", "16", "--jobs", "2"]
+    assert main(["sweep", "--rule", "RL", "--rule", "RLR", "--queue", str(queue), *common, "--out", str(first)]) == 0
+    assert main(["sweep", "--queue", str(queue), "--jobs", "1", "--out", str(second)]) == 0
+    with first.open() as handle:
+        rows = list(csv.DictReader(handle))
+    assert [(row["rule"], row["steps"]) for row in rows] == [("RL", "2048"), ("RLR", "2048")]
+    assert second.read_text() == first.read_text()
+    assert any((queue / "cache").glob("*/2048.npz"))  # checkpoints live in the queue
+
+    with pytest.raises(SystemExit):
+        main(["sweep", "--rule", "RL", "--lease", "5"])
+    with pytest.raises(SystemExit):
+        main(["sweep", "--queue", str(tmp_path / "missing")])
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.io.trajectory import ReplaySimulation, Trajectory, _topology_for, open_replay
+from ant.renderers import AsciiRenderer
+from ant.renderers.live import LiveAsciiRunner
+from ant.topology.base import GluedTopology
+from ant.topology.nonorientable import KleinBottleTopology
+
+ANTS = ((1, 1, 1, Heading.NORTH), (4, 4, 3, Heading.WEST))
+KLEIN = KleinBottleTopology(6, 5)
+
+
+def test_recording_replays_identical_state(build_simulation, tmp_path) -> None:
+    path = tmp_path / "run.antrec"
+    sim = build_simulation(6, 5, ANTS, topology=KLEIN, trail_lifetime=3, black=[(2, 2)])
+    with sim.record(path, chunk_steps=7):
+        sim.run(50)
+
+    trajectory = Trajectory(path)
+    assert trajectory.steps == 50
+    assert trajectory.records.dtype.itemsize == 10
+
+    replay = ReplaySimulation(trajectory)
+    replay.run(50)
+    assert replay.grid.cells == sim.grid.cells
+    assert replay.grid.trails == sim.grid.trails
+    assert [(a.x, a.y, a.heading) for a in replay.ants] == [(a.x, a.y, a.heading) for a in sim.ants]
+    assert isinstance(replay.topology, KleinBottleTopology)
+    with pytest.raises(IndexError):
+        replay.step()
+
+
+def test_replay_accepts_new_trail_lifetime(build_simulation, tmp_path) -> None:
+    path = tmp_path / "run.antrec"
+    sim = build_simulation(6, 5, ANTS, topology=KLEIN, trail_lifetime=3, black=[(2, 2)])
+    with sim.record(path):
+        sim.run(10)
+
+    replay = open_replay(path, trail_lifetime=0)
+    replay.run(10)
+    assert replay.grid.cells == sim.grid.cells
+    assert all(trail is None for row in replay.grid.trails for trail in row)
+
+
+def test_replay_drives_ascii_runner(build_simulation, tmp_path) -> None:
+    path = tmp_path / "run.antrec"
+    sim = build_simulation(6, 5, ANTS, topology=KLEIN, trail_lifetime=3, black=[(2, 2)])
+    with sim.record(path):
+        sim.run(4)
+
+    buffer = io.StringIO()
+    runner = LiveAsciiRunner(
+        open_replay(path),
+        renderer=AsciiRenderer(use_color=False),
+        interval=0.0,
+        clear_screen=False,
+        stream=buffer,
+        steps_per_frame=2,
+    )
+    runner.run(total_steps=4)
+    assert buffer.getvalue().count("steps=") == 3
+
+
+def test_cli_record_then_replay(tmp_path, capsys) -> None:
+    path = tmp_path / "cli.antrec"
+    main(["--steps", "6", "--interval", "0", "--no-clear", "--no-color", "--record", str(path)])
+    recorded = capsys.readouterr().out
+    main(["--steps", "100", "--interval", "0", "--no-clear", "--no-color", "--replay", str(path)])
+    replayed = capsys.readouterr().out
+    assert replayed == recorded
+
+
+def test_replay_feeds_run_statistics(build_simulation, tmp_path) -> None:
+    path = tmp_path / "run.antrec"
+    sim = build_simulation(6, 5, ANTS, topology=KLEIN, trail_lifetime=3, black=[(2, 2)])
+    expected = sim.track_statistics()
+    with sim.record(path):
+        sim.run(200)  # crosses the Klein bottle's twisted seam
+
+    replay = open_replay(path)
+    stats = replay.track_statistics()
+    replay.run(200)
+    assert (stats.black_cells, stats.unique_visited, stats.bbox) == (
+        expected.black_cells,
+        expected.unique_visited,
+        expected.bbox,
+    )
+    assert [stats.displacement(ant_id) for ant_id in (1, 4)] == [expected.displacement(ant_id) for ant_id in (1, 4)]
+
+
+def test_recording_keeps_glued_topology(build_simulation, tmp_path) -> None:
+    path = tmp_path / "run.antrec"
+    topology = GluedTopology(6, 5, "left~right", reorient=False)
+    sim = build_simulation(6, 5, [(1, 2, 2, Heading.WEST)], topology=topology)
+    with sim.record(path):
+        sim.run(30)
+
+    replay = open_replay(path)
+    assert type(replay.topology) is GluedTopology
+    assert (replay.topology.gluing, replay.topology.reorient) == ("left~right", False)
+
+    meta = dict(Trajectory(path).meta, topology="KleinBottleTopology")  # format of older recordings
+    assert isinstance(_topology_for(meta), KleinBottleTopology)
+    for unknown in ("NoSuchTopology", {"class": "ant.topology.base:NoSuchTopology"}):
+        with pytest.raises(ValueError, match="Unknown topology"):
+            _topology_for(dict(meta, topology=unknown))
+
+
+def test_cli_replay_writes_recorded_statistics(tmp_path, capsys) -> None:
+    path = tmp_path / "cli.antrec"
+    recorded, replayed = tmp_path / "recorded.csv", tmp_path / "replayed.csv"
+    common = ["--steps", "40", "--interval", "0", "--no-clear", "--stats-every", "10"]
+    main([*common, "--record", str(path), "--stats-out", str(recorded)])
+    main([*common, "--replay", str(path), "--stats-out", str(replayed)])
+    capsys.readouterr()
+    assert replayed.read_text() == recorded.read_text()
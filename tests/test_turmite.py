@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import csv
+import random
+
+import pytest
+
+from ant.cli import main
+from ant.core.direction import Heading
+from ant.core.parallel import ParallelSimulation
+from ant.core.rules import Turmite, as_rule, load_rules
+from ant.core.simulation import Ant, Simulation
+from ant.sweep import SweepConfig, run_rule, sweep
+
+LANGTON_GOLLY = "{{{1, 2, 0}, {0, 8, 0}}}"
+FIBONACCI = "{{{1,2,1},{1,8,1}},{{1,2,1},{0,1,0}}}"
+
+
+def center_ant() -> Ant:
+    return Ant(ant_id=1, x=20, y=20, heading=Heading.NORTH, trail_color="red")
+
+
+def test_golly_notation_round_trips() -> None:
+    turmite = Turmite.parse(FIBONACCI)
+    assert (turmite.states, turmite.colors) == (2, 2)
+    assert turmite.write == (1, 1, 1, 0)
+    assert turmite.turns == (1, -1, 1, 0)
+    assert turmite.next_state == (1, 1, 1, 0)
+    assert Turmite.parse(turmite.spec) == turmite
+    assert isinstance(as_rule(FIBONACCI), Turmite)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        "{{{1,2,0},{0,8}}}",  # short transition
+        "{{{2,2,0},{0,8,0}}}",  # write color out of range
+        "{{{1,2,1},{0,8,0}}}",  # next state out of range
+        "{{{1,3,0},{0,8,0}}}",  # unknown turn code
+        "{{{1,2,0},{0,8,0}},{{1,2,0}}}",  # ragged color count
+        "{{{1,2,0}",
+    ],
+)
+def test_invalid_turmites_are_rejected(spec: str) -> None:
+    with pytest.raises(ValueError):
+        Turmite.parse(spec)
+
+
+def test_single_state_turmite_matches_turn_string() -> None:
+    classic = Simulation(40, 40, [center_ant()], rule="RL")
+    golly = Simulation(40, 40, [center_ant()], rule=LANGTON_GOLLY)
+    classic.run(3000)
+    golly.run(3000)
+    assert golly.grid.cells == classic.grid.cells
+
+
+def test_internal_state_drives_transitions() -> None:
+    ant = center_ant()
+    simulation = Simulation(40, 40, [ant], rule=FIBONACCI)
+    simulation.step()  # state 0 on color 0: write 1, turn right, enter state 1
+    assert (ant.state, ant.heading, simulation.grid.get_state(20, 20)) == (1, Heading.EAST, 1)
+    simulation.step()  # state 1 on color 0: write 1, turn right, stay in state 1
+    assert (ant.state, ant.heading) == (1, Heading.SOUTH)
+
+
+def test_parallel_workers_carry_ant_state() -> None:
+    def ants() -> list[Ant]:
+        return [
+            Ant(ant_id=1, x=5, y=10, heading=Heading.NORTH, trail_color="red"),
+            Ant(ant_id=2, x=45, y=10, heading=Heading.SOUTH, trail_color="blue"),
+        ]
+
+    sequential = Simulation(60, 20, ants(), rule=FIBONACCI)
+    sequential.run(200)
+    with ParallelSimulation(60, 20, ants(), workers=2, min_parallel_batch=1, rule=FIBONACCI) as parallel:
+        parallel.run(200)
+        assert parallel.grid.cells == sequential.grid.cells
+        assert [ant.state for ant in parallel.ants] == [ant.state for ant in sequential.ants]
+
+
+def test_load_rules_skips_comments(tmp_path) -> None:
+    path = tmp_path / "rules.txt"
+    path.write_text("# classic\nRL\n\nLLRR  # symmetric\n" + FIBONACCI + "\n")
+    assert [rule.spec for rule in load_rules(path)] == ["RL", "LLRR", Turmite.parse(FIBONACCI).spec]
+    path.write_text("RL\nRQ\n")
+    with pytest.raises(ValueError, match=":2:"):
+        load_rules(path)
+
+
+def test_sweep_pool_matches_inline_runs() -> None:
+    rng = random.Random(3)
+    specs = ["RL", "RLR"] + [Turmite.random(2, 3, rng).spec for _ in range(6)]
+    config = SweepConfig(width=32, height=32, steps=400)
+    pooled = list(sweep(specs, config, jobs=2, chunksize=3))
+    assert pooled == [run_rule(spec, config) for spec in specs]
+    assert pooled[0]["rule"] == "RL"
+    assert pooled[0]["colored_cells"] > 0
+
+
+def test_cli_sweep_writes_csv(tmp_path) -> None:
+    out = tmp_path / "sweep.csv"
+    exit_code = main(
+        ["sweep", "--rule", "RL", "--random", "3", "--seed", "1", "--steps", "100",
+         "--width", "16", "--height", "16", "--jobs", "1", "--out", str(out)]
+    )
+    assert exit_code == 0
+    with out.open() as handle:
+        rows = list(csv.DictReader(handle))
+    assert len(rows) == 4
+    assert rows[0]["rule"] == "RL"
+    assert rows[0]["steps"] == "100"
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ant.cli import main
+from ant.core.direction import Heading
+
+
+def test_counts_and_last_visits_follow_the_ants(build_simulation, make_ant) -> None:
+    simulation = build_simulation(trail_lifetime=3)
+    visits = simulation.track_visits(per_ant=True)
+    expected = np.zeros((10, 12), dtype=np.uint64)
+    last = {1: np.zeros_like(expected), 4: np.zeros_like(expected)}
+    for step in range(1, 301):
+        for ant in simulation.ants:
+            expected[ant.y, ant.x] += 1
+            last[ant.ant_id][ant.y, ant.x] = step
+        simulation.step()
+    counts = visits.count_array()
+    assert counts.dtype == np.uint64
+    np.testing.assert_array_equal(counts, expected)
+    for ant_id, values in last.items():
+        np.testing.assert_array_equal(visits.last_visit_array(ant_id), values)
+
+    spawned = simulation.add_ant(make_ant(9, 0, 0, Heading.SOUTH))
+    simulation.step()
+    assert visits.last_visit_array(9)[0, 0] == 301
+    assert counts.sum() == 601 + 2 and spawned.position() != (0, 0)
+    with pytest.raises(ValueError, match="visit counts"):
+        simulation.step_back()
+
+
+def test_counts_do_not_wrap_at_32_bits(build_simulation) -> None:
+    simulation = build_simulation(trail_lifetime=3)
+    visits = simulation.track_visits()
+    visits.counts[0] = 2**32 - 1
+    visits.record(0, 0, 0, 1)
+    assert visits.count_array()[0, 0] == 2**32
+
+
+def test_last_visits_are_opt_in(build_simulation) -> None:
+    visits = build_simulation(trail_lifetime=3).track_visits()
+    assert visits.last_visits is None
+    with pytest.raises(ValueError, match="per_ant=True"):
+        visits.last_visit_array(1)
+
+
+def test_heatmap_export(build_simulation, tmp_path) -> None:
+    pytest.importorskip("matplotlib")
+    simulation = build_simulation(trail_lifetime=3)
+    visits = simulation.track_visits(per_ant=True)
+    simulation.run(200)
+    visits.save(tmp_path / "counts.npy")
+    np.testing.assert_array_equal(np.load(tmp_path / "counts.npy"), visits.count_array())
+    visits.save(tmp_path / "counts.png")
+    visits.save(tmp_path / "ant.png", ant_id=4)
+    for name in ("counts.png", "ant.png"):
+        assert (tmp_path / name).read_bytes().startswith(b"\x89PNG")
+    with pytest.raises(ValueError, match="Unsupported heatmap format"):
+        visits.save(tmp_path / "counts.txt")
+
+
+def test_mpl_overlay_tracks_counts(build_simulation) -> None:
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    from matplotlib import pyplot as plt
+
+    from ant.renderers.mpl import MatplotlibAnimator
+
+    simulation = build_simulation(trail_lifetime=3)
+    animator = MatplotlibAnimator(simulation, frame_interval_ms=0, steps_per_frame=50, heatmap=True)
+    assert simulation.visits is not None
+    artists = animator._update(0)
+    overlay = artists[-1].get_array()
+    np.testing.assert_array_equal(overlay.filled(0), simulation.visits.count_array())
+    assert overlay.mask[simulation.visits.count_array() == 0].all()
+    plt.close(animator._figure)
+
+
+def test_cli_heatmap_out(tmp_path) -> None:
+    path = tmp_path / "heat.npy"
+    args = ["--backend", "none", "--width", "16", "--height", "16", "--progress-interval", "0"]
+    assert main([*args, "--steps", "150", "--heatmap-out", str(path)]) == 0
+    counts = np.load(path)
+    assert counts.shape == (16, 16) and counts.sum() == 150 * 2
+    with pytest.raises(SystemExit):
+        main([*args, "--heatmap"])